@@ -0,0 +1 @@
+"""Benchmarks for the HWAM Smart Control integration."""
@@ -0,0 +1,116 @@
+"""Run the HWAM benchmark suite and compare it with a stored baseline.
+
+Usage:
+    python -m benchmarks [--sizes 288 1000] [--output results.json]
+                         [--baseline benchmarks/baseline.json]
+                         [--tolerance 0.25] [--min-us 5] [--update-baseline]
+
+Results are compared relative to a calibration workload measured in the
+same run, so that a baseline recorded on another machine stays usable.
+Results shorter than --min-us are reported but not compared. The exit code
+is 1 when a result is slower than the baseline by more than the tolerance,
+or when there is no baseline to compare with.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import platform
+import sys
+from typing import Any
+
+from . import bench_api, bench_coordinator, bench_entities, bench_json, bench_models
+from .common import HISTORY_SIZES, calibration_workload, time_per_call
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(__file__), "baseline.json")
+CALIBRATION = "calibration_us"
+
+
+def run_suite(sizes: tuple[int, ...]) -> dict[str, float]:
+    """Run every benchmark and return the results in microseconds."""
+    results: dict[str, float] = {
+        CALIBRATION: time_per_call(calibration_workload) * 1e6,
+    }
+    results.update(bench_models.run())
+    results.update(bench_json.run())
+    results.update(bench_api.run())
+    results.update(bench_coordinator.run(sizes))
+    results.update(bench_entities.run(sizes))
+    return results
+
+
+def compare(
+    results: dict[str, float],
+    baseline: dict[str, float],
+    tolerance: float,
+    min_us: float = 0.0,
+) -> list[str]:
+    """Return a description of each result slower than the baseline.
+
+    Each result is scaled by the ratio of the calibration durations, which
+    cancels out the difference in speed between the two machines.
+    """
+    scale = 1.0
+    if results.get(CALIBRATION) and baseline.get(CALIBRATION):
+        scale = results[CALIBRATION] / baseline[CALIBRATION]
+    regressions = []
+    for name, reference in sorted(baseline.items()):
+        value = results.get(name)
+        if name == CALIBRATION or value is None or reference <= 0 or value < min_us:
+            continue
+        ratio = value / (reference * scale)
+        if ratio > 1 + tolerance:
+            regressions.append(
+                f"{name}: {value:.2f} us vs {reference * scale:.2f} us scaled baseline"
+                f" (+{(ratio - 1) * 100:.0f}%)"
+            )
+    return regressions
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Entry point."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(HISTORY_SIZES))
+    parser.add_argument("--output", help="Write the results to this JSON file")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    parser.add_argument("--min-us", type=float, default=5.0)
+    parser.add_argument("--update-baseline", action="store_true")
+    args = parser.parse_args(argv)
+
+    results = run_suite(tuple(args.sizes))
+    report: dict[str, Any] = {
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "unit": "us",
+        "results": results,
+    }
+
+    for name, value in results.items():
+        print(f"{name:45} {value:12.2f} us")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump(report, file, indent=2, sort_keys=True)
+
+    if args.update_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as file:
+            json.dump(report, file, indent=2, sort_keys=True)
+        print(f"Baseline written to {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print(f"No baseline at {args.baseline}, run with --update-baseline")
+        return 1
+
+    with open(args.baseline, encoding="utf-8") as file:
+        baseline = json.load(file)["results"]
+    regressions = compare(results, baseline, args.tolerance, args.min_us)
+    for line in regressions:
+        print(f"REGRESSION {line}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
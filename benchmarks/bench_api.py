@@ -0,0 +1,48 @@
+"""Benchmark HWAMApi._request against a local HTTP server."""
+from __future__ import annotations
+
+import asyncio
+import json
+
+from aiohttp import web
+
+from custom_components.hwam_stove.api import HWAMApi
+from custom_components.hwam_stove.const import ENDPOINT_GET_STOVE_DATA
+
+from .common import async_time_per_call, stove_payload
+
+
+async def async_run() -> dict[str, float]:
+    """Return the round trip cost of one poll in microseconds."""
+    body = json.dumps(stove_payload()).encode()
+
+    async def handle(request: web.Request) -> web.Response:
+        return web.Response(body=body, content_type="application/json")
+
+    app = web.Application()
+    app.router.add_get(ENDPOINT_GET_STOVE_DATA, handle)
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = runner.addresses[0][1]
+
+    api = HWAMApi(f"127.0.0.1:{port}")
+    try:
+        request = await async_time_per_call(
+            lambda: api._request("GET", ENDPOINT_GET_STOVE_DATA)
+        )
+        poll = await async_time_per_call(api.get_stove_data)
+    finally:
+        await api.close()
+        await runner.cleanup()
+
+    return {
+        "api_request_us": request * 1e6,
+        "api_get_stove_data_us": poll * 1e6,
+    }
+
+
+def run() -> dict[str, float]:
+    """Run the benchmark in a new event loop."""
+    return asyncio.run(async_run())
@@ -0,0 +1,86 @@
+"""Benchmark a full HWAMDataCoordinator._async_update_data cycle."""
+from __future__ import annotations
+
+import asyncio
+
+from homeassistant.util.dt import utcnow
+
+from custom_components.hwam_stove.circuit import CircuitBreaker
+from custom_components.hwam_stove.models import StoveData
+from custom_components.hwam_stove.scheduler import RequestScheduler
+from custom_components.hwam_stove.timing import API_STAGES, StageTimings
+
+from .common import (
+    HISTORY_SIZES,
+    async_hass,
+    async_time_per_call,
+    filled_coordinator,
+    stove_payload,
+)
+
+
+class _PayloadApi:
+    """API returning a decoded payload without network access."""
+
+    def __init__(self, unchanged: bool = False) -> None:
+        self._payload = stove_payload()
+        self._data = StoveData.from_dict(self._payload)
+        self.last_unchanged = unchanged
+        self.circuit = CircuitBreaker(3, 30.0, 600.0)
+        self.scheduler = RequestScheduler()
+        self.timings = StageTimings(API_STAGES)
+
+    async def get_stove_data(self, budget=None, allow_stale=True) -> StoveData:
+        if self.last_unchanged:
+            return self._data
+        return StoveData.from_dict(self._payload)
+
+
+async def async_run(sizes=HISTORY_SIZES) -> dict[str, float]:
+    """Return the cost of one update cycle per history size, in microseconds."""
+    results = {}
+    async with async_hass() as hass:
+        for size in sizes:
+            coordinator = filled_coordinator(hass, size, _PayloadApi())
+            # Les métriques de toutes les entités sont suivies
+            coordinator.async_track_metrics(_all_metrics())
+
+            async def cycle() -> None:
+                # Force le recalcul des prédictions, sans notification de maintenance
+                coordinator._last_prediction_time = None
+                coordinator._maintenance_check_time = utcnow()
+                await coordinator._async_update_data()
+
+            results[f"coordinator_update_us[n={size}]"] = (
+                await async_time_per_call(cycle) * 1e6
+            )
+
+        # Réponse identique à la précédente (veille prolongée)
+        coordinator = filled_coordinator(hass, HISTORY_SIZES[0], _PayloadApi(unchanged=True))
+        coordinator.async_track_metrics(_all_metrics())
+        coordinator.data = await coordinator._async_update_data()
+        results["coordinator_update_unchanged_us"] = (
+            await async_time_per_call(coordinator._async_update_data) * 1e6
+        )
+    return results
+
+
+def _all_metrics() -> set[str]:
+    """Return the metrics consumed by every entity description."""
+    from custom_components.hwam_stove import binary_sensor, number, sensor
+
+    return {
+        key
+        for descriptions in (
+            sensor.SENSORS,
+            binary_sensor.BINARY_SENSORS,
+            number.NUMBER_TYPES,
+        )
+        for description in descriptions
+        for key in description.metrics
+    }
+
+
+def run(sizes=HISTORY_SIZES) -> dict[str, float]:
+    """Run the benchmark in a new event loop."""
+    return asyncio.run(async_run(sizes))
@@ -0,0 +1,58 @@
+"""Benchmark extra_state_attributes for every platform."""
+from __future__ import annotations
+
+import asyncio
+
+from custom_components.hwam_stove import binary_sensor, number, sensor, switch
+from custom_components.hwam_stove.models import StoveData
+
+from .common import (
+    HISTORY_SIZES,
+    async_hass,
+    filled_coordinator,
+    stove_payload,
+    time_per_call,
+)
+
+PLATFORMS = {
+    "sensor": (sensor.HWAMSensor, sensor.SENSORS),
+    "binary_sensor": (binary_sensor.HWAMBinarySensor, binary_sensor.BINARY_SENSORS),
+    "number": (number.HWAMNumber, number.NUMBER_TYPES),
+    "switch": (switch.HWAMSwitch, switch.SWITCH_TYPES),
+}
+
+
+async def async_run(sizes=HISTORY_SIZES) -> dict[str, float]:
+    """Return the cost of reading all attributes of a platform, in microseconds."""
+    results = {}
+    async with async_hass() as hass:
+        for size in sizes:
+            coordinator = filled_coordinator(hass, size)
+            coordinator.data = StoveData.from_dict(stove_payload())
+
+            for platform, (entity_class, descriptions) in PLATFORMS.items():
+                entities = [
+                    entity_class(
+                        coordinator=coordinator,
+                        entry_id="benchmark",
+                        entity_description=description,
+                        unique_id=f"benchmark_{description.key}",
+                    )
+                    for description in descriptions
+                ]
+                for description in descriptions:
+                    coordinator.async_track_metrics(getattr(description, "metrics", ()))
+
+                def read_all() -> None:
+                    for entity in entities:
+                        entity.extra_state_attributes  # pylint: disable=pointless-statement
+
+                results[f"{platform}_attributes_us[n={size}]"] = (
+                    time_per_call(read_all) * 1e6
+                )
+    return results
+
+
+def run(sizes=HISTORY_SIZES) -> dict[str, float]:
+    """Run the benchmark in a new event loop."""
+    return asyncio.run(async_run(sizes))
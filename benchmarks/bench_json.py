@@ -0,0 +1,58 @@
+"""Benchmark the decoding of /get_stove_data bodies.
+
+Usage: python -m benchmarks.bench_json
+"""
+from __future__ import annotations
+
+from datetime import timedelta
+import json
+
+from custom_components.hwam_stove.api import JSON_BACKEND, HWAMApi
+from simulator.stove import VirtualStove
+
+from .common import stove_payload, time_per_call
+
+FLEET_SIZE = 50  # Poêles simulés décodés par cycle d'interrogation
+
+
+def fleet_bodies(count: int = FLEET_SIZE) -> list[bytes]:
+    """Return one body per simulated stove, each at a different burn stage."""
+    bodies = []
+    for index in range(count):
+        stove = VirtualStove(stove_id=index, seed=index)
+        stove.start()
+        stove.advance(timedelta(minutes=5 * index).total_seconds())
+        bodies.append(json.dumps(stove.payload()).encode())
+    return bodies
+
+
+def run() -> dict[str, float]:
+    """Return the decode cost per poll and per fleet cycle in microseconds."""
+    body = json.dumps(stove_payload()).encode()
+    bodies = fleet_bodies()
+
+    def decode_fleet() -> None:
+        for fleet_body in bodies:
+            HWAMApi._decode(fleet_body)
+
+    return {
+        "json_decode_stdlib_us": time_per_call(lambda: json.loads(body)) * 1e6,
+        "json_decode_us": time_per_call(lambda: HWAMApi._decode(body)) * 1e6,
+        f"json_decode_fleet_us[n={FLEET_SIZE}]": time_per_call(decode_fleet) * 1e6,
+    }
+
+
+def main() -> None:
+    """Print the benchmark results."""
+    results = run()
+    for name, value in results.items():
+        print(f"{name:32} {value:10.2f}")
+    print(f"{'backend':32} {JSON_BACKEND:>10}")
+    print(
+        f"{'speedup':32} "
+        f"{results['json_decode_stdlib_us'] / results['json_decode_us']:10.2f}x"
+    )
+
+
+if __name__ == "__main__":
+    main()
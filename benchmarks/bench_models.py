@@ -0,0 +1,34 @@
+"""Benchmark StoveData.from_dict in strict and fast modes.
+
+Usage: python -m benchmarks.bench_models
+"""
+from __future__ import annotations
+
+from custom_components.hwam_stove.models import StoveData
+
+from .common import stove_payload, time_per_call
+
+
+def run() -> dict[str, float]:
+    """Return the per-poll decode cost in microseconds for each mode."""
+    payload = stove_payload()
+    return {
+        "from_dict_strict_us": time_per_call(
+            lambda: StoveData.from_dict(payload, strict=True)
+        ) * 1e6,
+        "from_dict_fast_us": time_per_call(
+            lambda: StoveData.from_dict(payload, strict=False)
+        ) * 1e6,
+    }
+
+
+def main() -> None:
+    """Print the benchmark results."""
+    results = run()
+    for name, value in results.items():
+        print(f"{name:24} {value:10.2f}")
+    print(f"{'speedup':24} {results['from_dict_strict_us'] / results['from_dict_fast_us']:10.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+"""Shared helpers for the HWAM benchmarks."""
+from __future__ import annotations
+
+from contextlib import asynccontextmanager
+import tempfile
+import time
+from typing import Any, AsyncIterator, Awaitable, Callable
+
+
+def stove_payload(**overrides: Any) -> dict[str, Any]:
+    """Return a complete /get_stove_data payload."""
+    payload = {
+        "algorithm": "IHS",
+        "stove_temperature": 24500,
+        "room_temperature": 2100,
+        "oxygen_level": 1250,
+        "phase": 3,
+        "burn_level": 2,
+        "operation_mode": 2,
+        "door_open": 0,
+        "updating": 0,
+        "night_lowering": 0,
+        "maintenance_alarms": 0,
+        "safety_alarms": 0,
+        "refill_alarm": 0,
+        "remote_refill_alarm": 0,
+        "remote_refill_beeps": 0,
+        "version_major": 1,
+        "version_minor": 4,
+        "version_build": 2,
+        "wifi_version_major": 2,
+        "wifi_version_minor": 1,
+        "wifi_version_build": 0,
+        "remote_version_major": 1,
+        "remote_version_minor": 0,
+        "remote_version_build": 7,
+        "service_date": "2024-01-15",
+        "valve1_position": 50,
+        "valve2_position": 60,
+        "valve3_position": 70,
+        "night_begin_hour": 22,
+        "night_begin_minute": 0,
+        "night_end_hour": 6,
+        "night_end_minute": 30,
+        "year": 2024,
+        "month": 1,
+        "day": 27,
+        "hours": 12,
+        "minutes": 0,
+        "seconds": 0,
+        "time_since_remote_msg": "00:05",
+        "new_fire_wood_hours": 1,
+        "new_fire_wood_minutes": 30,
+    }
+    payload.update(overrides)
+    return payload
+
+
+def time_per_call(func: Callable[[], Any], min_time: float = 0.2) -> float:
+    """Return the best average duration of one call, in seconds."""
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time:
+            break
+        number *= 2
+
+    best = elapsed / number
+    for _ in range(4):
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        best = min(best, (time.perf_counter() - start) / number)
+    return best
+
+
+HISTORY_SIZES: tuple[int, ...] = (288, 1_000, 10_000, 100_000)
+
+
+def calibration_workload() -> None:
+    """Run a fixed pure-Python workload, independent of the integration.
+
+    Its duration measures the speed of the machine: results are compared
+    with the baseline relative to it.
+    """
+    total = 0
+    for index in range(1_000):
+        total += index * index % 7
+    sorted(str(index) for index in range(200))
+
+
+async def async_time_per_call(
+    func: Callable[[], Awaitable[Any]], min_time: float = 0.2
+) -> float:
+    """Return the best average duration of one awaited call, in seconds."""
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            await func()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time:
+            break
+        number *= 2
+
+    best = elapsed / number
+    for _ in range(4):
+        start = time.perf_counter()
+        for _ in range(number):
+            await func()
+        best = min(best, (time.perf_counter() - start) / number)
+    return best
+
+
+@asynccontextmanager
+async def async_hass() -> AsyncIterator[Any]:
+    """Provide a minimal running Home Assistant instance."""
+    from homeassistant.core import HomeAssistant
+
+    with tempfile.TemporaryDirectory() as config_dir:
+        try:
+            hass = HomeAssistant(config_dir)
+        except TypeError:  # Versions antérieures à 2024.2
+            hass = HomeAssistant()
+            hass.config.config_dir = config_dir
+        try:
+            yield hass
+        finally:
+            await hass.async_stop(force=True)
+
+
+def filled_coordinator(hass: Any, size: int, api: Any = None) -> Any:
+    """Return a coordinator whose history holds `size` samples."""
+    from custom_components.hwam_stove.coordinator import HWAMDataCoordinator
+
+    coordinator = HWAMDataCoordinator(
+        hass, api, name="Benchmark", history_size=size
+    )
+    now = time.time()
+    for index in range(size):
+        timestamp = now - (size - index) * 30
+        coordinator._record_sample(
+            (timestamp, 250.0 - index % 100, 21.0, 12.0 + index % 5)
+        )
+    return coordinator
@@ -1,5 +1,6 @@
 """The HWAM Smart Control integration."""
 import asyncio
+from datetime import timedelta
 import logging
 from typing import Any
 
@@ -7,12 +8,50 @@ import voluptuous as vol
 
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import CONF_HOST, Platform
-from homeassistant.core import HomeAssistant, ServiceCall
+from homeassistant.core import HomeAssistant, ServiceCall, ServiceResponse, SupportsResponse
+from homeassistant.exceptions import HomeAssistantError
 import homeassistant.helpers.config_validation as cv
+from homeassistant.helpers.storage import STORAGE_DIR
 
-from .const import DOMAIN, SERVICE_SET_BURN_LEVEL, SERVICE_START_COMBUSTION, SERVICE_SET_NIGHT_MODE
+from .const import (
+    DOMAIN,
+    CONF_UPDATE_INTERVAL,
+    CONF_MIN_UPDATE_INTERVAL,
+    CONF_MAX_UPDATE_INTERVAL,
+    CONF_UNCHANGED_HISTORY_INTERVAL,
+    DEFAULT_UPDATE_INTERVAL,
+    MIN_UPDATE_INTERVAL,
+    MAX_UPDATE_INTERVAL,
+    UNCHANGED_HISTORY_INTERVAL,
+    SERVICE_SET_BURN_LEVEL,
+    SERVICE_START_COMBUSTION,
+    SERVICE_SET_NIGHT_MODE,
+    SERVICE_PROFILE,
+    SERVICE_GET_HISTORY,
+    PROFILE_DEFAULT_CYCLES,
+    PROFILE_MAX_CYCLES,
+    STATS_WINDOW,
+    HISTORY_5MIN_SIZE,
+    HISTORY_HOUR_SIZE,
+    HISTORY_DAY_SIZE,
+)
 from .coordinator import HWAMDataCoordinator
 from .api import HWAMApi
+from .fleet import async_get_fleet, async_release_fleet
+from .history import HISTORY_COLUMNS
+from .history_store import HistoryStore
+from .statistics import StatisticsRecorder
+from .tiers import (
+    AGGREGATE_COLUMNS,
+    DAILY_COLUMNS,
+    HISTORY_TIERS,
+    TIER_5MIN,
+    TIER_DAY,
+    TIER_HOUR,
+    TIER_PERIODS,
+    to_columns,
+)
+from .websocket_api import async_register_websocket_commands
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -26,24 +65,97 @@ PLATFORMS = [
 async def async_setup(hass: HomeAssistant, config: dict) -> bool:
     """Set up the HWAM Smart Control integration."""
     hass.data.setdefault(DOMAIN, {})
+    async_register_websocket_commands(hass)
+
+    # Services communs à tous les poêles, enregistrés une seule fois
+    async def handle_profile(call: ServiceCall) -> None:
+        """Handle the profile service call."""
+        _coordinator_for_call(hass, call).async_start_profiling(call.data["cycles"])
+
+    async def handle_get_history(call: ServiceCall) -> ServiceResponse:
+        """Handle the get history service call."""
+        start, end = call.data.get("start"), call.data.get("end")
+        columns, rows = _coordinator_for_call(hass, call).query_history(
+            call.data["tier"],
+            start.timestamp() if start else None,
+            end.timestamp() if end else None,
+        )
+        return {"tier": call.data["tier"], "columns": to_columns(columns, rows)}
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_PROFILE,
+        handle_profile,
+        schema=vol.Schema({
+            vol.Optional("entry_id"): cv.string,
+            vol.Optional("cycles", default=PROFILE_DEFAULT_CYCLES): vol.All(
+                vol.Coerce(int),
+                vol.Range(min=1, max=PROFILE_MAX_CYCLES)
+            )
+        })
+    )
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_GET_HISTORY,
+        handle_get_history,
+        schema=vol.Schema({
+            vol.Optional("entry_id"): cv.string,
+            vol.Required("tier"): vol.In(HISTORY_TIERS),
+            vol.Optional("start"): cv.datetime,
+            vol.Optional("end"): cv.datetime,
+        }),
+        supports_response=SupportsResponse.ONLY,
+    )
     return True
 
+def _coordinator_for_call(hass: HomeAssistant, call: ServiceCall) -> HWAMDataCoordinator:
+    """Return the coordinator of the entry targeted by a service call.
+
+    The entry may be omitted only when a single stove is configured.
+    """
+    coordinators: dict[str, HWAMDataCoordinator] = hass.data[DOMAIN]
+    if (entry_id := call.data.get("entry_id")) is None:
+        if len(coordinators) != 1:
+            raise HomeAssistantError("entry_id is required when several stoves are configured")
+        return next(iter(coordinators.values()))
+    if (coordinator := coordinators.get(entry_id)) is None:
+        raise HomeAssistantError(f"Unknown HWAM entry: {entry_id}")
+    return coordinator
+
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up HWAM Smart Control from a config entry."""
     host = entry.data[CONF_HOST]
     
+    # Session et limite de concurrence partagées entre tous les poêles
+    fleet = async_get_fleet(hass)
+    fleet.register(entry.entry_id)
+    
     # Initialisation de l'API
-    api = HWAMApi(host)
+    api = HWAMApi(host, session=fleet.session)
     
     # Initialisation du coordinateur
     coordinator = HWAMDataCoordinator(
         hass=hass,
         api=api,
         name=entry.title,
+        store=_history_store(hass, entry),
+        tier_stores=_tier_stores(hass, entry),
+        fleet=fleet,
+        statistics=StatisticsRecorder(entry.entry_id.lower(), entry.title),
+        **_polling_options(entry),
     )
     
-    # Première mise à jour des données
-    await coordinator.async_config_entry_first_refresh()
+    try:
+        # Rechargement de l'historique persistant pour des prédictions immédiates
+        await coordinator.async_load_history()
+        
+        # Première mise à jour des données
+        await coordinator.async_config_entry_first_refresh()
+    except Exception:
+        await coordinator.async_close_history()
+        await async_release_fleet(hass, entry.entry_id)
+        raise
     
     # Stockage du coordinateur pour utilisation par les plateformes
     hass.data[DOMAIN][entry.entry_id] = coordinator
@@ -52,23 +164,17 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     async def handle_start_combustion(call: ServiceCall) -> None:
         """Handle the start combustion service call."""
         coordinator = hass.data[DOMAIN][entry.entry_id]
-        await coordinator.api.start_combustion()
-        await coordinator.async_refresh()
+        await coordinator.start_combustion()
 
     async def handle_set_burn_level(call: ServiceCall) -> None:
         """Handle the set burn level service call."""
         coordinator = hass.data[DOMAIN][entry.entry_id]
-        level = call.data["level"]
-        await coordinator.api.set_burn_level(level)
-        await coordinator.async_refresh()
+        await coordinator.set_burn_level(call.data["level"])
 
     async def handle_set_night_mode(call: ServiceCall) -> None:
         """Handle the set night mode service call."""
         coordinator = hass.data[DOMAIN][entry.entry_id]
-        start_time = call.data["start_time"]
-        end_time = call.data["end_time"]
-        await coordinator.api.set_night_time(start_time, end_time)
-        await coordinator.async_refresh()
+        await coordinator.set_night_mode(call.data["start_time"], call.data["end_time"])
 
     # Enregistrement des services
     hass.services.async_register(
@@ -101,6 +207,9 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     
     # Configuration des plateformes
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+    
+    # Rechargement à la modification des options
+    entry.async_on_unload(entry.add_update_listener(async_reload_entry))
 
     return True
 
@@ -109,17 +218,70 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     # Déchargement des plateformes
     if unload_ok := await hass.config_entries.async_unload_platforms(entry, PLATFORMS):
         # Désenregistrement des services
-        for service in [SERVICE_START_COMBUSTION, SERVICE_SET_BURN_LEVEL, SERVICE_SET_NIGHT_MODE]:
+        for service in [
+            SERVICE_START_COMBUSTION,
+            SERVICE_SET_BURN_LEVEL,
+            SERVICE_SET_NIGHT_MODE,
+        ]:
             if hass.services.has_service(DOMAIN, service):
                 hass.services.async_remove(DOMAIN, service)
         
         # Nettoyage des données
         coordinator = hass.data[DOMAIN].pop(entry.entry_id)
+        coordinator.async_cancel_profiling()
+        await coordinator.async_flush_commands()
         await coordinator.api.close()
+        await coordinator.async_close_history()
+        await async_release_fleet(hass, entry.entry_id)
 
     return unload_ok
 
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Remove persisted data when a config entry is deleted."""
+    for store in (_history_store(hass, entry), *_tier_stores(hass, entry).values()):
+        await hass.async_add_executor_job(store.remove)
+
+def _polling_options(entry: ConfigEntry) -> dict[str, timedelta]:
+    """Read the polling interval and its adaptive bounds from the options."""
+    options = entry.options
+    return {
+        "update_interval": timedelta(
+            seconds=options.get(CONF_UPDATE_INTERVAL, DEFAULT_UPDATE_INTERVAL.total_seconds())
+        ),
+        "min_interval": timedelta(
+            seconds=options.get(CONF_MIN_UPDATE_INTERVAL, MIN_UPDATE_INTERVAL)
+        ),
+        "max_interval": timedelta(
+            seconds=options.get(CONF_MAX_UPDATE_INTERVAL, MAX_UPDATE_INTERVAL)
+        ),
+        "unchanged_history_interval": timedelta(
+            seconds=options.get(CONF_UNCHANGED_HISTORY_INTERVAL, UNCHANGED_HISTORY_INTERVAL)
+        ),
+    }
+
+def _history_store(hass: HomeAssistant, entry: ConfigEntry) -> HistoryStore:
+    """Build the history file store for a config entry."""
+    return HistoryStore(
+        hass.config.path(STORAGE_DIR, f"{DOMAIN}.{entry.entry_id}.history"),
+        HISTORY_COLUMNS,
+        retention=STATS_WINDOW.total_seconds(),
+    )
+
+def _tier_stores(hass: HomeAssistant, entry: ConfigEntry) -> dict[str, HistoryStore]:
+    """Build the aggregated history file stores for a config entry."""
+    return {
+        tier: HistoryStore(
+            hass.config.path(STORAGE_DIR, f"{DOMAIN}.{entry.entry_id}.history.{tier}"),
+            columns,
+            retention=TIER_PERIODS[tier] * size,
+        )
+        for tier, columns, size in (
+            (TIER_5MIN, AGGREGATE_COLUMNS, HISTORY_5MIN_SIZE),
+            (TIER_HOUR, AGGREGATE_COLUMNS, HISTORY_HOUR_SIZE),
+            (TIER_DAY, DAILY_COLUMNS, HISTORY_DAY_SIZE),
+        )
+    }
+
 async def async_reload_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
-    """Reload config entry."""
-    await async_unload_entry(hass, entry)
-    await async_setup_entry(hass, entry)
+    """Reload config entry through the config entry state machine."""
+    await hass.config_entries.async_reload(entry.entry_id)
@@ -1,25 +1,54 @@
 """HWAM Smart Control API Client."""
-from datetime import datetime
+import asyncio
+from datetime import datetime, timedelta
+import json
 import logging
+import time
 from typing import Optional
 import ssl
 
 import aiohttp
 import async_timeout
-from tenacity import retry, stop_after_attempt, wait_exponential
+
+try:
+    import orjson
+except ImportError:  # Décodeur de la bibliothèque standard
+    orjson = None
 
 from .const import (
     ENDPOINT_GET_STOVE_DATA,
     ENDPOINT_SET_BURN_LEVEL,
     ENDPOINT_START,
     ENDPOINT_SET_NIGHT_TIME,
+    ENDPOINT_SET_NIGHT_LOWERING,
+    ENDPOINT_SET_REMOTE_REFILL_ALARM,
     DEFAULT_TIMEOUT,
     MAX_RETRIES,
+    RETRY_BACKOFF,
+    CIRCUIT_FAILURE_THRESHOLD,
+    CIRCUIT_PROBE_INTERVAL,
+    CIRCUIT_MAX_PROBE_INTERVAL,
+    CACHE_TTL,
+    CACHE_STALE_TTL,
 )
+from .circuit import CircuitBreaker
 from .models import StoveData
+from .scheduler import PRIORITY_COMMAND, PRIORITY_POLL, RequestScheduler
+from .session import create_session
+from .timing import API_STAGES, StageTimings
 
 _LOGGER = logging.getLogger(__name__)
 
+# Décodeur JSON des réponses : orjson s'il est installé (fourni avec
+# Home Assistant), sinon la bibliothèque standard
+JSON_BACKEND = "orjson" if orjson is not None else "json"
+_json_loads = orjson.loads if orjson is not None else json.loads
+
+# Origine du dernier instantané retourné
+SOURCE_NETWORK = "network"
+SOURCE_CACHE = "cache"
+SOURCE_STALE = "stale"
+
 class HWAMApiError(Exception):
     """Exception de base pour les erreurs API HWAM."""
     pass
@@ -36,6 +65,10 @@ class InvalidAuth(HWAMApiError):
     """Erreur d'authentification."""
     pass
 
+class CircuitOpen(CannotConnect):
+    """Poêle considéré injoignable, requête non tentée."""
+    pass
+
 class HWAMApi:
     """Client API HWAM Smart Control."""
 
@@ -47,6 +80,8 @@ class HWAMApi:
         password: Optional[str] = None,
         use_ssl: bool = False,
         request_timeout: int = DEFAULT_TIMEOUT,
+        cache_ttl: timedelta = CACHE_TTL,
+        stale_ttl: timedelta = CACHE_STALE_TTL,
     ) -> None:
         """Initialize the API client."""
         self._host = host
@@ -59,6 +94,27 @@ class HWAMApi:
         self._base_url = f"{'https' if use_ssl else 'http'}://{host}"
         self._cached_data: Optional[StoveData] = None
         self._last_update: Optional[datetime] = None
+        # Cache d'instantané : fraîcheur, lecture partagée en cours et compteurs
+        self._cache_ttl = cache_ttl.total_seconds()
+        self._stale_ttl = stale_ttl.total_seconds()
+        self._fetched_at: Optional[float] = None
+        self._inflight: Optional[asyncio.Task] = None
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.retries = 0
+        self.last_source: Optional[str] = None
+        # Corps brut de la dernière réponse décodée et indicateur de réponse identique
+        self._last_body: Optional[bytes] = None
+        self.last_unchanged = False
+        self.circuit = CircuitBreaker(
+            CIRCUIT_FAILURE_THRESHOLD,
+            CIRCUIT_PROBE_INTERVAL.total_seconds(),
+            CIRCUIT_MAX_PROBE_INTERVAL.total_seconds(),
+        )
+        # Une seule requête à la fois vers le serveur embarqué du poêle
+        self.scheduler = RequestScheduler()
+        # Durées de connexion, aller-retour, décodage et conversion
+        self.timings = StageTimings(API_STAGES)
 
     async def _get_session(self) -> aiohttp.ClientSession:
         """Get aiohttp session."""
@@ -67,13 +123,7 @@ class HWAMApi:
             if self._username and self._password:
                 auth = aiohttp.BasicAuth(self._username, self._password)
                 
-            self._session = aiohttp.ClientSession(
-                auth=auth,
-                headers={
-                    "Accept": "application/json",
-                    "User-Agent": "HWAM-HA-Integration/1.0",
-                }
-            )
+            self._session = create_session(auth)
             self._close_session = True
         return self._session
 
@@ -84,31 +134,64 @@ class HWAMApi:
         params: Optional[dict] = None, 
         data: Optional[dict] = None
     ) -> dict:
-        """Make request to API with retry logic."""
+        """Make request to API and decode the JSON response."""
+        return self._decode(await self._request_raw(method, endpoint, params, data))
+
+    async def _request_raw(
+        self,
+        method: str,
+        endpoint: str,
+        params: Optional[dict] = None,
+        data: Optional[dict] = None,
+        timeout: Optional[float] = None,
+        priority: int = PRIORITY_COMMAND,
+    ) -> bytes:
+        """Queue a request to the stove and return the raw response body.
+
+        Requests run one at a time, commands ahead of polls. A poll of an
+        endpoint already queued shares the queued request.
+        """
+        return await self.scheduler.submit(
+            lambda: self._send(method, endpoint, params, data, timeout),
+            priority,
+            key=endpoint if priority == PRIORITY_POLL else None,
+        )
+
+    async def _send(
+        self,
+        method: str,
+        endpoint: str,
+        params: Optional[dict],
+        data: Optional[dict],
+        timeout: Optional[float],
+    ) -> bytes:
+        """Send a request and return the raw response body."""
         session = await self._get_session()
         url = f"{self._base_url}{endpoint}"
 
         try:
-            async with async_timeout.timeout(self._request_timeout):
+            async with async_timeout.timeout(timeout or self._request_timeout):
                 _LOGGER.debug("Making %s request to %s", method, url)
-                async with session.request(
-                    method, 
-                    url, 
-                    params=params, 
-                    json=data,
-                    ssl=self._ssl_context,
-                ) as response:
-                    if response.status == 401:
-                        raise InvalidAuth("Authentication invalide")
-                    
-                    if response.status != 200:
-                        raise InvalidResponse(
-                            f"Invalid response from API: {response.status}"
-                        )
-                    
-                    data = await response.json()
-                    _LOGGER.debug("Received data: %s", data)
-                    return data
+                with self.timings.measure("request"):
+                    async with session.request(
+                        method,
+                        url,
+                        params=params,
+                        json=data,
+                        ssl=self._ssl_context,
+                        trace_request_ctx=self.timings,
+                    ) as response:
+                        if response.status == 401:
+                            raise InvalidAuth("Authentication invalide")
+                        
+                        if response.status != 200:
+                            raise InvalidResponse(
+                                f"Invalid response from API: {response.status}"
+                            )
+                        
+                        body = await response.read()
+                        _LOGGER.debug("Received %s bytes from %s", len(body), url)
+                        return body
                     
         except aiohttp.ClientError as err:
             raise CannotConnect(f"Error connecting to API: {err}") from err
@@ -118,30 +201,161 @@ class HWAMApi:
             _LOGGER.error("Unexpected error: %s", err)
             raise
 
-    @retry(
-        stop=stop_after_attempt(MAX_RETRIES),
-        wait=wait_exponential(multiplier=1, min=4, max=10)
-    )
-    async def get_stove_data(self) -> StoveData:
-        """Get current stove data with retry logic."""
+    @staticmethod
+    def _decode(body: bytes) -> dict:
+        """Decode a JSON response body, without an intermediate str."""
+        try:
+            return _json_loads(body)
+        except ValueError as err:
+            raise InvalidResponse(f"Invalid JSON from API: {err}") from err
+
+    @staticmethod
+    def _from_dict(payload: dict) -> StoveData:
+        """Convert a decoded payload, rejecting malformed stove data."""
         try:
-            data = await self._request("GET", ENDPOINT_GET_STOVE_DATA)
-            stove_data = StoveData.from_dict(data)
+            return StoveData.from_dict(payload)
+        except ValueError as err:
+            raise InvalidResponse(f"Invalid stove data from API: {err}") from err
+
+    async def get_stove_data(
+        self,
+        budget: Optional[float] = None,
+        max_age: Optional[float] = None,
+        allow_stale: bool = True,
+    ) -> StoveData:
+        """Get current stove data.
+
+        A snapshot younger than `max_age` seconds (the cache TTL by default)
+        is served from memory. An older snapshot, still within the stale
+        window, is returned immediately when `allow_stale` is set while a
+        single background read refreshes it. Otherwise the caller waits for
+        a read, shared with every concurrent caller.
+
+        `last_unchanged` is set when the returned snapshot was not decoded
+        from a new body (cache hit or identical response).
+        """
+        age = self._snapshot_age()
+        ttl = self._cache_ttl if max_age is None else max_age
+        if age is not None and age <= ttl:
+            self.cache_hits += 1
+            self.last_source = SOURCE_CACHE
+            self.last_unchanged = True
+            return self._cached_data
+
+        if allow_stale and age is not None and age <= ttl + self._stale_ttl:
+            self.cache_hits += 1
+            self.last_source = SOURCE_STALE
+            self.last_unchanged = True
+            self._fetch_shared(budget).add_done_callback(self._revalidated)
+            return self._cached_data
+
+        self.cache_misses += 1
+        # Le lecteur annulé n'interrompt pas la lecture des autres
+        return await asyncio.shield(self._fetch_shared(budget))
+
+    def _snapshot_age(self) -> Optional[float]:
+        """Age of the cached snapshot in seconds, None without snapshot."""
+        if self._cached_data is None or self._fetched_at is None:
+            return None
+        return time.monotonic() - self._fetched_at
+
+    def _fetch_shared(self, budget: Optional[float]) -> asyncio.Task:
+        """Return the in-flight read, starting one if needed."""
+        if self._inflight is None:
+            self._inflight = asyncio.ensure_future(self._fetch(budget))
+            self._inflight.add_done_callback(self._fetch_done)
+        return self._inflight
+
+    def _fetch_done(self, task: asyncio.Task) -> None:
+        """Forget the finished read."""
+        if self._inflight is task:
+            self._inflight = None
+
+    @staticmethod
+    def _revalidated(task: asyncio.Task) -> None:
+        """Consume the outcome of a background refresh."""
+        if not task.cancelled() and (err := task.exception()) is not None:
+            _LOGGER.debug("Background refresh failed: %s", err)
+
+    async def _fetch(self, budget: Optional[float]) -> StoveData:
+        """Read the stove data from the network.
+
+        Failed reads are retried with a growing delay, as long as the next
+        attempt fits in `budget` seconds. Consecutive failed reads open the
+        circuit breaker, which then fails fast until its next probe. Errors
+        are raised, never replaced by the cached snapshot.
+        """
+        try:
+            if not self.circuit.allow():
+                raise CircuitOpen(
+                    f"Stove unreachable, next attempt in {self.circuit.retry_in:.0f} s"
+                )
+            try:
+                body = await self._read_with_retries(budget)
+                unchanged = body == self._last_body and self._cached_data is not None
+                if not unchanged:
+                    with self.timings.measure("decode"):
+                        payload = self._decode(body)
+                    with self.timings.measure("from_dict"):
+                        stove_data = self._from_dict(payload)
+            except BaseException:
+                # Toute issue autre qu'une réponse exploitable, annulation
+                # comprise, est un échec : une sonde ne reste jamais en suspens
+                self.circuit.record_failure()
+                raise
+            self.circuit.record_success()
+            self.last_source = SOURCE_NETWORK
+            
+            # Réponse identique à la précédente : pas de décodage
+            if unchanged:
+                self._mark_fresh()
+                self.last_unchanged = True
+                return self._cached_data
             
             # Mise en cache des données
             self._cached_data = stove_data
-            self._last_update = datetime.now()
+            self._mark_fresh()
+            self._last_body = body
+            self.last_unchanged = False
             
             return stove_data
             
         except Exception as err:
-            _LOGGER.error("Error getting stove data: %s", err)
-            # Utiliser les données en cache si disponibles
-            if self._cached_data is not None:
-                _LOGGER.warning("Using cached data from %s", self._last_update)
-                return self._cached_data
+            # L'erreur est propagée : seul get_stove_data sert un instantané
+            # périmé, dans la fenêtre prévue et si l'appelant l'accepte
+            self.last_unchanged = False
+            _LOGGER.debug("Error getting stove data: %s", err)
             raise
 
+    def _mark_fresh(self) -> None:
+        """Record that the cached snapshot was just confirmed by the stove."""
+        self._last_update = datetime.now()
+        self._fetched_at = time.monotonic()
+
+    async def _read_with_retries(self, budget: Optional[float]) -> bytes:
+        """Read the stove data, retrying within the time budget."""
+        deadline = time.monotonic() + (budget or MAX_RETRIES * self._request_timeout)
+        attempt = 0
+        while True:
+            attempt += 1
+            remaining = deadline - time.monotonic()
+            try:
+                return await self._request_raw(
+                    "GET",
+                    ENDPOINT_GET_STOVE_DATA,
+                    timeout=max(0.1, min(self._request_timeout, remaining)),
+                    priority=PRIORITY_POLL,
+                )
+            except InvalidAuth:
+                raise
+            except (CannotConnect, InvalidResponse) as err:
+                delay = RETRY_BACKOFF * 2 ** (attempt - 1)
+                if attempt >= MAX_RETRIES or time.monotonic() + delay >= deadline:
+                    raise
+                _LOGGER.debug("Attempt %s failed (%s), retrying in %.1f s", attempt, err, delay)
+                self.retries += 1
+                await asyncio.sleep(delay)
+
     async def set_burn_level(self, level: int) -> bool:
         """Set burn level (0-5)."""
         if not 0 <= level <= 5:
@@ -189,10 +403,37 @@ class HWAMApi:
             _LOGGER.error("Error setting night time: %s", err)
             raise
 
+    async def set_night_lowering(self, enabled: bool) -> bool:
+        """Turn night lowering on or off."""
+        try:
+            data = await self._request(
+                "POST",
+                ENDPOINT_SET_NIGHT_LOWERING,
+                data={"value": int(enabled)}
+            )
+            return data.get("response") == "OK"
+        except Exception as err:
+            _LOGGER.error("Error setting night lowering: %s", err)
+            raise
+
+    async def set_remote_refill_alarm(self, enabled: bool) -> bool:
+        """Turn the remote refill alarm on or off."""
+        try:
+            data = await self._request(
+                "POST",
+                ENDPOINT_SET_REMOTE_REFILL_ALARM,
+                data={"value": int(enabled)}
+            )
+            return data.get("response") == "OK"
+        except Exception as err:
+            _LOGGER.error("Error setting remote refill alarm: %s", err)
+            raise
+
     async def test_connection(self) -> bool:
         """Test connectivity to HWAM stove."""
         try:
-            await self.get_stove_data()
+            # Le test interroge toujours le poêle
+            await self.get_stove_data(max_age=0, allow_stale=False)
             return True
         except Exception as err:
             _LOGGER.error("Connection test failed: %s", err)
@@ -200,17 +441,32 @@ class HWAMApi:
 
     async def close(self) -> None:
         """Close open client session."""
+        self.scheduler.cancel()
+        if self._inflight is not None:
+            self._inflight.cancel()
+            self._inflight = None
         if self._session and self._close_session:
             await self._session.close()
 
+    @property
+    def last_body(self) -> Optional[bytes]:
+        """Raw body of the last decoded stove data response.
+
+        Shared as is (not re-serialized) for fingerprinting and traces.
+        """
+        return self._last_body
+
     @property
     def cache_age(self) -> Optional[timedelta]:
         """Get age of cached data."""
-        if self._last_update is None:
+        age = self._snapshot_age()
+        if age is None:
             return None
-        return datetime.now() - self._last_update
+        return timedelta(seconds=age)
 
     def clear_cache(self) -> None:
         """Clear cached data."""
         self._cached_data = None
         self._last_update = None
+        self._fetched_at = None
+        self._last_body = None
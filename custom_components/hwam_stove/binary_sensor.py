@@ -2,7 +2,7 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Any, Callable
+from typing import Any, Callable, Mapping
 
 from homeassistant.components.binary_sensor import (
     BinarySensorDeviceClass,
@@ -25,8 +25,10 @@ from .models import StoveData
 class HWAMBinarySensorEntityDescription(BinarySensorEntityDescription):
     """Class describing HWAM binary sensor entities."""
     
-    is_on_fn: Callable[[StoveData], bool] | None = None
-    attributes_fn: Callable[[StoveData], dict[str, Any]] | None = None
+    is_on_fn: Callable[[StoveData, Mapping[str, Any]], bool] | None = None
+    attributes_fn: Callable[[StoveData, Mapping[str, Any]], dict[str, Any]] | None = None
+    metrics: tuple[str, ...] = ()
+    data_fields: tuple[str, ...] | None = None
     alert_threshold: float | None = None
     critical_threshold: float | None = None
 
@@ -35,82 +37,90 @@ BINARY_SENSORS = (
         key="door_open",
         name="Porte",
         device_class=BinarySensorDeviceClass.DOOR,
-        is_on_fn=lambda data: data.state.door_open,
-        attributes_fn=lambda data: {
-            "last_opened": max(
-                (h["timestamp"] for h in data.coordinator.temperature_history[-30:]
-                if h.get("door_opened")),
-                default=None
-            ),
-            "times_opened_today": sum(
-                1 for h in data.coordinator.temperature_history[-288:]
-                if h.get("door_opened")
-            ) if len(data.coordinator.temperature_history) > 0 else 0,
+        is_on_fn=lambda data, metrics: data.state.door_open,
+        attributes_fn=lambda data, metrics: {
+            "last_opened": metrics.get("door_last_opened"),
+            "times_opened_today": metrics.get("door_openings_24h") or 0,
         },
+        metrics=("door_last_opened", "door_openings_24h"),
+        data_fields=("state.door_open",),
     ),
     HWAMBinarySensorEntityDescription(
         key="maintenance_needed",
         name="Maintenance nécessaire",
         device_class=BinarySensorDeviceClass.PROBLEM,
-        is_on_fn=lambda data: (
+        is_on_fn=lambda data, metrics: (
             data.alarms.maintenance_alarms > 0 or
-            (data.service_date.total_seconds() / 3600 > MAINTENANCE_THRESHOLD_HOURS)
+            (metrics.get("hours_since_service", 0) > MAINTENANCE_THRESHOLD_HOURS)
         ),
-        attributes_fn=lambda data: {
+        attributes_fn=lambda data, metrics: {
             "alarm_count": data.alarms.maintenance_alarms,
             "alarm_details": data.alarms.get_active_alarms(),
             "last_service": data.service_date.isoformat(),
-            "hours_since_service": data.service_date.total_seconds() / 3600,
+            "hours_since_service": metrics.get("hours_since_service"),
         },
+        metrics=("hours_since_service",),
+        data_fields=("alarms", "service_date"),
     ),
     HWAMBinarySensorEntityDescription(
         key="safety_alarm",
         name="Alarme de sécurité",
         device_class=BinarySensorDeviceClass.SAFETY,
-        is_on_fn=lambda data: data.alarms.safety_alarms > 0,
-        attributes_fn=lambda data: {
+        is_on_fn=lambda data, metrics: data.alarms.safety_alarms > 0,
+        attributes_fn=lambda data, metrics: {
             "alarm_count": data.alarms.safety_alarms,
             "alarm_details": data.alarms.get_active_alarms(),
             "temperature_critical": data.temperatures.stove_temperature > 500,
         },
         alert_threshold=400,  # Température d'alerte
         critical_threshold=500,  # Température critique
+        data_fields=("alarms", "temperatures.stove_temperature"),
     ),
     HWAMBinarySensorEntityDescription(
         key="refill_needed",
         name="Rechargement nécessaire",
         device_class=BinarySensorDeviceClass.PROBLEM,
-        is_on_fn=lambda data: data.alarms.refill_alarm,
-        attributes_fn=lambda data: {
-            "estimated_time_remaining": str(data.coordinator.predictions.get("refill_time")),
-            "temperature_trend": data.coordinator.predictions.get("temperature_trend"),
-            "efficiency_score": data.coordinator.predictions.get("efficiency_score"),
+        is_on_fn=lambda data, metrics: data.alarms.refill_alarm,
+        attributes_fn=lambda data, metrics: {
+            "estimated_time_remaining": metrics.get("refill_time_text"),
+            "temperature_trend": metrics.get("temperature_trend"),
+            "efficiency_score": metrics.get("efficiency_score"),
         },
+        metrics=("refill_time_text", "temperature_trend", "efficiency_score"),
+        data_fields=("alarms.refill_alarm",),
     ),
     HWAMBinarySensorEntityDescription(
         key="optimal_performance",
         name="Performance optimale",
         device_class=BinarySensorDeviceClass.RUNNING,
-        is_on_fn=lambda data: (
+        is_on_fn=lambda data, metrics: (
             data.state.is_active and
-            data.coordinator.predictions.get("efficiency_score", 0) > 80
+            (metrics.get("efficiency_score") or 0) > 80
         ),
-        attributes_fn=lambda data: {
-            "efficiency_score": data.coordinator.predictions.get("efficiency_score"),
-            "temperature_stability": data.coordinator.predictions.get("temperature_trend"),
+        attributes_fn=lambda data, metrics: {
+            "efficiency_score": metrics.get("efficiency_score"),
+            "temperature_stability": metrics.get("temperature_trend"),
             "oxygen_level_optimal": 15 <= data.temperatures.oxygen_level <= 25,
         },
+        metrics=("efficiency_score", "temperature_trend"),
+        data_fields=("state.phase", "temperatures.oxygen_level"),
     ),
     HWAMBinarySensorEntityDescription(
         key="night_mode_active",
         name="Mode nuit actif",
         device_class=BinarySensorDeviceClass.POWER,
-        is_on_fn=lambda data: data.state.night_lowering,
-        attributes_fn=lambda data: {
+        is_on_fn=lambda data, metrics: data.state.night_lowering,
+        attributes_fn=lambda data, metrics: {
             "start_time": data.night_begin_time.strftime("%H:%M"),
             "end_time": data.night_end_time.strftime("%H:%M"),
             "burn_level_reduced": data.state.burn_level < 3,
         },
+        data_fields=(
+            "state.night_lowering",
+            "state.burn_level",
+            "night_begin_time",
+            "night_end_time",
+        ),
     ),
 )
 
@@ -161,7 +171,7 @@ class HWAMBinarySensor(HWAMEntity, BinarySensorEntity):
             return None
             
         try:
-            return self.entity_description.is_on_fn(self.coordinator.data)
+            return self.entity_description.is_on_fn(self.coordinator.data, self.metrics)
         except Exception:
             return None
 
@@ -172,7 +182,9 @@ class HWAMBinarySensor(HWAMEntity, BinarySensorEntity):
 
         if self.coordinator.data is not None and self.entity_description.attributes_fn:
             try:
-                attrs.update(self.entity_description.attributes_fn(self.coordinator.data))
+                attrs.update(
+                    self.entity_description.attributes_fn(self.coordinator.data, self.metrics)
+                )
             except Exception:
                 pass
 
@@ -0,0 +1,89 @@
+"""Disjoncteur protégeant les interrogations d'un poêle injoignable."""
+from __future__ import annotations
+
+import time
+from typing import Callable, Optional
+
+STATE_CLOSED = "closed"
+STATE_OPEN = "open"
+STATE_HALF_OPEN = "half_open"
+CIRCUIT_STATES = [STATE_CLOSED, STATE_OPEN, STATE_HALF_OPEN]
+
+
+class CircuitBreaker:
+    """Disjoncteur à trois états.
+
+    Fermé, les requêtes passent normalement. Après `failure_threshold`
+    échecs consécutifs il s'ouvre : les requêtes échouent immédiatement
+    jusqu'à l'échéance de sonde. Une seule requête de sonde est alors
+    autorisée (semi-ouvert) ; son succès referme le disjoncteur, son échec
+    le rouvre avec un délai de sonde doublé, borné par `max_probe_interval`.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int,
+        probe_interval: float,
+        max_probe_interval: float,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Initialise le disjoncteur (délais en secondes)."""
+        self._failure_threshold = failure_threshold
+        self._base_probe_interval = probe_interval
+        self._max_probe_interval = max_probe_interval
+        self._clock = clock
+        self._state = STATE_CLOSED
+        self._failures = 0
+        self._probe_interval = probe_interval
+        self._next_probe: Optional[float] = None
+        self.trips = 0
+
+    @property
+    def state(self) -> str:
+        """Retourne l'état courant."""
+        return self._state
+
+    @property
+    def failures(self) -> int:
+        """Retourne le nombre d'échecs consécutifs."""
+        return self._failures
+
+    @property
+    def retry_in(self) -> Optional[float]:
+        """Retourne le délai (s) avant la prochaine sonde si le disjoncteur est ouvert."""
+        if self._state != STATE_OPEN or self._next_probe is None:
+            return None
+        return max(0.0, self._next_probe - self._clock())
+
+    def allow(self) -> bool:
+        """Indique si une requête peut être tentée."""
+        if self._state == STATE_CLOSED:
+            return True
+        if self._state == STATE_OPEN and self._clock() >= self._next_probe:
+            # Une seule sonde à la fois
+            self._state = STATE_HALF_OPEN
+            return True
+        return False
+
+    def record_success(self) -> None:
+        """Enregistre un succès : le disjoncteur se referme."""
+        self._state = STATE_CLOSED
+        self._failures = 0
+        self._probe_interval = self._base_probe_interval
+        self._next_probe = None
+
+    def record_failure(self) -> None:
+        """Enregistre un échec."""
+        self._failures += 1
+        if self._state == STATE_HALF_OPEN:
+            # Sonde échouée : délai doublé
+            self._probe_interval = min(self._probe_interval * 2, self._max_probe_interval)
+            self._open()
+        elif self._state == STATE_CLOSED and self._failures >= self._failure_threshold:
+            self._open()
+
+    def _open(self) -> None:
+        """Ouvre le disjoncteur jusqu'à la prochaine sonde."""
+        self.trips += 1
+        self._state = STATE_OPEN
+        self._next_probe = self._clock() + self._probe_interval
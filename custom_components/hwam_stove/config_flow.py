@@ -12,10 +12,18 @@ from homeassistant.data_entry_flow import FlowResult
 import homeassistant.helpers.config_validation as cv
 
 from .api import HWAMApi, CannotConnect, InvalidResponse
+from .session import async_get_session
 from .const import (
     DOMAIN,
     DEFAULT_NAME,
     DEFAULT_UPDATE_INTERVAL,
+    CONF_UPDATE_INTERVAL,
+    CONF_MIN_UPDATE_INTERVAL,
+    CONF_MAX_UPDATE_INTERVAL,
+    CONF_UNCHANGED_HISTORY_INTERVAL,
+    MIN_UPDATE_INTERVAL,
+    MAX_UPDATE_INTERVAL,
+    UNCHANGED_HISTORY_INTERVAL,
 )
 
 _LOGGER = logging.getLogger(__name__)
@@ -42,7 +50,7 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         if user_input is not None:
             try:
                 # Validate the connection
-                api = HWAMApi(user_input[CONF_HOST])
+                api = HWAMApi(user_input[CONF_HOST], session=async_get_session(self.hass))
                 if await api.test_connection():
                     await self.async_set_unique_id(user_input[CONF_HOST])
                     self._abort_if_unique_id_configured()
@@ -82,7 +90,7 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         self._abort_if_unique_id_configured()
 
         # Check if we can connect
-        api = HWAMApi(host)
+        api = HWAMApi(host, session=async_get_session(self.hass))
         try:
             if not await api.test_connection():
                 return self.async_abort(reason="cannot_connect")
@@ -110,19 +118,39 @@ class HWAMOptionsFlow(config_entries.OptionsFlow):
         self, user_input: dict[str, Any] | None = None
     ) -> FlowResult:
         """Manage the options."""
+        errors = {}
+
         if user_input is not None:
-            return self.async_create_entry(title="", data=user_input)
+            if user_input[CONF_MIN_UPDATE_INTERVAL] > user_input[CONF_MAX_UPDATE_INTERVAL]:
+                errors["base"] = "invalid_interval_bounds"
+            else:
+                return self.async_create_entry(title="", data=user_input)
 
+        options = self.config_entry.options
         return self.async_show_form(
             step_id="init",
             data_schema=vol.Schema(
                 {
                     vol.Optional(
-                        "update_interval",
-                        default=self.config_entry.options.get(
-                            "update_interval", DEFAULT_UPDATE_INTERVAL.total_seconds()
+                        CONF_UPDATE_INTERVAL,
+                        default=options.get(
+                            CONF_UPDATE_INTERVAL, int(DEFAULT_UPDATE_INTERVAL.total_seconds())
+                        ),
+                    ): vol.All(cv.positive_int, vol.Clamp(min=MIN_UPDATE_INTERVAL)),
+                    vol.Optional(
+                        CONF_MIN_UPDATE_INTERVAL,
+                        default=options.get(CONF_MIN_UPDATE_INTERVAL, MIN_UPDATE_INTERVAL),
+                    ): vol.All(cv.positive_int, vol.Clamp(min=5)),
+                    vol.Optional(
+                        CONF_MAX_UPDATE_INTERVAL,
+                        default=options.get(CONF_MAX_UPDATE_INTERVAL, MAX_UPDATE_INTERVAL),
+                    ): vol.All(cv.positive_int, vol.Clamp(max=3600)),
+                    vol.Optional(
+                        CONF_UNCHANGED_HISTORY_INTERVAL,
+                        default=options.get(
+                            CONF_UNCHANGED_HISTORY_INTERVAL, UNCHANGED_HISTORY_INTERVAL
                         ),
-                    ): vol.All(cv.positive_int, vol.Clamp(min=10)),
+                    ): cv.positive_int,
                     vol.Optional(
                         "night_mode_enabled",
                         default=self.config_entry.options.get(
@@ -131,4 +159,5 @@ class HWAMOptionsFlow(config_entries.OptionsFlow):
                     ): bool,
                 }
             ),
+            errors=errors,
         )
@@ -9,13 +9,53 @@ MODEL: Final = "Smart Control"
 # Configuration
 CONF_HOST = "host"
 CONF_NAME = "name"
+CONF_UPDATE_INTERVAL = "update_interval"
+CONF_MIN_UPDATE_INTERVAL = "min_update_interval"
+CONF_MAX_UPDATE_INTERVAL = "max_update_interval"
+CONF_UNCHANGED_HISTORY_INTERVAL = "unchanged_history_interval"
 DEFAULT_NAME = "HWAM Stove"
 DEFAULT_UPDATE_INTERVAL = timedelta(seconds=30)
+DEFAULT_TIMEOUT = 10  # Délai maximum d'une requête en secondes
+MAX_RETRIES = 3  # Nombre de tentatives par lecture
+RETRY_BACKOFF = 0.5  # Délai (s) avant la deuxième tentative, doublé ensuite
+RETRY_BUDGET_RATIO = 0.5  # Part de l'intervalle d'interrogation allouée aux tentatives
+
+# Cache des instantanés
+CACHE_TTL = timedelta(seconds=5)  # Instantané servi sans interroger le poêle
+CACHE_STALE_TTL = timedelta(seconds=60)  # Instantané périmé servi pendant son rafraîchissement
+
+# Disjoncteur
+CIRCUIT_FAILURE_THRESHOLD = 3  # Lectures échouées consécutives avant ouverture
+CIRCUIT_PROBE_INTERVAL = timedelta(seconds=30)  # Délai avant la première sonde
+CIRCUIT_MAX_PROBE_INTERVAL = timedelta(minutes=10)  # Délai maximum entre deux sondes
+
+# Session HTTP partagée
+DATA_SESSION = f"{DOMAIN}_session"  # Clé de la session dans hass.data
+SESSION_CONNECTION_LIMIT = 32  # Connexions simultanées, tous poêles confondus
+SESSION_CONNECTIONS_PER_HOST = 2  # Le serveur embarqué du poêle gère peu de connexions
+SESSION_KEEPALIVE = 45  # Conservation (s) des connexions inactives, > intervalle par défaut
+SESSION_DNS_CACHE_TTL = 300  # Durée (s) du cache DNS
+
+# Flotte de poêles
+DATA_FLEET = f"{DOMAIN}_fleet"  # Clé des ressources partagées dans hass.data
+FLEET_MAX_CONCURRENT_POLLS = 8  # Interrogations simultanées maximum
+FLEET_POLL_JITTER = 0.1  # Dispersion aléatoire des intervalles (±10 %)
+
+# Mesure des durées
+TIMING_WINDOW = 1000  # Durées comptées avant atténuation de moitié des histogrammes
+
+# Profilage à la demande
+PROFILE_DEFAULT_CYCLES = 3  # Cycles profilés par défaut
+PROFILE_MAX_CYCLES = 100  # Cycles profilés au maximum
+PROFILE_SAMPLE_INTERVAL = 0.005  # Intervalle (s) d'échantillonnage des piles
+PROFILE_REPORT_LINES = 60  # Fonctions listées par tri dans le rapport
 
 # Services disponibles
 SERVICE_SET_BURN_LEVEL = "set_burn_level"  # Contrôle du niveau de combustion
 SERVICE_START_COMBUSTION = "start_combustion"  # Démarrage de la combustion
 SERVICE_SET_NIGHT_MODE = "set_night_mode"  # Configuration du mode nuit
+SERVICE_PROFILE = "profile"  # Profilage des prochains cycles de mise à jour
+SERVICE_GET_HISTORY = "get_history"  # Lecture de l'historique multi-résolution
 
 # Attributs
 ATTR_BURN_LEVEL = "burn_level"
@@ -54,6 +94,8 @@ ENDPOINT_GET_STOVE_DATA = "/get_stove_data"  # Lecture des données
 ENDPOINT_START = "/start"  # Démarrage
 ENDPOINT_SET_BURN_LEVEL = "/set_burn_level"  # Niveau de combustion
 ENDPOINT_SET_NIGHT_TIME = "/set_night_time"  # Mode nuit
+ENDPOINT_SET_NIGHT_LOWERING = "/set_night_lowering"  # Activation du mode nuit
+ENDPOINT_SET_REMOTE_REFILL_ALARM = "/set_remote_refill_alarm"  # Alarme de rechargement à distance
 
 # Unités de mesure
 TEMP_CELSIUS = "°C"
@@ -67,6 +109,7 @@ ICON_VALVE = "mdi:valve"
 ICON_TIMER = "mdi:timer"
 ICON_ALERT = "mdi:alert"
 ICON_MAINTENANCE = "mdi:tools"
+ICON_EFFICIENCY = "mdi:leaf"
 
 # Messages d'erreur
 ERROR_CANNOT_CONNECT = "cannot_connect"
@@ -80,7 +123,9 @@ ENTITY_CATEGORY_DIAGNOSTIC = "diagnostic"
 # Seuils et limites
 MIN_BURN_LEVEL = 0  # Niveau minimum de combustion
 MAX_BURN_LEVEL = 5  # Niveau maximum de combustion
+STEP_BURN_LEVEL = 1  # Pas de réglage du niveau de combustion
 MIN_UPDATE_INTERVAL = 10  # Intervalle minimum de mise à jour en secondes
+MAX_UPDATE_INTERVAL = 300  # Intervalle maximum de mise à jour en secondes
 MAX_TEMP_WARNING = 500  # Température d'avertissement en °C
 MIN_OXYGEN_WARNING = 15  # Niveau d'oxygène minimum en %
 
@@ -89,3 +134,45 @@ SUGGESTED_AREA = "Living Room"
 
 # Historique
 TEMPERATURE_HISTORY_SIZE = 288  # 24h avec mise à jour toutes les 5 minutes
+STATS_WINDOW = timedelta(hours=24)  # Fenêtre des min/max/moyennes glissants
+UNCHANGED_HISTORY_INTERVAL = 300  # Espacement (s) des réponses identiques historisées, 0 = jamais
+
+# Historique multi-résolution
+HISTORY_5MIN_SIZE = 576  # Agrégats de 5 minutes conservés (48h)
+HISTORY_HOUR_SIZE = 744  # Agrégats horaires conservés (31 jours)
+HISTORY_DAY_SIZE = 366  # Bilans journaliers conservés
+PHASE_MAX_GAP = timedelta(minutes=10)  # Durée maximum attribuée à une phase entre deux échantillons
+
+# Historique des graphiques (websocket)
+WS_TYPE_HISTORY = "hwam_stove/history"  # Commande websocket de lecture de l'historique
+HISTORY_CHART_POINTS = 300  # Points retournés par défaut après réduction
+HISTORY_MAX_POINTS = 2000  # Points demandés au plus
+HISTORY_DELTA_SCALE = 100  # Précision (1/100) des valeurs encodées en différentiel
+
+# Statistiques longue durée
+STATISTICS_PERIOD = timedelta(hours=1)  # Période des agrégats importés
+STATISTICS_MAX_PENDING = 48  # Agrégats conservés par signal en l'absence d'enregistreur
+
+# Commandes
+COMMAND_DEBOUNCE = timedelta(seconds=1)  # Regroupement des commandes rapprochées
+COMMAND_VERIFY_DELAY = timedelta(seconds=5)  # Délai avant vérification d'une commande
+EVENT_COMMAND_FAILED = f"{DOMAIN}_command_failed"  # Commande non appliquée par le poêle
+
+# Interrogation adaptative
+PHASE_INTERVAL_FACTORS = {  # Multiplicateur de l'intervalle de base par phase
+    1: 1 / 3,  # Allumage
+    2: 0.5,  # Démarrage
+    3: 1.0,  # Combustion
+    4: 4.0,  # Braises
+    5: 10.0,  # Veille
+}
+FAST_CHANGE_RATE = 0.1  # Variation (°C/s) au-delà de laquelle on interroge au plus vite
+
+# Prédictions
+MIN_SAMPLES_FOR_PREDICTION = 10  # Échantillons minimum avant toute prédiction
+PREDICTION_INTERVAL = timedelta(minutes=5)  # Intervalle de recalcul des prédictions
+REFILL_REGRESSION_HALF_LIFE = timedelta(minutes=30)  # Oubli exponentiel de la tendance
+REFILL_MIN_TEMPERATURE = 100  # Température minimum de fonctionnement en °C
+
+# Maintenance
+MAINTENANCE_THRESHOLD_HOURS = 24 * 365  # Révision annuelle recommandée
@@ -1,31 +1,83 @@
 """Data coordinator for HWAM integration."""
-from datetime import datetime, timedelta
+from collections import Counter, deque
+from contextlib import nullcontext
+from dataclasses import dataclass
+from datetime import datetime, time as dt_time, timedelta, timezone
 import logging
-from typing import Any, Dict, List, Optional
+import time
+from types import MappingProxyType
+from typing import Any, Awaitable, Callable, Dict, Iterable, Mapping, Optional
+
 import numpy as np
-from collections import deque
 
-from homeassistant.core import HomeAssistant
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.debounce import Debouncer
+from homeassistant.helpers.event import async_call_later
 from homeassistant.helpers.update_coordinator import (
     DataUpdateCoordinator,
     UpdateFailed,
 )
-from homeassistant.exceptions import ConfigEntryAuthFailed
-from homeassistant.util.dt import utcnow
+from homeassistant.exceptions import ConfigEntryAuthFailed, HomeAssistantError
+from homeassistant.util import slugify
+from homeassistant.util.dt import start_of_local_day, utc_from_timestamp, utcnow
 
 from .api import HWAMApi, HWAMApiError
 from .const import (
     DOMAIN, 
     DEFAULT_UPDATE_INTERVAL,
+    COMMAND_DEBOUNCE,
+    COMMAND_VERIFY_DELAY,
+    EVENT_COMMAND_FAILED,
+    MIN_BURN_LEVEL,
+    MAX_BURN_LEVEL,
+    MIN_UPDATE_INTERVAL,
+    MAX_UPDATE_INTERVAL,
+    PHASE_INTERVAL_FACTORS,
+    FAST_CHANGE_RATE,
+    HISTORY_5MIN_SIZE,
+    HISTORY_HOUR_SIZE,
+    HISTORY_DAY_SIZE,
+    PHASE_MAX_GAP,
+    RETRY_BUDGET_RATIO,
     TEMPERATURE_HISTORY_SIZE,
+    STATS_WINDOW,
+    UNCHANGED_HISTORY_INTERVAL,
     MIN_SAMPLES_FOR_PREDICTION,
     PREDICTION_INTERVAL,
+    REFILL_REGRESSION_HALF_LIFE,
+    REFILL_MIN_TEMPERATURE,
     MAINTENANCE_THRESHOLD_HOURS,
 )
+from .fleet import HWAMFleet
+from .history import HistoryBuffer, RollingStats
+from .history_store import HistoryStore
+from .metrics import EMPTY_METRICS, METRICS
 from .models import StoveData
+from .prediction import OnlineLinearRegression
+from .profiler import CycleProfiler
+from .statistics import StatisticsRecorder
+from .tiers import (
+    TIER_5MIN,
+    TIER_DAY,
+    TIER_HOUR,
+    TIER_PERIODS,
+    TIER_RAW,
+    AggregateTier,
+    DailyRollup,
+)
+from .timing import COORDINATOR_STAGES, StageTimings
 
 _LOGGER = logging.getLogger(__name__)
 
+@dataclass
+class PendingCommand:
+    """Commande dont l'effet attendu n'est pas encore confirmé par le poêle."""
+
+    changes: Mapping[str, Any]
+    check: Callable[[StoveData], bool]
+    sent: bool = False
+    verify: bool = False
+
 class HWAMDataCoordinator(DataUpdateCoordinator[StoveData]):
     """Classe pour coordonner les mises à jour des données HWAM."""
 
@@ -35,6 +87,16 @@ class HWAMDataCoordinator(DataUpdateCoordinator[StoveData]):
         api: HWAMApi, 
         name: str,
         update_interval: timedelta = DEFAULT_UPDATE_INTERVAL,
+        store: Optional[HistoryStore] = None,
+        tier_stores: Optional[Mapping[str, HistoryStore]] = None,
+        history_size: int = TEMPERATURE_HISTORY_SIZE,
+        fleet: Optional[HWAMFleet] = None,
+        statistics: Optional[StatisticsRecorder] = None,
+        min_interval: timedelta = timedelta(seconds=MIN_UPDATE_INTERVAL),
+        max_interval: timedelta = timedelta(seconds=MAX_UPDATE_INTERVAL),
+        unchanged_history_interval: timedelta = timedelta(
+            seconds=UNCHANGED_HISTORY_INTERVAL
+        ),
     ) -> None:
         """Initialize."""
         super().__init__(
@@ -48,51 +110,417 @@ class HWAMDataCoordinator(DataUpdateCoordinator[StoveData]):
         self._name = name
         self._last_update_success = True
         self._last_exception: Optional[Exception] = None
+        self.last_update_dt: Optional[datetime] = None
+        
+        # Interrogation partagée avec les autres poêles
+        self._fleet = fleet
+        self.poll_latency: Optional[float] = None
+        
+        # Durées des étapes de traitement d'une mise à jour
+        self.timings = StageTimings(COORDINATOR_STAGES)
+        
+        # Profilage à la demande des prochains cycles
+        self._profiler: Optional[CycleProfiler] = None
+        
+        # Intervalle adaptatif, borné par la configuration
+        self._base_interval = update_interval
+        self._min_interval = min_interval
+        self._max_interval = max_interval
+        self._target_interval = update_interval
         
         # Historique des données
-        self._temperature_history = deque(maxlen=TEMPERATURE_HISTORY_SIZE)
-        self._oxygen_history = deque(maxlen=TEMPERATURE_HISTORY_SIZE)
+        self._history = HistoryBuffer(history_size)
+        self._store = store
+        self._tier_stores = dict(tier_stores or {})
+        # Lignes agrégées terminées, en attente d'écriture
+        self._closed_rows: list[tuple[str, tuple[float, ...]]] = []
+        self._statistics = statistics
+        self._unchanged_history_interval = unchanged_history_interval.total_seconds()
+        self._rolling_stats = {
+            name: RollingStats(STATS_WINDOW.total_seconds())
+            for name in ("stove_temp", "room_temp", "oxygen")
+        }
+        # Niveaux agrégés de l'historique et bilans journaliers
+        self._tiers = {
+            TIER_5MIN: AggregateTier(TIER_PERIODS[TIER_5MIN], HISTORY_5MIN_SIZE),
+            TIER_HOUR: AggregateTier(TIER_PERIODS[TIER_HOUR], HISTORY_HOUR_SIZE),
+        }
+        self._daily = DailyRollup(
+            HISTORY_DAY_SIZE,
+            PHASE_MAX_GAP.total_seconds(),
+            day_start=lambda epoch: start_of_local_day(utc_from_timestamp(epoch)).timestamp(),
+        )
+        self._refill_regression = OnlineLinearRegression(
+            REFILL_REGRESSION_HALF_LIFE.total_seconds()
+        )
         self._maintenance_check_time = None
         
+        # Suivi des ouvertures de porte
+        self._door_was_open = False
+        self._door_last_opened: Optional[float] = None
+        self._door_openings: deque[float] = deque()
+        
         # Cache des prédictions
         self._last_prediction_time = None
-        self._cached_predictions: Dict[str, Any] = {}
+        self._cached_predictions: Mapping[str, Any] = MappingProxyType({})
+        
+        # Métriques dérivées, calculées uniquement pour les entités actives
+        self._metric_consumers: Counter[str] = Counter()
+        self._metrics: Mapping[str, Any] = EMPTY_METRICS
+        
+        # Changements depuis l'instantané précédent, pour n'écrire que les
+        # entités concernées
+        self._full_update = True
+        self._changed_fields: frozenset[str] = frozenset()
+        self._changed_metrics: frozenset[str] = frozenset()
+        self.suppressed_writes = 0
+        # Notifiés après les entités, avec le compte des écritures évitées
+        self._fan_out_listeners: list[CALLBACK_TYPE] = []
+        # Notifiés quand une interrogation échouée change un diagnostic
+        self._error_listeners: list[CALLBACK_TYPE] = []
+        
+        # Commandes en attente de confirmation, superposées aux données lues
+        self._pending_commands: dict[str, PendingCommand] = {}
+        self._reported_data: Optional[StoveData] = None
+        self._cancel_verification: Optional[CALLBACK_TYPE] = None
+        
+        # File de commandes : les réglages rapprochés sont regroupés
+        self._pending_burn_level: Optional[int] = None
+        self._burn_level_debouncer = Debouncer(
+            hass,
+            _LOGGER,
+            cooldown=COMMAND_DEBOUNCE.total_seconds(),
+            immediate=False,
+            function=self._async_send_burn_level,
+        )
 
     async def _async_update_data(self) -> StoveData:
         """Mise à jour des données via l'API."""
+        self._begin_profiled_cycle()
         try:
-            data = await self.api.get_stove_data()
+            data = await self._async_fetch()
             self._last_update_success = True
+            # Instantané déjà traité (réponse identique ou lecture récente en cache)
+            unchanged = self.api.last_unchanged and data is self._reported_data
             
-            # Mise à jour de l'historique
+            # Confrontation des commandes en attente à l'état réel
+            self._reported_data = data
+            if self._pending_commands:
+                data = self._reconcile_commands(data)
             timestamp = utcnow()
-            self._update_history(data, timestamp)
+            self.last_update_dt = timestamp
+            
+            # Réponse identique à la précédente : traitement minimal
+            if unchanged and self.data is not None:
+                await self._async_handle_unchanged(data, timestamp)
+                return data
+            
+            # Mise à jour de l'historique
+            with self.timings.measure("history"):
+                sample = self._update_history(data, timestamp)
+                await self._async_persist_sample(sample)
+                self._track_door(data, sample[0])
             
             # Mise à jour des prédictions si nécessaire
-            await self._update_predictions()
+            with self.timings.measure("predictions"):
+                await self._update_predictions()
             
             # Vérification de la maintenance
-            await self._check_maintenance(data)
+            with self.timings.measure("maintenance"):
+                await self._check_maintenance(data)
+            
+            # Instantané des métriques dérivées
+            previous_metrics = self._metrics
+            self._metrics = METRICS.evaluate(self, data, self._metric_consumers)
+            
+            # Changements depuis le dernier instantané publié
+            self._track_changes(data, previous_metrics)
+            
+            # Adaptation de l'intervalle à l'activité du poêle
+            self._target_interval = self._adaptive_interval(data)
             
             return data
 
         except HWAMApiError as err:
             self._last_update_success = False
             self._last_exception = err
+            self._refresh_diagnostics()
+            # Les entités ne sont pas toujours notifiées après un échec
+            self._end_profiled_cycle()
             raise UpdateFailed(f"Erreur de communication avec l'API: {err}")
+        except Exception:
+            self._end_profiled_cycle()
+            raise
+        finally:
+            self._schedule_next_poll()
+
+    async def _async_fetch(self) -> StoveData:
+        """Interroge le poêle dans la limite de concurrence de la flotte."""
+        async with self._fleet.slot() if self._fleet else nullcontext():
+            started = time.monotonic()
+            try:
+                # Les nouvelles tentatives ne débordent pas sur l'interrogation suivante
+                return await self.api.get_stove_data(
+                    budget=self.update_interval.total_seconds() * RETRY_BUDGET_RATIO,
+                    allow_stale=False,
+                )
+            finally:
+                self.poll_latency = time.monotonic() - started
+
+    def _adaptive_interval(self, data: StoveData) -> timedelta:
+        """Calcule l'intervalle d'interrogation adapté à l'état du poêle.
+
+        L'interrogation est la plus rapide porte ouverte ou pendant une
+        variation rapide de température, sinon l'intervalle de base est
+        modulé par la phase (rapide à l'allumage, lent en braises et veille).
+        """
+        if data.state.door_open or self._is_transient():
+            interval = self._min_interval
+        else:
+            interval = self._base_interval * PHASE_INTERVAL_FACTORS.get(data.state.phase, 1.0)
+        return max(self._min_interval, min(self._max_interval, interval))
+
+    def _is_transient(self) -> bool:
+        """Vérifie si la température du poêle varie rapidement."""
+        if len(self._history) < 2:
+            return False
+        timestamps = self._history.column("timestamp", 2)
+        temperatures = self._history.column("stove_temp", 2)
+        elapsed = timestamps[1] - timestamps[0]
+        if elapsed <= 0:
+            return False
+        return abs(temperatures[1] - temperatures[0]) / elapsed > FAST_CHANGE_RATE
+
+    def _schedule_next_poll(self) -> None:
+        """Applique l'intervalle de la prochaine interrogation."""
+        interval = self._target_interval
+        if self._fleet is not None:
+            # Dispersion de la prochaine interrogation
+            interval = self._fleet.next_interval(interval)
+        self.update_interval = interval
+
+    async def _async_handle_unchanged(self, data: StoveData, timestamp: datetime) -> None:
+        """Traite une réponse identique à la précédente.
 
-    def _update_history(self, data: StoveData, timestamp: datetime) -> None:
+        Seules les métriques de diagnostic sont réévaluées, seules les
+        entités concernées sont réécrites et l'échantillon n'est historisé
+        qu'à l'intervalle configuré, pour garder une trace des longues veilles.
+        """
+        previous_metrics = self._metrics
+        self._metrics = METRICS.refresh_live(
+            self, data, self._metric_consumers, previous_metrics
+        )
+        # Seules les commandes confirmées ou annulées peuvent changer l'état
+        self._track_changes(data, previous_metrics)
+
+        latest = self._history.latest("timestamp")
+        if self._unchanged_history_interval and (
+            latest is None
+            or timestamp.timestamp() - latest >= self._unchanged_history_interval
+        ):
+            sample = self._update_history(data, timestamp)
+            await self._async_persist_sample(sample)
+
+    def _track_changes(self, data: StoveData, previous_metrics: Mapping[str, Any]) -> None:
+        """Détermine les champs et métriques modifiés par la mise à jour."""
+        # Premier instantané ou retour après une erreur : tout est réécrit
+        self._full_update = self.data is None or not self.last_update_success
+        self._changed_fields = data.diff(self.data)
+        self._changed_metrics = frozenset(
+            key for key, value in self._metrics.items()
+            if key not in previous_metrics or previous_metrics[key] != value
+        )
+
+    def has_changes(self, fields: Iterable[str], metrics: Iterable[str] = ()) -> bool:
+        """Vérifie si la dernière mise à jour modifie les champs ou métriques donnés."""
+        return (
+            self._full_update
+            or not self._changed_fields.isdisjoint(fields)
+            or not self._changed_metrics.isdisjoint(metrics)
+        )
+
+    @callback
+    def async_update_listeners(self) -> None:
+        """Notifie les entités, mesure la durée et compte les écritures évitées."""
+        previous = self.suppressed_writes
+        self.suppressed_writes = 0
+        with self.timings.measure("fan_out"):
+            super().async_update_listeners()
+        self._end_profiled_cycle()
+        # Toute notification hors interrogation (données poussées) réécrit tout
+        self._full_update = True
+
+        # Compte connu seulement une fois toutes les entités notifiées
+        if self._fan_out_listeners:
+            self._metrics = MappingProxyType(
+                {**self._metrics, "suppressed_writes": self.suppressed_writes}
+            )
+            if self.suppressed_writes != previous:
+                for update_callback in list(self._fan_out_listeners):
+                    update_callback()
+
+    def _refresh_diagnostics(self) -> None:
+        """Réévalue les diagnostics après une interrogation échouée.
+
+        Home Assistant ne notifie plus les entités après deux échecs
+        consécutifs : celles qui restent disponibles en erreur (état de la
+        connexion) sont notifiées ici quand un diagnostic a changé.
+        """
+        if self.data is None:
+            return
+        previous = self._metrics
+        self._metrics = METRICS.refresh_live(self, self.data, self._metric_consumers, previous)
+        if self._metrics != previous:
+            for update_callback in list(self._error_listeners):
+                update_callback()
+
+    @callback
+    def async_add_error_listener(self, update_callback: CALLBACK_TYPE) -> CALLBACK_TYPE:
+        """Appelle `update_callback` quand un échec change un diagnostic."""
+        self._error_listeners.append(update_callback)
+
+        @callback
+        def _remove() -> None:
+            self._error_listeners.remove(update_callback)
+
+        return _remove
+
+    @callback
+    def async_add_fan_out_listener(self, update_callback: CALLBACK_TYPE) -> CALLBACK_TYPE:
+        """Appelle `update_callback` après chaque notification des entités.
+
+        Le compte des écritures évitées de la notification terminée est
+        alors disponible dans les métriques (`suppressed_writes`).
+        """
+        self._fan_out_listeners.append(update_callback)
+        self._metrics = MappingProxyType(
+            {**self._metrics, "suppressed_writes": self.suppressed_writes}
+        )
+
+        @callback
+        def _remove() -> None:
+            self._fan_out_listeners.remove(update_callback)
+
+        return _remove
+
+    def _update_history(self, data: StoveData, timestamp: datetime) -> tuple[float, ...]:
         """Met à jour l'historique des données."""
-        self._temperature_history.append({
-            "timestamp": timestamp,
-            "stove_temp": data.temperatures.stove_temperature,
-            "room_temp": data.temperatures.room_temperature
-        })
+        sample = (
+            timestamp.timestamp(),
+            data.temperatures.stove_temperature,
+            data.temperatures.room_temperature,
+            data.temperatures.oxygen_level,
+        )
+        self._record_sample(sample)
+        self._queue_row(
+            TIER_DAY,
+            self._daily.add(sample[0], sample[1], data.state.phase, data.state.is_active),
+        )
+        if self._statistics is not None:
+            # Agrégats horaires, importés par lots à la fin de chaque heure
+            self._statistics.add(sample[0], {
+                "stove_temp": sample[1],
+                "room_temp": sample[2],
+                "oxygen": sample[3],
+                "burn_level": data.state.burn_level,
+            })
+            self._statistics.async_import(self.hass, sample[0])
+        return sample
+
+    def _record_sample(self, sample) -> None:
+        """Ajoute un échantillon à l'historique et aux statistiques glissantes."""
+        self._history.append(sample)
+        timestamp = sample[0]
+        columns = self._history.columns
+        for name, stats in self._rolling_stats.items():
+            stats.add(timestamp, sample[columns.index(name)])
+        self._refill_regression.add(timestamp, sample[columns.index("stove_temp")])
+        for name, tier in self._tiers.items():
+            self._queue_row(name, tier.add(sample))
+
+    def _queue_row(self, tier: str, row: Optional[tuple[float, ...]]) -> None:
+        """Met en attente d'écriture une ligne agrégée terminée."""
+        if row is None or tier not in self._tier_stores:
+            return
+        self._closed_rows.append((tier, row))
+        if tier == TIER_HOUR:
+            # Sauvegarde horaire du jour en cours, restauré au démarrage
+            self._queue_row(TIER_DAY, self._daily.current())
+
+    def _track_door(self, data: StoveData, epoch: float) -> None:
+        """Enregistre les ouvertures de porte sur la fenêtre de statistiques."""
+        if data.state.door_open and not self._door_was_open:
+            self._door_last_opened = epoch
+            self._door_openings.append(epoch)
+        self._door_was_open = data.state.door_open
+
+        limit = epoch - STATS_WINDOW.total_seconds()
+        while self._door_openings and self._door_openings[0] < limit:
+            self._door_openings.popleft()
+
+    async def async_load_history(self) -> None:
+        """Recharge l'historique persistant avant la première mise à jour."""
+        # Les niveaux agrégés d'abord : l'historique brut rejoué ne complète
+        # que les périodes qui n'y sont pas encore
+        for tier, store in self._tier_stores.items():
+            try:
+                rows = await self.hass.async_add_executor_job(store.load)
+            except OSError as err:
+                _LOGGER.warning("Impossible de charger l'historique %s: %s", tier, err)
+                continue
+            if tier == TIER_DAY:
+                self._daily.restore(rows, utcnow().timestamp())
+            else:
+                self._tiers[tier].restore(rows)
+
+        if self._store is None:
+            return
+
+        try:
+            rows = await self.hass.async_add_executor_job(self._store.load)
+        except OSError as err:
+            _LOGGER.warning("Impossible de charger l'historique: %s", err)
+            return
+
+        for row in rows:
+            self._record_sample(row)
+        _LOGGER.debug("%s échantillons d'historique rechargés pour %s", len(rows), self._name)
+        await self._async_persist_sample(None)
         
-        self._oxygen_history.append({
-            "timestamp": timestamp,
-            "level": data.temperatures.oxygen_level
-        })
+        # Rattrapage des statistiques horaires depuis l'historique persistant
+        if self._statistics is not None:
+            self._statistics.backfill(rows, self._history.columns)
+            self._statistics.async_import(self.hass, utcnow().timestamp())
+
+    async def _async_persist_sample(self, sample: Optional[tuple[float, ...]]) -> None:
+        """Ajoute l'échantillon et les lignes agrégées terminées aux fichiers."""
+        closed, self._closed_rows = self._closed_rows, []
+        if (self._store is None or sample is None) and not closed:
+            return
+
+        try:
+            await self.hass.async_add_executor_job(self._write_history, sample, closed)
+        except OSError as err:
+            _LOGGER.warning("Impossible d'enregistrer l'historique: %s", err)
+
+    def _write_history(
+        self,
+        sample: Optional[tuple[float, ...]],
+        closed: Iterable[tuple[str, tuple[float, ...]]],
+    ) -> None:
+        """Écrit l'échantillon et les lignes agrégées (exécuteur)."""
+        if self._store is not None and sample is not None:
+            self._store.append(sample)
+        for tier, row in closed:
+            self._tier_stores[tier].append(row)
+
+    async def async_close_history(self) -> None:
+        """Sauvegarde le jour en cours et ferme les fichiers d'historique."""
+        self._queue_row(TIER_DAY, self._daily.current())
+        await self._async_persist_sample(None)
+        for store in (self._store, *self._tier_stores.values()):
+            if store is not None:
+                await self.hass.async_add_executor_job(store.close)
 
     async def _update_predictions(self) -> None:
         """Met à jour les prédictions si nécessaire."""
@@ -100,34 +528,23 @@ class HWAMDataCoordinator(DataUpdateCoordinator[StoveData]):
         if (self._last_prediction_time is None or 
             now - self._last_prediction_time > PREDICTION_INTERVAL):
             
-            self._cached_predictions = {
+            self._cached_predictions = MappingProxyType({
                 "refill_time": self._predict_refill_time(),
                 "temperature_trend": self._calculate_temperature_trend(),
                 "efficiency_score": self._calculate_efficiency_score(),
-            }
+            })
             self._last_prediction_time = now
 
     def _predict_refill_time(self) -> Optional[timedelta]:
         """Prédit le temps avant besoin de rechargement."""
-        if len(self._temperature_history) < MIN_SAMPLES_FOR_PREDICTION:
+        if len(self._refill_regression) < MIN_SAMPLES_FOR_PREDICTION:
             return None
             
         try:
-            temps = [x["stove_temp"] for x in self._temperature_history]
-            times = np.array(range(len(temps)))
-            
-            # Calcul de la tendance linéaire
-            coeffs = np.polyfit(times, temps, 1)
-            slope = coeffs[0]
-            
-            # Si la température baisse
-            if slope < 0:
-                current_temp = temps[-1]
-                min_temp = 100  # Température minimum de fonctionnement
-                time_to_min = (current_temp - min_temp) / abs(slope)
-                return timedelta(minutes=int(time_to_min * 5))  # 5 minutes par échantillon
-                
-            return None
+            seconds = self._refill_regression.time_to_reach(REFILL_MIN_TEMPERATURE)
+            if seconds is None:
+                return None
+            return timedelta(seconds=int(seconds))
             
         except Exception as err:
             _LOGGER.warning("Erreur dans la prédiction de rechargement: %s", err)
@@ -135,10 +552,10 @@ class HWAMDataCoordinator(DataUpdateCoordinator[StoveData]):
 
     def _calculate_temperature_trend(self) -> str:
         """Calcule la tendance de température."""
-        if len(self._temperature_history) < 3:
+        if len(self._history) < 3:
             return "stable"
             
-        last_temps = [x["stove_temp"] for x in list(self._temperature_history)[-3:]]
+        last_temps = self._history.column("stove_temp", 3)
         avg_change = (last_temps[-1] - last_temps[0]) / 2
         
         if avg_change > 5:
@@ -149,17 +566,17 @@ class HWAMDataCoordinator(DataUpdateCoordinator[StoveData]):
 
     def _calculate_efficiency_score(self) -> Optional[float]:
         """Calcule un score d'efficacité basé sur la température et l'oxygène."""
-        if len(self._temperature_history) < MIN_SAMPLES_FOR_PREDICTION:
+        if len(self._history) < MIN_SAMPLES_FOR_PREDICTION:
             return None
             
         try:
-            recent_temps = [x["stove_temp"] for x in list(self._temperature_history)[-5:]]
-            recent_oxygen = [x["level"] for x in list(self._oxygen_history)[-5:]]
+            recent_temps = self._history.column("stove_temp", 5)
+            recent_oxygen = self._history.column("oxygen", 5)
             
-            temp_stability = 1 - (max(recent_temps) - min(recent_temps)) / max(recent_temps)
-            oxygen_efficiency = 1 - (sum(recent_oxygen) / len(recent_oxygen)) / 100
+            temp_stability = 1 - (recent_temps.max() - recent_temps.min()) / recent_temps.max()
+            oxygen_efficiency = 1 - recent_oxygen.mean() / 100
             
-            return (temp_stability * 0.6 + oxygen_efficiency * 0.4) * 100
+            return float((temp_stability * 0.6 + oxygen_efficiency * 0.4) * 100)
             
         except Exception as err:
             _LOGGER.warning("Erreur dans le calcul du score d'efficacité: %s", err)
@@ -186,39 +603,330 @@ class HWAMDataCoordinator(DataUpdateCoordinator[StoveData]):
             except Exception as err:
                 _LOGGER.warning("Erreur lors de la vérification de maintenance: %s", err)
 
+    @callback
+    def async_start_profiling(self, cycles: int) -> None:
+        """Profile les `cycles` prochains cycles de mise à jour.
+
+        Chaque cycle couvre la lecture (`get_stove_data`, `from_dict`), le
+        traitement (historique, prédictions, maintenance) et la notification
+        des entités. Le rapport et les piles repliées sont écrits dans le
+        répertoire de configuration après le dernier cycle.
+        """
+        if self._profiler is not None:
+            raise HomeAssistantError(f"Profilage déjà en cours pour {self._name}")
+        self._profiler = CycleProfiler(cycles)
+        _LOGGER.info("Profilage des %s prochains cycles de %s", cycles, self._name)
+
+    @callback
+    def async_cancel_profiling(self) -> None:
+        """Abandonne le profilage en cours."""
+        if self._profiler is not None:
+            self._profiler.cancel()
+            self._profiler = None
+
+    @callback
+    def _begin_profiled_cycle(self) -> None:
+        """Commence le cycle profilé, s'il y en a un."""
+        if self._profiler is None:
+            return
+        try:
+            self._profiler.begin()
+        except ValueError as err:
+            # Un seul profileur à la fois : autre entrée ou intégration profiler
+            _LOGGER.warning("Profilage de %s abandonné: %s", self._name, err)
+            self._profiler = None
+
+    @callback
+    def _end_profiled_cycle(self) -> None:
+        """Termine le cycle profilé et écrit les résultats après le dernier."""
+        profiler = self._profiler
+        if profiler is None or not profiler.running:
+            return
+        profiler.end()
+        if profiler.done:
+            self._profiler = None
+            self.hass.async_create_task(self._async_write_profile(profiler))
+
+    async def _async_write_profile(self, profiler: CycleProfiler) -> None:
+        """Écrit le rapport de profilage dans le répertoire de configuration."""
+        stamp = utcnow().strftime("%Y%m%d_%H%M%S")
+        base = self.hass.config.path(f"{DOMAIN}_profile_{slugify(self._name)}_{stamp}")
+        report_path, stacks_path = f"{base}.txt", f"{base}.collapsed"
+        try:
+            await self.hass.async_add_executor_job(profiler.write, report_path, stacks_path)
+        except OSError as err:
+            _LOGGER.warning("Impossible d'écrire le profilage: %s", err)
+            return
+        _LOGGER.info("Profilage de %s écrit dans %s et %s", self._name, report_path, stacks_path)
+
     @property
-    def temperature_history(self) -> List[Dict[str, Any]]:
-        """Retourne l'historique des températures."""
-        return list(self._temperature_history)
+    def history(self) -> HistoryBuffer:
+        """Retourne l'historique en colonnes (vues sans copie)."""
+        return self._history
 
     @property
-    def oxygen_history(self) -> List[Dict[str, Any]]:
-        """Retourne l'historique des niveaux d'oxygène."""
-        return list(self._oxygen_history)
+    def history_tiers(self) -> Mapping[str, AggregateTier]:
+        """Retourne les niveaux agrégés de l'historique (5 minutes, heure)."""
+        return self._tiers
 
     @property
-    def predictions(self) -> Dict[str, Any]:
-        """Retourne les dernières prédictions."""
-        return self._cached_predictions.copy()
+    def daily_rollup(self) -> DailyRollup:
+        """Retourne les bilans journaliers."""
+        return self._daily
+
+    def query_history(
+        self,
+        tier: str,
+        start: Optional[float] = None,
+        end: Optional[float] = None,
+    ) -> tuple[tuple[str, ...], np.ndarray]:
+        """Retourne les colonnes et les lignes d'un niveau dans [start, end[.
+
+        Les niveaux sont tenus à jour à chaque échantillon : la lecture ne
+        recalcule rien, la période en cours est incluse.
+        """
+        if tier == TIER_RAW:
+            return self._history.columns, self._history.between(start, end)
+        source = self._daily if tier == TIER_DAY else self._tiers[tier]
+        return source.columns, source.query(start, end)
+
+    @property
+    def rolling_stats(self) -> Dict[str, RollingStats]:
+        """Retourne les statistiques glissantes sur 24h par signal."""
+        return self._rolling_stats
+
+    @property
+    def door_last_opened(self) -> Optional[datetime]:
+        """Retourne la date de la dernière ouverture de porte."""
+        if self._door_last_opened is None:
+            return None
+        return datetime.fromtimestamp(self._door_last_opened, timezone.utc)
+
+    @property
+    def door_openings_24h(self) -> int:
+        """Retourne le nombre d'ouvertures de porte sur 24h."""
+        return len(self._door_openings)
+
+    @property
+    def predictions_age(self) -> Optional[timedelta]:
+        """Retourne l'âge des dernières prédictions."""
+        if self._last_prediction_time is None:
+            return None
+        return utcnow() - self._last_prediction_time
+
+    @property
+    def predictions(self) -> Mapping[str, Any]:
+        """Retourne les dernières prédictions (instantané immuable)."""
+        return self._cached_predictions
+
+    @property
+    def metrics(self) -> Mapping[str, Any]:
+        """Retourne l'instantané des métriques dérivées de la dernière mise à jour."""
+        return self._metrics
+
+    @callback
+    def async_track_metrics(self, keys: Iterable[str]) -> CALLBACK_TYPE:
+        """Déclare les métriques consommées par une entité active.
+
+        Les métriques manquantes sont calculées immédiatement si des données
+        sont disponibles. Retourne la fonction de désinscription.
+        """
+        keys = tuple(keys)
+        for key in keys:
+            self._metric_consumers[key] += 1
+
+        missing = [key for key in keys if key not in self._metrics]
+        if missing and self.data is not None:
+            self._metrics = METRICS.evaluate(self, self.data, missing, self._metrics)
+
+        @callback
+        def _untrack() -> None:
+            for key in keys:
+                self._metric_consumers[key] -= 1
+                if self._metric_consumers[key] <= 0:
+                    del self._metric_consumers[key]
+
+        return _untrack
+
+    async def async_command(
+        self,
+        command: str,
+        send: Callable[[], Awaitable[bool]],
+        changes: Mapping[str, Any],
+        check: Optional[Callable[[StoveData], bool]] = None,
+    ) -> bool:
+        """Envoie une commande sans attendre de relecture.
+
+        L'état attendu (`changes`, champs nommés comme dans `StoveData.diff`)
+        est publié aussitôt ; dès l'acquittement du poêle, une interrogation
+        de vérification est programmée. Si le poêle n'acquitte pas, si
+        l'envoi échoue ou si la relecture montre que la commande n'a pas été
+        appliquée, l'état est rétabli et l'événement
+        `hwam_stove_command_failed` est émis.
+        """
+        self._expect(command, changes, check)
+        try:
+            acknowledged = await send()
+        except Exception:
+            self._async_rollback(command, "error")
+            raise
+        if not acknowledged:
+            self._async_rollback(command, "error")
+            return False
+        if (pending := self._pending_commands.get(command)) is not None:
+            pending.sent = True
+        self._schedule_verification()
+        return True
+
+    def _expect(
+        self,
+        command: str,
+        changes: Mapping[str, Any],
+        check: Optional[Callable[[StoveData], bool]] = None,
+        sent: bool = False,
+    ) -> None:
+        """Enregistre l'effet attendu d'une commande et le publie."""
+        if check is None:
+            def check(data: StoveData) -> bool:
+                return all(data.field(path) == value for path, value in changes.items())
+
+        self._pending_commands[command] = PendingCommand(changes, check, sent)
+        if self.data is not None:
+            self._async_set_optimistic_data(self.data.updated(changes))
+
+    def _reconcile_commands(self, data: StoveData) -> StoveData:
+        """Retire les commandes confirmées ou échouées et superpose les autres."""
+        for command, pending in list(self._pending_commands.items()):
+            if pending.check(data):
+                del self._pending_commands[command]
+            elif pending.verify:
+                del self._pending_commands[command]
+                self._async_command_failed(command, pending, "not_applied")
+            else:
+                data = data.updated(pending.changes)
+        return data
+
+    @callback
+    def _schedule_verification(self) -> None:
+        """Programme l'interrogation de vérification des commandes envoyées."""
+        if self._cancel_verification is not None:
+            self._cancel_verification()
+        self._cancel_verification = async_call_later(
+            self.hass, COMMAND_VERIFY_DELAY, self._async_verify_commands
+        )
+
+    async def _async_verify_commands(self, _now: datetime) -> None:
+        """Relit l'état du poêle pour confirmer les commandes envoyées."""
+        self._cancel_verification = None
+        for pending in self._pending_commands.values():
+            pending.verify = pending.sent
+        await self.async_refresh()
+
+    @callback
+    def _async_rollback(self, command: str, reason: str) -> None:
+        """Annule l'état optimiste d'une commande et rétablit l'état lu."""
+        pending = self._pending_commands.pop(command, None)
+        if pending is None:
+            return
+        self._async_command_failed(command, pending, reason)
+        if self._reported_data is not None:
+            data = self._reported_data
+            for other in self._pending_commands.values():
+                data = data.updated(other.changes)
+            self._async_set_optimistic_data(data)
+
+    @callback
+    def _async_command_failed(self, command: str, pending: PendingCommand, reason: str) -> None:
+        """Signale une commande non appliquée."""
+        _LOGGER.warning(
+            "Commande %s non appliquée par le poêle %s (%s)", command, self._name, reason
+        )
+        self.hass.bus.async_fire(
+            EVENT_COMMAND_FAILED,
+            {
+                "name": self._name,
+                "command": command,
+                "expected": {path: str(value) for path, value in pending.changes.items()},
+                "reason": reason,
+            },
+        )
 
     async def set_burn_level(self, level: int) -> bool:
-        """Définit le niveau de combustion."""
+        """Définit le niveau de combustion.
+
+        Le niveau est appliqué immédiatement de manière optimiste ; les
+        réglages rapprochés sont regroupés et seul le dernier est envoyé.
+        """
+        if not MIN_BURN_LEVEL <= level <= MAX_BURN_LEVEL:
+            raise ValueError(f"Niveau de combustion invalide: {level}")
+
+        self._pending_burn_level = level
+        self._expect("set_burn_level", {"state.burn_level": level})
+        await self._burn_level_debouncer.async_call()
+        return True
+
+    async def _async_send_burn_level(self, verify: bool = True) -> None:
+        """Envoie le dernier niveau de combustion demandé."""
+        level, self._pending_burn_level = self._pending_burn_level, None
+        if level is None:
+            return
+
         try:
-            result = await self.api.set_burn_level(level)
-            if result:
-                await self.async_refresh()
-            return result
-        except Exception as err:
+            acknowledged = await self.api.set_burn_level(level)
+        except Exception as err:  # pylint: disable=broad-except
             _LOGGER.error("Erreur lors du réglage du niveau de combustion: %s", err)
-            raise
+            acknowledged = False
+
+        if not acknowledged:
+            self._async_rollback("set_burn_level", "error")
+            return
+
+        # Une seule relecture, différée, pour confirmer l'état réel
+        if (pending := self._pending_commands.get("set_burn_level")) is not None:
+            pending.sent = True
+        if verify:
+            self._schedule_verification()
+
+    async def async_flush_commands(self) -> None:
+        """Envoie immédiatement les commandes en attente."""
+        self._burn_level_debouncer.async_cancel()
+        if self._cancel_verification is not None:
+            self._cancel_verification()
+            self._cancel_verification = None
+        await self._async_send_burn_level(verify=False)
+
+    @callback
+    def _async_set_optimistic_data(self, data: StoveData) -> None:
+        """Publie un état optimiste en ne réécrivant que les entités concernées."""
+        self._full_update = False
+        self._changed_fields = data.diff(self.data)
+        self._changed_metrics = frozenset()
+        self.async_set_updated_data(data)
 
     async def start_combustion(self) -> bool:
-        """Démarre la combustion."""
+        """Démarre la combustion (phase d'allumage attendue)."""
         try:
-            result = await self.api.start_combustion()
-            if result:
-                await self.async_refresh()
-            return result
+            return await self.async_command(
+                "start_combustion",
+                self.api.start_combustion,
+                {"state.phase": 1},
+                check=lambda data: data.state.is_active,
+            )
         except Exception as err:
             _LOGGER.error("Erreur lors du démarrage de la combustion: %s", err)
             raise
+
+    async def set_night_mode(self, start_time: dt_time, end_time: dt_time) -> bool:
+        """Définit la plage horaire du mode nuit."""
+        try:
+            return await self.async_command(
+                "set_night_mode",
+                lambda: self.api.set_night_time(start_time, end_time),
+                {
+                    "night_begin_time": start_time.replace(second=0, microsecond=0),
+                    "night_end_time": end_time.replace(second=0, microsecond=0),
+                },
+            )
+        except Exception as err:
+            _LOGGER.error("Erreur lors du réglage du mode nuit: %s", err)
+            raise
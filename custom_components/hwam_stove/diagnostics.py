@@ -0,0 +1,128 @@
+"""Diagnostics support for HWAM Smart Control."""
+from __future__ import annotations
+
+import json
+from typing import Any, Optional
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import CONF_HOST, CONF_PASSWORD, CONF_USERNAME
+from homeassistant.core import HomeAssistant
+
+from .const import DOMAIN
+from .coordinator import HWAMDataCoordinator
+from .timing import API_STAGES, COORDINATOR_STAGES
+
+TO_REDACT = {CONF_HOST, CONF_PASSWORD, CONF_USERNAME}
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry.
+
+    Everything is read from counters and summaries the coordinator and the
+    API client already maintain: nothing is rescanned or recomputed, so the
+    dump stays cheap whatever the history size or the number of stoves.
+    """
+    coordinator: HWAMDataCoordinator = hass.data[DOMAIN][entry.entry_id]
+    api = coordinator.api
+
+    return {
+        "entry": {
+            "title": entry.title,
+            "data": async_redact_data(dict(entry.data), TO_REDACT),
+            "options": dict(entry.options),
+        },
+        "coordinator": {
+            "last_update_success": coordinator.last_update_success,
+            "last_update": _isoformat(coordinator.last_update_dt),
+            "last_exception": _text(coordinator.last_exception),
+            "update_interval": _seconds(coordinator.update_interval),
+            "poll_latency": coordinator.poll_latency,
+            "suppressed_writes": coordinator.suppressed_writes,
+            "predictions_age": _seconds(coordinator.predictions_age),
+            "metrics": len(coordinator.metrics),
+        },
+        "history": {
+            "samples": len(coordinator.history),
+            "capacity": coordinator.history.capacity,
+            "nbytes": coordinator.history.nbytes,
+            "rolling_samples": {
+                name: len(stats) for name, stats in coordinator.rolling_stats.items()
+            },
+            "door_openings_24h": coordinator.door_openings_24h,
+            "tiers": {
+                **{
+                    name: {
+                        "periods": len(tier.buffer),
+                        "capacity": tier.buffer.capacity,
+                        "nbytes": tier.buffer.nbytes,
+                    }
+                    for name, tier in coordinator.history_tiers.items()
+                },
+                "day": {
+                    "periods": len(coordinator.daily_rollup.buffer),
+                    "capacity": coordinator.daily_rollup.buffer.capacity,
+                    "nbytes": coordinator.daily_rollup.buffer.nbytes,
+                },
+            },
+        },
+        "api": {
+            "cache_age": _seconds(api.cache_age),
+            "cache_source": api.last_source,
+            "cache_hits": api.cache_hits,
+            "cache_misses": api.cache_misses,
+            "cache_hit_rate": _ratio(api.cache_hits, api.cache_hits + api.cache_misses),
+            "retries": api.retries,
+            "circuit": {
+                "state": api.circuit.state,
+                "failures": api.circuit.failures,
+                "trips": api.circuit.trips,
+                "retry_in": api.circuit.retry_in,
+            },
+            "queue": {
+                "depth": api.scheduler.depth,
+                "max_depth": api.scheduler.max_depth,
+                "last_wait": api.scheduler.last_wait,
+                "average_wait": api.scheduler.average_wait,
+                "dropped": api.scheduler.dropped,
+                "preempted": api.scheduler.preempted,
+            },
+        },
+        "timings_ms": {
+            **{stage: api.timings.summary(stage) for stage in API_STAGES},
+            **{stage: coordinator.timings.summary(stage) for stage in COORDINATOR_STAGES},
+        },
+        "last_payload": _payload(api.last_body),
+    }
+
+
+def _payload(body: Optional[bytes]) -> Any:
+    """Return the last raw body, decoded when it is valid JSON."""
+    if body is None:
+        return None
+    try:
+        return json.loads(body)
+    except ValueError:
+        return body.decode(errors="replace")
+
+
+def _isoformat(value: Any) -> Optional[str]:
+    """Format a datetime."""
+    return value.isoformat() if value is not None else None
+
+
+def _seconds(value: Any) -> Optional[float]:
+    """Convert a timedelta to seconds."""
+    return round(value.total_seconds(), 3) if value is not None else None
+
+
+def _text(value: Any) -> Optional[str]:
+    """Convert a value to text."""
+    return str(value) if value is not None else None
+
+
+def _ratio(part: int, total: int) -> Optional[float]:
+    """Return part / total, None without total."""
+    return round(part / total, 3) if total else None
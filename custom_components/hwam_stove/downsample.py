@@ -0,0 +1,76 @@
+"""Réduction et encodage compact des séries de l'historique pour les graphiques."""
+from __future__ import annotations
+
+from typing import Optional, Sequence
+
+import numpy as np
+
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, threshold: int) -> np.ndarray:
+    """Retourne les indices retenus par Largest-Triangle-Three-Buckets.
+
+    Le premier et le dernier point sont conservés ; les autres sont répartis
+    en `threshold - 2` groupes, dont on garde le point formant le plus grand
+    triangle avec le point retenu précédent et la moyenne du groupe suivant.
+    Les pics et creux restent visibles, à la différence d'un sous-échantillonnage
+    régulier. Les valeurs manquantes sont interpolées pour le seul choix des
+    points.
+    """
+    size = len(x)
+    if threshold >= size or threshold < 3:
+        return np.arange(size)
+
+    y = np.asarray(y, dtype=float)
+    if (missing := np.isnan(y)).any():
+        known = ~missing
+        y = np.interp(x, x[known], y[known]) if known.any() else np.zeros(size)
+
+    # Bornes des groupes intermédiaires, strictement croissantes car size > threshold
+    edges = np.linspace(1, size - 1, threshold - 1).astype(np.intp)
+    indices = np.empty(threshold, dtype=np.intp)
+    indices[0] = 0
+    indices[-1] = size - 1
+    selected = 0
+    for bucket in range(threshold - 2):
+        low, high = edges[bucket], edges[bucket + 1]
+        next_high = edges[bucket + 2] if bucket + 2 < len(edges) else size
+        next_x = x[high:next_high].mean()
+        next_y = y[high:next_high].mean()
+        point_x, point_y = x[selected], y[selected]
+        areas = np.abs(
+            (point_x - next_x) * (y[low:high] - point_y)
+            - (point_x - x[low:high]) * (next_y - point_y)
+        )
+        selected = low + int(np.argmax(areas))
+        indices[bucket + 1] = selected
+    return indices
+
+
+def decimate(
+    columns: Sequence[str], rows: np.ndarray, signal: str, points: int
+) -> np.ndarray:
+    """Réduit une vue (colonnes x échantillons) à `points` échantillons au plus.
+
+    Les échantillons sont choisis sur le signal `signal` et appliqués à
+    toutes les colonnes, qui restent alignées sur les mêmes horodatages.
+    """
+    if rows.shape[1] <= points:
+        return rows
+    x = rows[columns.index("timestamp")]
+    return rows[:, lttb_indices(x, rows[columns.index(signal)], points)]
+
+
+def delta_encode(values: np.ndarray, scale: float) -> list[Optional[int]]:
+    """Encode une série en entiers `round(valeur * scale)` différentiels.
+
+    La première valeur présente est absolue, chaque suivante est l'écart à
+    la précédente valeur présente ; les valeurs manquantes restent None.
+    Décodage : somme cumulée des valeurs présentes, divisée par `scale`.
+    """
+    quantized = np.round(np.asarray(values, dtype=float) * scale)
+    present = ~np.isnan(quantized)
+    encoded: list[Optional[int]] = [None] * len(quantized)
+    deltas = np.diff(quantized[present].astype(np.int64), prepend=0)
+    for position, delta in zip(np.flatnonzero(present).tolist(), deltas.tolist()):
+        encoded[position] = delta
+    return encoded
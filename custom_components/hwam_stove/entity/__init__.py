@@ -2,10 +2,10 @@
 from __future__ import annotations
 
 import logging
-from typing import Any
+from typing import Any, Mapping
 
 from homeassistant.core import callback
-from homeassistant.helpers.entity import DeviceInfo, Entity
+from homeassistant.helpers.entity import DeviceInfo, Entity, EntityDescription
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from ..const import DOMAIN, MANUFACTURER, MODEL
@@ -14,6 +14,9 @@ from ..models import StoveData
 
 _LOGGER = logging.getLogger(__name__)
 
+# Champs lus par les attributs communs à toutes les entités
+BASE_DATA_FIELDS = ("algorithm", "firmware_version", "wifi_version", "remote_version")
+
 class HWAMEntity(CoordinatorEntity[HWAMDataCoordinator], Entity):
     """Base entity for HWAM integration."""
 
@@ -23,14 +26,15 @@ class HWAMEntity(CoordinatorEntity[HWAMDataCoordinator], Entity):
         self, 
         coordinator: HWAMDataCoordinator, 
         entry_id: str,
-        device_id: str,
+        entity_description: EntityDescription,
     ) -> None:
         """Initialize the entity."""
         super().__init__(coordinator)
+        self.entity_description = entity_description
         self._entry_id = entry_id
-        self._device_id = device_id
+        self._device_id = entry_id
         self._attr_device_info = DeviceInfo(
-            identifiers={(DOMAIN, device_id)},
+            identifiers={(DOMAIN, entry_id)},
             name=coordinator._name,
             manufacturer=MANUFACTURER,
             model=MODEL,
@@ -38,16 +42,44 @@ class HWAMEntity(CoordinatorEntity[HWAMDataCoordinator], Entity):
             suggested_area="Living Room",
         )
 
+    async def async_added_to_hass(self) -> None:
+        """Register the derived metrics used by this entity."""
+        await super().async_added_to_hass()
+        if metrics := getattr(self.entity_description, "metrics", ()):
+            self.async_on_remove(self.coordinator.async_track_metrics(metrics))
+
     @callback
     def _handle_coordinator_update(self) -> None:
-        """Handle updated data from the coordinator."""
-        self.async_write_ha_state()
+        """Handle updated data from the coordinator.
+
+        Entities declaring the data fields they read are only written when
+        one of those fields or one of their metrics changed.
+        """
+        if self._has_changes():
+            self.async_write_ha_state()
+        else:
+            self.coordinator.suppressed_writes += 1
+
+    def _has_changes(self) -> bool:
+        """Return whether the last update changed what this entity shows."""
+        data_fields = getattr(self.entity_description, "data_fields", None)
+        if data_fields is None:
+            return True
+        return self.coordinator.has_changes(
+            (*data_fields, *BASE_DATA_FIELDS),
+            getattr(self.entity_description, "metrics", ()),
+        )
 
     @property
     def stove_data(self) -> StoveData:
         """Get current stove data."""
         return self.coordinator.data
 
+    @property
+    def metrics(self) -> Mapping[str, Any]:
+        """Get the derived metrics snapshot."""
+        return self.coordinator.metrics
+
     @property
     def available(self) -> bool:
         """Return if entity is available."""
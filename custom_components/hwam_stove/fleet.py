@@ -0,0 +1,87 @@
+"""Planification partagée des interrogations de plusieurs poêles HWAM."""
+from __future__ import annotations
+
+import asyncio
+from contextlib import asynccontextmanager
+from datetime import timedelta
+import logging
+import random
+from typing import TYPE_CHECKING, AsyncIterator, Optional
+
+import aiohttp
+
+from .const import DATA_FLEET, FLEET_MAX_CONCURRENT_POLLS, FLEET_POLL_JITTER
+from .session import async_get_session
+
+if TYPE_CHECKING:
+    from homeassistant.core import HomeAssistant
+
+_LOGGER = logging.getLogger(__name__)
+
+class HWAMFleet:
+    """Ressources partagées par tous les poêles d'une instance.
+
+    Toutes les entrées utilisent la même session HTTP (un seul pool de
+    connexions), le nombre de requêtes simultanées est borné par un
+    sémaphore et les intervalles d'interrogation sont dispersés
+    aléatoirement pour éviter que les coordinateurs ne se synchronisent.
+    """
+
+    def __init__(
+        self,
+        session: aiohttp.ClientSession,
+        max_concurrent: int = FLEET_MAX_CONCURRENT_POLLS,
+        jitter: float = FLEET_POLL_JITTER,
+    ) -> None:
+        """Initialise la flotte."""
+        self.session = session
+        self._semaphore = asyncio.Semaphore(max_concurrent)
+        self._jitter = jitter
+        self._random = random.Random()
+        self._members: set[str] = set()
+
+    @property
+    def members(self) -> int:
+        """Retourne le nombre de poêles enregistrés."""
+        return len(self._members)
+
+    def register(self, entry_id: str) -> None:
+        """Ajoute un poêle à la flotte."""
+        self._members.add(entry_id)
+
+    def unregister(self, entry_id: str) -> bool:
+        """Retire un poêle ; retourne True si la flotte est vide."""
+        self._members.discard(entry_id)
+        return not self._members
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator[None]:
+        """Réserve une place parmi les interrogations simultanées."""
+        async with self._semaphore:
+            yield
+
+    def next_interval(self, interval: timedelta) -> timedelta:
+        """Retourne l'intervalle avant la prochaine interrogation, dispersé."""
+        if not self._jitter:
+            return interval
+        factor = self._random.uniform(1 - self._jitter, 1 + self._jitter)
+        return interval * factor
+
+
+def async_get_fleet(hass: "HomeAssistant") -> HWAMFleet:
+    """Retourne la flotte de l'instance, créée à la première entrée."""
+    if (fleet := hass.data.get(DATA_FLEET)) is None:
+        fleet = hass.data[DATA_FLEET] = HWAMFleet(async_get_session(hass))
+    return fleet
+
+
+async def async_release_fleet(hass: "HomeAssistant", entry_id: str) -> None:
+    """Retire une entrée et libère la flotte après la dernière.
+
+    La session du domaine reste ouverte pour les autres usages (flux de
+    configuration) et n'est fermée qu'à l'arrêt de Home Assistant.
+    """
+    fleet: Optional[HWAMFleet] = hass.data.get(DATA_FLEET)
+    if fleet is not None and fleet.unregister(entry_id):
+        hass.data.pop(DATA_FLEET)
+        _LOGGER.debug("Flotte HWAM libérée")
@@ -0,0 +1,200 @@
+"""Historique en anneau à colonnes pour HWAM Smart Control."""
+from __future__ import annotations
+
+from collections import deque
+import math
+from typing import Iterable, Optional, Sequence
+
+import numpy as np
+
+# Colonnes enregistrées à chaque mise à jour (horodatage epoch en secondes)
+HISTORY_COLUMNS: tuple[str, ...] = ("timestamp", "stove_temp", "room_temp", "oxygen")
+
+
+class HistoryBuffer:
+    """Tampon circulaire préalloué avec une colonne numpy par signal.
+
+    Chaque échantillon est écrit deux fois (aux positions i et i + capacité),
+    de sorte que les n derniers échantillons forment toujours une tranche
+    contiguë : les lecteurs reçoivent des vues en lecture seule, sans copie,
+    quelle que soit la position de rebouclage.
+    """
+
+    def __init__(
+        self,
+        capacity: int,
+        columns: Sequence[str] = HISTORY_COLUMNS,
+    ) -> None:
+        """Initialise le tampon."""
+        if capacity <= 0:
+            raise ValueError("La capacité de l'historique doit être positive")
+        if columns[0] != "timestamp":
+            raise ValueError("La première colonne doit être 'timestamp'")
+
+        self._capacity = capacity
+        self._columns = tuple(columns)
+        self._index = {name: i for i, name in enumerate(self._columns)}
+        self._data = np.full((len(self._columns), 2 * capacity), np.nan)
+        self._head = 0  # Prochaine position d'écriture
+        self._size = 0
+
+    def __len__(self) -> int:
+        """Retourne le nombre d'échantillons disponibles."""
+        return self._size
+
+    @property
+    def capacity(self) -> int:
+        """Retourne la capacité maximale du tampon."""
+        return self._capacity
+
+    @property
+    def columns(self) -> tuple[str, ...]:
+        """Retourne le nom des colonnes."""
+        return self._columns
+
+    @property
+    def nbytes(self) -> int:
+        """Retourne l'empreinte mémoire du stockage préalloué."""
+        return self._data.nbytes
+
+    def append(self, sample: Sequence[float]) -> None:
+        """Ajoute un échantillon (une valeur par colonne) en O(1)."""
+        head = self._head
+        self._data[:, head] = sample
+        self._data[:, head + self._capacity] = sample
+        self._head = (head + 1) % self._capacity
+        if self._size < self._capacity:
+            self._size += 1
+
+    def extend(self, samples: np.ndarray | Iterable[Sequence[float]]) -> None:
+        """Ajoute plusieurs échantillons, seuls les plus récents sont conservés."""
+        rows = np.asarray(samples, dtype=float)
+        if rows.size == 0:
+            return
+        rows = rows.reshape(-1, len(self._columns))[-self._capacity:]
+        for row in rows:
+            self.append(row)
+
+    def clear(self) -> None:
+        """Vide l'historique."""
+        self._data.fill(np.nan)
+        self._head = 0
+        self._size = 0
+
+    def _bounds(self, count: Optional[int]) -> tuple[int, int]:
+        """Calcule les bornes de la tranche contenant les derniers échantillons."""
+        if count is None or count > self._size:
+            count = self._size
+        end = self._head + self._capacity
+        return end - max(count, 0), end
+
+    def window(self, count: Optional[int] = None) -> np.ndarray:
+        """Retourne une vue (colonnes x échantillons) des derniers échantillons."""
+        start, end = self._bounds(count)
+        view = self._data[:, start:end]
+        view.flags.writeable = False
+        return view
+
+    def column(self, name: str, count: Optional[int] = None) -> np.ndarray:
+        """Retourne une vue sur les derniers échantillons d'une colonne."""
+        start, end = self._bounds(count)
+        view = self._data[self._index[name], start:end]
+        view.flags.writeable = False
+        return view
+
+    def count_since(self, timestamp: float) -> int:
+        """Retourne le nombre d'échantillons postérieurs ou égaux à l'horodatage."""
+        times = self.column("timestamp")
+        return self._size - int(np.searchsorted(times, timestamp, side="left"))
+
+    def between(self, start: Optional[float] = None, end: Optional[float] = None) -> np.ndarray:
+        """Retourne une vue (colonnes x échantillons) des horodatages dans [start, end[."""
+        times = self.column("timestamp")
+        first = 0 if start is None else int(np.searchsorted(times, start, side="left"))
+        last = self._size if end is None else int(np.searchsorted(times, end, side="left"))
+        offset = self._head + self._capacity - self._size
+        view = self._data[:, offset + first:offset + max(first, last)]
+        view.flags.writeable = False
+        return view
+
+    def latest(self, name: str) -> Optional[float]:
+        """Retourne la dernière valeur d'une colonne."""
+        if self._size == 0:
+            return None
+        return float(self._data[self._index[name], self._head + self._capacity - 1])
+
+
+class RollingStats:
+    """Minimum, maximum et moyenne glissants sur une fenêtre temporelle.
+
+    Les extrêmes sont suivis par deux files monotones et la moyenne par une
+    somme courante : l'ajout est en O(1) amorti et la lecture en O(1).
+    """
+
+    def __init__(self, window: float) -> None:
+        """Initialise l'agrégateur pour une fenêtre exprimée en secondes."""
+        self._window = window
+        self._samples: deque[tuple[float, float]] = deque()
+        self._min: deque[tuple[float, float]] = deque()
+        self._max: deque[tuple[float, float]] = deque()
+        self._sum = 0.0
+
+    def __len__(self) -> int:
+        """Retourne le nombre d'échantillons dans la fenêtre."""
+        return len(self._samples)
+
+    def add(self, timestamp: float, value: float) -> None:
+        """Ajoute un échantillon et retire ceux sortis de la fenêtre."""
+        if math.isnan(value):
+            return
+
+        self._samples.append((timestamp, value))
+        self._sum += value
+
+        while self._min and self._min[-1][1] >= value:
+            self._min.pop()
+        self._min.append((timestamp, value))
+
+        while self._max and self._max[-1][1] <= value:
+            self._max.pop()
+        self._max.append((timestamp, value))
+
+        self._expire(timestamp - self._window)
+
+    def _expire(self, limit: float) -> None:
+        """Retire les échantillons antérieurs à la limite."""
+        samples = self._samples
+        while samples and samples[0][0] < limit:
+            self._sum -= samples.popleft()[1]
+        if not samples:
+            # Évite l'accumulation d'erreurs d'arrondi
+            self._sum = 0.0
+
+        while self._min and self._min[0][0] < limit:
+            self._min.popleft()
+        while self._max and self._max[0][0] < limit:
+            self._max.popleft()
+
+    def clear(self) -> None:
+        """Réinitialise l'agrégateur."""
+        self._samples.clear()
+        self._min.clear()
+        self._max.clear()
+        self._sum = 0.0
+
+    @property
+    def min(self) -> Optional[float]:
+        """Retourne le minimum de la fenêtre."""
+        return self._min[0][1] if self._min else None
+
+    @property
+    def max(self) -> Optional[float]:
+        """Retourne le maximum de la fenêtre."""
+        return self._max[0][1] if self._max else None
+
+    @property
+    def mean(self) -> Optional[float]:
+        """Retourne la moyenne de la fenêtre."""
+        if not self._samples:
+            return None
+        return self._sum / len(self._samples)
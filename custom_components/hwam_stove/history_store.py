@@ -0,0 +1,208 @@
+"""Persistance de l'historique HWAM dans un fichier à enregistrements fixes."""
+from __future__ import annotations
+
+import logging
+import mmap
+import os
+import struct
+import time
+from typing import Optional, Sequence
+
+import numpy as np
+
+_LOGGER = logging.getLogger(__name__)
+
+# En-tête : signature, version, nombre de colonnes, réservé
+_HEADER = struct.Struct("<8sHH4x")
+_MAGIC = b"HWAMHIST"
+_VERSION = 1
+_NAME_SIZE = 16
+
+
+class HistoryStore:
+    """Fichier d'historique en ajout seul, relu par projection mémoire.
+
+    Le fichier commence par un en-tête décrivant les colonnes, suivi
+    d'enregistrements de taille fixe (horodatage float64 puis une valeur
+    float32 par signal). Le chargement projette le fichier en mémoire et
+    l'interprète directement comme un tableau numpy, sans analyse. Le
+    fichier est compacté périodiquement pour ne garder que la rétention.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        columns: Sequence[str],
+        retention: float,
+        compact_every: int = 1024,
+    ) -> None:
+        """Initialise le stockage."""
+        self._path = path
+        self._columns = tuple(columns)
+        self._retention = retention
+        self._compact_every = compact_every
+        self._dtype = self._build_dtype(self._columns)
+        self._file = None
+        self._appended = 0
+        self._torn = False
+
+    @staticmethod
+    def _build_dtype(columns: Sequence[str]) -> np.dtype:
+        """Construit le type d'enregistrement pour les colonnes données."""
+        return np.dtype(
+            [(columns[0], "<f8")] + [(name, "<f4") for name in columns[1:]]
+        )
+
+    @property
+    def path(self) -> str:
+        """Retourne le chemin du fichier."""
+        return self._path
+
+    @property
+    def record_size(self) -> int:
+        """Retourne la taille d'un enregistrement en octets."""
+        return self._dtype.itemsize
+
+    def _header(self) -> bytes:
+        """Construit l'en-tête du fichier pour les colonnes courantes."""
+        names = b"".join(
+            name.encode("ascii").ljust(_NAME_SIZE, b"\0") for name in self._columns
+        )
+        return _HEADER.pack(_MAGIC, _VERSION, len(self._columns)) + names
+
+    def _read_records(self) -> Optional[np.ndarray]:
+        """Lit les enregistrements du fichier via une projection mémoire."""
+        with open(self._path, "rb") as file:
+            size = os.fstat(file.fileno()).st_size
+            if size < _HEADER.size:
+                return None
+
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                magic, version, count = _HEADER.unpack_from(mapped, 0)
+                if magic != _MAGIC or version != _VERSION:
+                    return None
+
+                offset = _HEADER.size + count * _NAME_SIZE
+                # En-tête corrompu ou tronqué : fichier illisible
+                if count == 0 or offset > size:
+                    return None
+                names = [
+                    mapped[start:start + _NAME_SIZE].rstrip(b"\0").decode("ascii")
+                    for start in range(_HEADER.size, offset, _NAME_SIZE)
+                ]
+                dtype = self._build_dtype(names)
+                # Un enregistrement partiel (écriture interrompue) est ignoré
+                records, remainder = divmod(size - offset, dtype.itemsize)
+                self._torn = remainder != 0
+                view = np.frombuffer(mapped, dtype=dtype, count=records, offset=offset)
+                # Copie obligatoire avant de libérer la projection
+                result = view.copy()
+                del view
+                return result
+
+    def load(self) -> np.ndarray:
+        """Charge l'historique conservé sous forme (échantillons x colonnes).
+
+        Les colonnes absentes du fichier sont remplies de NaN. Le fichier
+        est réécrit s'il est illisible, si son format diffère ou si des
+        échantillons ont expiré, pour rester borné même lorsque les
+        redémarrages précèdent la compaction périodique.
+        """
+        rows = np.empty((0, len(self._columns)))
+        try:
+            records = self._read_records()
+        except FileNotFoundError:
+            records = np.zeros(0, dtype=self._dtype)
+        except (OSError, ValueError) as err:
+            _LOGGER.warning("Historique illisible %s, réinitialisation: %s", self._path, err)
+            records = None
+
+        if records is None:
+            self._rewrite(np.zeros(0, dtype=self._dtype))
+            return rows
+
+        expired = False
+        if records.size:
+            limit = time.time() - self._retention
+            retained = records[records[self._columns[0]] >= limit]
+            expired = retained.size != records.size
+            records = retained
+            rows = np.full((records.size, len(self._columns)), np.nan)
+            for index, name in enumerate(self._columns):
+                if name in records.dtype.names:
+                    rows[:, index] = records[name]
+
+        if (
+            self._torn
+            or expired
+            or records.dtype != self._dtype
+            or not os.path.exists(self._path)
+        ):
+            self._rewrite(self._to_records(rows))
+        return rows
+
+    def _to_records(self, rows: np.ndarray) -> np.ndarray:
+        """Convertit des lignes (échantillons x colonnes) en enregistrements."""
+        rows = np.asarray(rows, dtype=float).reshape(-1, len(self._columns))
+        records = np.empty(rows.shape[0], dtype=self._dtype)
+        for index, name in enumerate(self._columns):
+            records[name] = rows[:, index]
+        return records
+
+    def _open(self):
+        """Ouvre le fichier en ajout."""
+        if self._file is None:
+            self._file = open(self._path, "ab")
+        return self._file
+
+    def append(self, rows: np.ndarray | Sequence[float]) -> None:
+        """Ajoute un ou plusieurs échantillons en fin de fichier."""
+        records = self._to_records(rows)
+        file = self._open()
+        file.write(records.tobytes())
+        file.flush()
+
+        self._appended += records.size
+        if self._appended >= self._compact_every:
+            self.compact()
+
+    def compact(self) -> None:
+        """Réécrit le fichier en ne gardant que les échantillons retenus."""
+        self.close()
+        try:
+            records = self._read_records()
+        except OSError as err:
+            _LOGGER.warning("Compaction de l'historique impossible: %s", err)
+            return
+        if records is None or records.dtype != self._dtype:
+            records = np.zeros(0, dtype=self._dtype)
+
+        limit = time.time() - self._retention
+        self._rewrite(records[records[self._columns[0]] >= limit])
+
+    def _rewrite(self, records: np.ndarray) -> None:
+        """Remplace le fichier de manière atomique."""
+        self.close()
+        os.makedirs(os.path.dirname(self._path) or ".", exist_ok=True)
+        temp_path = f"{self._path}.tmp"
+        with open(temp_path, "wb") as file:
+            file.write(self._header())
+            file.write(records.tobytes())
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temp_path, self._path)
+        self._appended = 0
+
+    def close(self) -> None:
+        """Ferme le fichier."""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def remove(self) -> None:
+        """Supprime le fichier d'historique."""
+        self.close()
+        try:
+            os.remove(self._path)
+        except FileNotFoundError:
+            pass
@@ -0,0 +1,277 @@
+"""Registre des métriques dérivées HWAM."""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import date
+from types import MappingProxyType
+from typing import TYPE_CHECKING, Any, Callable, Iterable, Mapping, Optional
+
+from .const import MAX_BURN_LEVEL, MIN_BURN_LEVEL
+from .models import StoveData
+from .timing import API_STAGES, TIMING_STAGES
+
+if TYPE_CHECKING:
+    from .coordinator import HWAMDataCoordinator
+
+EMPTY_METRICS: Mapping[str, Any] = MappingProxyType({})
+
+
+@dataclass(frozen=True)
+class DerivedMetric:
+    """Métrique calculée à partir des données et d'autres métriques."""
+
+    key: str
+    compute: Callable[["HWAMDataCoordinator", StoveData, Mapping[str, Any]], Any]
+    depends_on: tuple[str, ...] = ()
+    # Lue sur l'état d'exécution (diagnostic) plutôt que sur l'instantané :
+    # réévaluée même lorsque le poêle renvoie une réponse identique
+    live: bool = False
+
+
+class MetricsRegistry:
+    """Registre de métriques nommées avec dépendances déclarées.
+
+    Seules les métriques demandées et leurs dépendances sont évaluées, dans
+    l'ordre topologique, et le résultat est figé dans un instantané immuable.
+    Les métriques `live` peuvent être réévaluées seules (`refresh_live`).
+    """
+
+    def __init__(self, metrics: Iterable[DerivedMetric] = ()) -> None:
+        """Initialise le registre."""
+        self._metrics: dict[str, DerivedMetric] = {}
+        self._live: set[str] = set()
+        self._plans: dict[frozenset[str], tuple[DerivedMetric, ...]] = {}
+        for metric in metrics:
+            self.register(metric)
+
+    def __contains__(self, key: object) -> bool:
+        """Vérifie si une métrique est enregistrée."""
+        return key in self._metrics
+
+    def register(self, metric: DerivedMetric) -> None:
+        """Enregistre une métrique."""
+        if metric.key in self._metrics:
+            raise ValueError(f"Métrique déjà enregistrée: {metric.key}")
+        self._metrics[metric.key] = metric
+        if metric.live:
+            self._live.add(metric.key)
+        self._plans.clear()
+
+    def plan(self, keys: Iterable[str]) -> tuple[DerivedMetric, ...]:
+        """Retourne les métriques à évaluer, dépendances comprises, dans l'ordre."""
+        wanted = frozenset(keys)
+        if (cached := self._plans.get(wanted)) is not None:
+            return cached
+
+        ordered: list[DerivedMetric] = []
+        visiting: set[str] = set()
+        done: set[str] = set()
+
+        def visit(key: str) -> None:
+            if key in done:
+                return
+            if key in visiting:
+                raise ValueError(f"Dépendance circulaire sur la métrique {key}")
+            metric = self._metrics[key]
+            visiting.add(key)
+            for dependency in metric.depends_on:
+                visit(dependency)
+            visiting.discard(key)
+            done.add(key)
+            ordered.append(metric)
+
+        for key in sorted(wanted):
+            visit(key)
+
+        plan = self._plans[wanted] = tuple(ordered)
+        return plan
+
+    def evaluate(
+        self,
+        coordinator: "HWAMDataCoordinator",
+        data: StoveData,
+        keys: Iterable[str],
+        base: Mapping[str, Any] = EMPTY_METRICS,
+    ) -> Mapping[str, Any]:
+        """Évalue les métriques demandées et retourne un instantané immuable.
+
+        Les valeurs déjà présentes dans `base` ne sont pas recalculées.
+        """
+        values = dict(base)
+        for metric in self.plan(keys):
+            if metric.key in values:
+                continue
+            try:
+                values[metric.key] = metric.compute(coordinator, data, values)
+            except Exception:  # pylint: disable=broad-except
+                values[metric.key] = None
+        return MappingProxyType(values)
+
+    def refresh_live(
+        self,
+        coordinator: "HWAMDataCoordinator",
+        data: StoveData,
+        keys: Iterable[str],
+        previous: Mapping[str, Any],
+    ) -> Mapping[str, Any]:
+        """Réévalue les métriques `live` demandées, les autres étant reprises."""
+        return self.evaluate(
+            coordinator,
+            data,
+            keys,
+            base={key: value for key, value in previous.items() if key not in self._live},
+        )
+
+
+def recommended_burn_level(data: StoveData, temp_trend: Optional[str]) -> int:
+    """Calcule le niveau de combustion recommandé basé sur différents facteurs."""
+    if not data.state.is_active:
+        return 0
+
+    # Facteurs de décision
+    current_temp = data.temperatures.stove_temperature
+    room_temp = data.temperatures.room_temperature
+
+    # Logique de recommandation
+    if current_temp > 500:  # Température trop haute
+        return max(MIN_BURN_LEVEL, data.state.burn_level - 1)
+    elif current_temp < 200 and room_temp < 19:  # Besoin de chaleur
+        return min(MAX_BURN_LEVEL, data.state.burn_level + 1)
+    elif temp_trend == "falling" and room_temp < 20:
+        return min(MAX_BURN_LEVEL, data.state.burn_level + 1)
+    elif temp_trend == "rising" and current_temp > 400:
+        return max(MIN_BURN_LEVEL, data.state.burn_level - 1)
+
+    # Mode par défaut
+    return data.state.burn_level
+
+
+def _rolling(signal: str, field: str) -> DerivedMetric:
+    """Construit une métrique lisant une statistique glissante sur 24h."""
+    return DerivedMetric(
+        key=f"{signal}_{field}_24h",
+        compute=lambda coordinator, data, values: getattr(
+            coordinator.rolling_stats[signal], field
+        ),
+    )
+
+
+def _prediction(key: str) -> DerivedMetric:
+    """Construit une métrique lisant une prédiction du coordinateur."""
+    return DerivedMetric(
+        key=key,
+        compute=lambda coordinator, data, values: coordinator.predictions.get(key),
+    )
+
+
+def _timing(stage: str) -> DerivedMetric:
+    """Construit une métrique lisant les percentiles de durée d'une étape."""
+    def compute(coordinator, data, values) -> Optional[dict[str, float]]:
+        timings = coordinator.api.timings if stage in API_STAGES else coordinator.timings
+        return timings.summary(stage)
+
+    return DerivedMetric(key=f"timing_{stage}", compute=compute, live=True)
+
+
+def _recent_oxygen_average(coordinator, data, values) -> Optional[float]:
+    """Moyenne des 5 dernières mesures d'oxygène."""
+    if len(coordinator.history) < 5:
+        return None
+    return float(coordinator.history.column("oxygen", 5).mean())
+
+
+def _hours_since_service(coordinator, data, values) -> float:
+    """Nombre d'heures depuis la dernière révision."""
+    return (date.today() - data.service_date).days * 24.0
+
+
+def _cache_age_seconds(coordinator, data, values) -> Optional[float]:
+    """Âge de l'instantané du poêle en secondes."""
+    if (age := coordinator.api.cache_age) is None:
+        return None
+    return round(age.total_seconds(), 1)
+
+
+def _poll_latency_ms(coordinator, data, values) -> Optional[float]:
+    """Durée de la dernière interrogation en millisecondes."""
+    if coordinator.poll_latency is None:
+        return None
+    return round(coordinator.poll_latency * 1000, 1)
+
+
+def _request_wait_ms(coordinator, data, values) -> Optional[float]:
+    """Attente moyenne (lissée) des requêtes dans la file, en millisecondes."""
+    if (wait := coordinator.api.scheduler.average_wait) is None:
+        return None
+    return round(wait * 1000, 1)
+
+
+def _request_queue_stats(coordinator, data, values) -> dict[str, Any]:
+    """Compteurs de la file de requêtes du poêle."""
+    scheduler = coordinator.api.scheduler
+    return {
+        "depth": scheduler.depth,
+        "max_depth": scheduler.max_depth,
+        "last_wait_ms": (
+            None if scheduler.last_wait is None else round(scheduler.last_wait * 1000, 1)
+        ),
+        "dropped_polls": scheduler.dropped,
+        "preempted_polls": scheduler.preempted,
+    }
+
+
+METRICS = MetricsRegistry(
+    (
+        *(
+            _rolling(signal, field)
+            for signal in ("stove_temp", "room_temp", "oxygen")
+            for field in ("min", "max", "mean")
+        ),
+        _prediction("temperature_trend"),
+        _prediction("efficiency_score"),
+        _prediction("refill_time"),
+        DerivedMetric(
+            key="refill_time_text",
+            compute=lambda coordinator, data, values: (
+                str(values["refill_time"]) if values["refill_time"] else None
+            ),
+            depends_on=("refill_time",),
+        ),
+        DerivedMetric(key="oxygen_average_recent", compute=_recent_oxygen_average),
+        DerivedMetric(
+            key="recommended_burn_level",
+            compute=lambda coordinator, data, values: recommended_burn_level(
+                data, values["temperature_trend"]
+            ),
+            depends_on=("temperature_trend",),
+        ),
+        DerivedMetric(key="hours_since_service", compute=_hours_since_service),
+        DerivedMetric(
+            key="door_last_opened",
+            compute=lambda coordinator, data, values: coordinator.door_last_opened,
+        ),
+        DerivedMetric(
+            key="door_openings_24h",
+            compute=lambda coordinator, data, values: coordinator.door_openings_24h,
+        ),
+        DerivedMetric(key="poll_latency", compute=_poll_latency_ms, live=True),
+        DerivedMetric(key="cache_age", compute=_cache_age_seconds, live=True),
+        DerivedMetric(
+            key="cache_stats",
+            compute=lambda coordinator, data, values: {
+                "source": coordinator.api.last_source,
+                "hits": coordinator.api.cache_hits,
+                "misses": coordinator.api.cache_misses,
+            },
+            live=True,
+        ),
+        *(_timing(stage) for stage in TIMING_STAGES),
+        DerivedMetric(key="request_wait", compute=_request_wait_ms, live=True),
+        DerivedMetric(key="request_queue", compute=_request_queue_stats, live=True),
+        DerivedMetric(
+            key="circuit_state",
+            compute=lambda coordinator, data, values: coordinator.api.circuit.state,
+            live=True,
+        ),
+    )
+)
@@ -1,11 +1,42 @@
 """Data models for HWAM Smart Control."""
 from datetime import datetime, date, time, timedelta
-from typing import List, Optional
+from functools import lru_cache
+from typing import Any, List, Mapping, Optional
 import logging
 from pydantic import BaseModel, validator, Field
 
 _LOGGER = logging.getLogger(__name__)
 
+# Validation pydantic complète à chaque décodage (utile pour les tests)
+STRICT_PARSING = False
+
+@lru_cache(maxsize=16)
+def _format_version(major: int, minor: int, build: int) -> str:
+    """Formate un numéro de version (mémoïsé, change rarement)."""
+    return f"{major}.{minor}.{build}"
+
+@lru_cache(maxsize=8)
+def _parse_service_date(raw: str) -> date:
+    """Analyse la date de révision (mémoïsée, change rarement)."""
+    return datetime.strptime(raw, "%Y-%m-%d").date()
+
+@lru_cache(maxsize=64)
+def _clock_time(hour: int, minute: int) -> time:
+    """Construit une heure de la journée (mémoïsée)."""
+    return time(hour=hour, minute=minute)
+
+@lru_cache(maxsize=256)
+def _parse_delay(raw: str) -> timedelta:
+    """Analyse une durée au format HH:MM (mémoïsée)."""
+    hours, minutes = raw.split(":")[:2]
+    return timedelta(hours=int(hours), minutes=int(minutes))
+
+def _decode_delay(value: Any) -> timedelta:
+    """Convertit une durée transmise sous forme d'heure ou de texte HH:MM."""
+    if isinstance(value, str):
+        return _parse_delay(value)
+    return timedelta(hours=value.hour, minutes=value.minute)
+
 class AlarmState(BaseModel):
     """Représentation des états d'alarme."""
     maintenance_alarms: int = Field(default=0, ge=0)
@@ -14,6 +45,10 @@ class AlarmState(BaseModel):
     remote_refill_alarm: bool = False
     remote_refill_beeps: int = Field(default=0, ge=0)
 
+    class Config:
+        """Configuration Pydantic : instances partagées entre instantanés."""
+        frozen = True
+
     def has_alarms(self) -> bool:
         """Vérifie si des alarmes sont actives."""
         return (self.maintenance_alarms > 0 or 
@@ -50,6 +85,10 @@ class StoveState(BaseModel):
     updating: bool = False
     night_lowering: bool = False
 
+    class Config:
+        """Configuration Pydantic : instances partagées entre instantanés."""
+        frozen = True
+
     @property
     def is_active(self) -> bool:
         """Vérifie si le poêle est en combustion active."""
@@ -115,18 +154,30 @@ class StoveData(BaseModel):
         arbitrary_types_allowed = True
 
     @classmethod
-    def from_dict(cls, data: dict) -> 'StoveData':
-        """Crée une instance StoveData à partir d'un dictionnaire."""
+    def from_dict(cls, data: dict, strict: Optional[bool] = None) -> 'StoveData':
+        """Crée une instance StoveData à partir d'un dictionnaire.
+
+        Par défaut, les modèles sont construits sans revalidation pydantic :
+        la réponse de l'API est considérée comme fiable et les champs quasi
+        statiques (versions, date de révision, heures du mode nuit) sont
+        décodés une seule fois. Le mode strict valide tous les champs.
+        """
+        if strict is None:
+            strict = STRICT_PARSING
+        build = _build_validated if strict else _build_trusted
+
         try:
             # Traitement des températures
-            temperatures = TemperatureData(
+            temperatures = build(
+                TemperatureData,
                 stove_temperature=data["stove_temperature"] / 100,
                 room_temperature=data["room_temperature"] / 100,
                 oxygen_level=data["oxygen_level"] / 100,
             )
 
             # État du poêle
-            state = StoveState(
+            state = build(
+                StoveState,
                 phase=data["phase"],
                 burn_level=data["burn_level"],
                 operation_mode=data["operation_mode"],
@@ -136,7 +187,8 @@ class StoveData(BaseModel):
             )
 
             # État des alarmes
-            alarms = AlarmState(
+            alarms = build(
+                AlarmState,
                 maintenance_alarms=data["maintenance_alarms"],
                 safety_alarms=data["safety_alarms"],
                 refill_alarm=data["refill_alarm"] == 1,
@@ -145,25 +197,30 @@ class StoveData(BaseModel):
             )
 
             # Construction de l'instance complète
-            return cls(
+            return build(
+                cls,
                 algorithm=data["algorithm"],
-                firmware_version=f"{data['version_major']}.{data['version_minor']}.{data['version_build']}",
-                wifi_version=f"{data['wifi_version_major']}.{data['wifi_version_minor']}.{data['wifi_version_build']}",
-                remote_version=f"{data['remote_version_major']}.{data['remote_version_minor']}.{data['remote_version_build']}",
-                service_date=datetime.strptime(data["service_date"], "%Y-%m-%d").date(),
+                firmware_version=_format_version(
+                    data["version_major"], data["version_minor"], data["version_build"]
+                ),
+                wifi_version=_format_version(
+                    data["wifi_version_major"], data["wifi_version_minor"], data["wifi_version_build"]
+                ),
+                remote_version=_format_version(
+                    data["remote_version_major"], data["remote_version_minor"], data["remote_version_build"]
+                ),
+                service_date=_parse_service_date(data["service_date"]),
                 state=state,
                 alarms=alarms,
                 temperatures=temperatures,
                 valve1_position=data["valve1_position"],
                 valve2_position=data["valve2_position"],
                 valve3_position=data["valve3_position"],
-                night_begin_time=time(
-                    hour=data["night_begin_hour"],
-                    minute=data["night_begin_minute"]
+                night_begin_time=_clock_time(
+                    data["night_begin_hour"], data["night_begin_minute"]
                 ),
-                night_end_time=time(
-                    hour=data["night_end_hour"],
-                    minute=data["night_end_minute"]
+                night_end_time=_clock_time(
+                    data["night_end_hour"], data["night_end_minute"]
                 ),
                 current_datetime=datetime(
                     year=data["year"],
@@ -173,10 +230,7 @@ class StoveData(BaseModel):
                     minute=data["minutes"],
                     second=data["seconds"]
                 ),
-                time_since_remote_msg=timedelta(
-                    hours=data["time_since_remote_msg"].hour,
-                    minutes=data["time_since_remote_msg"].minute
-                ),
+                time_since_remote_msg=_decode_delay(data["time_since_remote_msg"]),
                 new_fire_wood_time=timedelta(
                     hours=data["new_fire_wood_hours"],
                     minutes=data["new_fire_wood_minutes"]
@@ -193,3 +247,136 @@ class StoveData(BaseModel):
     def to_dict(self) -> dict:
         """Convertit l'instance en dictionnaire."""
         return self.dict(by_alias=True)
+
+    def updated(self, changes: Mapping[str, Any]) -> 'StoveData':
+        """Retourne une copie modifiée (état optimiste).
+
+        Les champs sont nommés comme dans `diff` : `champ` ou `modèle.champ`.
+        """
+        update: dict[str, Any] = {}
+        nested: dict[str, dict[str, Any]] = {}
+        for path, value in changes.items():
+            name, _, field = path.partition(".")
+            if field:
+                nested.setdefault(name, {})[field] = value
+            else:
+                update[name] = value
+        for name, fields in nested.items():
+            model = getattr(self, name)
+            update[name] = _build_trusted(type(model), **{**_model_values(model), **fields})
+        if _PYDANTIC_V2:
+            return self.model_copy(update=update)
+        return self.copy(update=update)
+
+    def field(self, path: str) -> Any:
+        """Retourne la valeur d'un champ nommé comme dans `diff`."""
+        value = self
+        for name in path.split("."):
+            value = getattr(value, name)
+        return value
+
+    def diff(self, previous: Optional['StoveData']) -> frozenset[str]:
+        """Retourne les champs modifiés depuis un instantané précédent.
+
+        Les champs des sous-modèles sont nommés `modèle.champ` ; le nom du
+        sous-modèle est aussi inclus dès qu'un de ses champs change. Sans
+        instantané précédent, tous les champs sont considérés modifiés.
+        """
+        if previous is None:
+            return _all_field_names(type(self))
+
+        changed = []
+        for name in _field_names(type(self)):
+            new, old = getattr(self, name), getattr(previous, name)
+            # Sous-modèles partagés : identité = aucun changement
+            if new is old:
+                continue
+            if isinstance(new, BaseModel):
+                fields = [
+                    f"{name}.{field}"
+                    for field in _field_names(type(new))
+                    if getattr(new, field) != getattr(old, field)
+                ]
+                if fields:
+                    changed.append(name)
+                    changed.extend(fields)
+            elif new != old:
+                changed.append(name)
+        return frozenset(changed)
+
+def _build_validated(model: type[BaseModel], **fields: Any) -> BaseModel:
+    """Construit un modèle avec validation complète."""
+    return model(**fields)
+
+def _build_trusted(model: type[BaseModel], **fields: Any) -> BaseModel:
+    """Construit un modèle à partir de champs déjà typés, supposés fiables.
+
+    Les sous-modèles d'état et d'alarmes prennent peu de valeurs distinctes :
+    les instances, immuables, sont partagées entre les instantanés successifs.
+    """
+    if model in _SHARED_MODELS:
+        return _shared_model(model, tuple(fields.items()))
+    return _construct(model, fields)
+
+def _construct(model: type[BaseModel], fields: dict[str, Any]) -> BaseModel:
+    """Construit un modèle par le chemin le plus rapide de la version installée.
+
+    Avec pydantic 1, `construct` évite la validation Python. Avec pydantic 2,
+    la validation native est plus rapide que `model_construct` : elle est
+    conservée.
+    """
+    if _PYDANTIC_V2:
+        return model(**fields)
+    return model.construct(**fields)
+
+@lru_cache(maxsize=None)
+def _field_names(model: type[BaseModel]) -> tuple[str, ...]:
+    """Retourne les noms des champs d'un modèle."""
+    return tuple(model.model_fields if _PYDANTIC_V2 else model.__fields__)
+
+def _model_values(model: BaseModel) -> dict[str, Any]:
+    """Retourne les valeurs des champs d'un modèle, dans l'ordre de déclaration."""
+    return {name: getattr(model, name) for name in _field_names(type(model))}
+
+@lru_cache(maxsize=None)
+def _all_field_names(model: type[BaseModel]) -> frozenset[str]:
+    """Retourne tous les champs d'un modèle, sous-modèles compris."""
+    names = set()
+    for name in _field_names(model):
+        names.add(name)
+        annotation = (
+            model.model_fields[name].annotation if _PYDANTIC_V2
+            else model.__fields__[name].outer_type_
+        )
+        if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+            names.update(f"{name}.{field}" for field in _field_names(annotation))
+    return frozenset(names)
+
+@lru_cache(maxsize=None)
+def _field_bounds(model: type[BaseModel]) -> tuple[tuple[str, Any, Any], ...]:
+    """Retourne les bornes (ge, le) déclarées sur les champs d'un modèle pydantic 1."""
+    return tuple(
+        (name, field.field_info.ge, field.field_info.le)
+        for name, field in model.__fields__.items()
+        if field.field_info.ge is not None or field.field_info.le is not None
+    )
+
+@lru_cache(maxsize=128)
+def _shared_model(model: type[BaseModel], items: tuple) -> BaseModel:
+    """Construit (une seule fois par valeur) un sous-modèle partagé.
+
+    `construct` ignore les bornes des champs avec pydantic 1 : elles sont
+    vérifiées ici, une seule fois par valeur grâce au cache.
+    """
+    fields = dict(items)
+    if not _PYDANTIC_V2:
+        for name, low, high in _field_bounds(model):
+            value = fields.get(name)
+            if value is not None and (
+                (low is not None and value < low) or (high is not None and value > high)
+            ):
+                raise ValueError(f"Valeur hors limites pour {name}: {value}")
+    return _construct(model, fields)
+
+_PYDANTIC_V2 = hasattr(BaseModel, "model_construct")
+_SHARED_MODELS = (StoveState, AlarmState)
@@ -2,7 +2,8 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Any, Callable
+import logging
+from typing import Any, Callable, Mapping
 
 from homeassistant.components.number import (
     NumberEntity,
@@ -23,15 +24,20 @@ from .const import (
 )
 from .coordinator import HWAMDataCoordinator
 from .entity import HWAMEntity
+from .metrics import recommended_burn_level
 from .models import StoveData
 
+_LOGGER = logging.getLogger(__name__)
+
 @dataclass
 class HWAMNumberEntityDescription(NumberEntityDescription):
     """Class describing HWAM number entities."""
 
     value_fn: Callable[[StoveData], float] | None = None
     set_fn: Callable[[HWAMDataCoordinator, float], Any] | None = None
-    attributes_fn: Callable[[StoveData], dict[str, Any]] | None = None
+    attributes_fn: Callable[[StoveData, Mapping[str, Any]], dict[str, Any]] | None = None
+    metrics: tuple[str, ...] = ()
+    data_fields: tuple[str, ...] | None = None
 
 NUMBER_TYPES = (
     HWAMNumberEntityDescription(
@@ -45,43 +51,26 @@ NUMBER_TYPES = (
         native_unit_of_measurement="niveau",
         value_fn=lambda data: float(data.state.burn_level),
         set_fn=lambda coordinator, value: coordinator.set_burn_level(int(value)),
-        attributes_fn=lambda data: {
+        attributes_fn=lambda data, metrics: {
             "phase_actuelle": data.state.phase,
             "mode_operation": data.state.operation_mode,
             "temperature_actuelle": data.temperatures.stove_temperature,
-            "efficacite": data.coordinator.predictions.get("efficiency_score"),
-            "tendance_temperature": data.coordinator.predictions.get("temperature_trend"),
-            "temps_avant_rechargement": str(data.coordinator.predictions.get("refill_time", "N/A")),
+            "efficacite": metrics.get("efficiency_score"),
+            "tendance_temperature": metrics.get("temperature_trend"),
+            "temps_avant_rechargement": metrics.get("refill_time_text") or "N/A",
             "mode_nuit_actif": data.state.night_lowering,
-            "niveau_recommande": _get_recommended_burn_level(data),
+            "niveau_recommande": metrics.get("recommended_burn_level"),
         },
+        metrics=(
+            "efficiency_score",
+            "temperature_trend",
+            "refill_time_text",
+            "recommended_burn_level",
+        ),
+        data_fields=("state", "temperatures.stove_temperature"),
     ),
 )
 
-def _get_recommended_burn_level(data: StoveData) -> int:
-    """Calcule le niveau de combustion recommandé basé sur différents facteurs."""
-    if not data.state.is_active:
-        return 0
-        
-    # Facteurs de décision
-    current_temp = data.temperatures.stove_temperature
-    room_temp = data.temperatures.room_temperature
-    oxygen_level = data.temperatures.oxygen_level
-    temp_trend = data.coordinator.predictions.get("temperature_trend")
-    
-    # Logique de recommandation
-    if current_temp > 500:  # Température trop haute
-        return max(MIN_BURN_LEVEL, data.state.burn_level - 1)
-    elif current_temp < 200 and room_temp < 19:  # Besoin de chaleur
-        return min(MAX_BURN_LEVEL, data.state.burn_level + 1)
-    elif temp_trend == "falling" and room_temp < 20:
-        return min(MAX_BURN_LEVEL, data.state.burn_level + 1)
-    elif temp_trend == "rising" and current_temp > 400:
-        return max(MIN_BURN_LEVEL, data.state.burn_level - 1)
-    
-    # Mode par défaut
-    return data.state.burn_level
-
 async def async_setup_entry(
     hass: HomeAssistant,
     entry: ConfigEntry,
@@ -133,6 +122,13 @@ class HWAMNumber(HWAMEntity, NumberEntity):
         except Exception:
             return None
 
+    def _recommended_burn_level(self) -> int:
+        """Return the recommended burn level for the current data."""
+        return recommended_burn_level(
+            self.coordinator.data,
+            self.coordinator.predictions.get("temperature_trend"),
+        )
+
     async def async_set_native_value(self, value: float) -> None:
         """Set new value."""
         if self.entity_description.set_fn is None:
@@ -144,7 +140,7 @@ class HWAMNumber(HWAMEntity, NumberEntity):
             
             # Notification si le niveau est très différent de la recommandation
             if self.entity_description.key == "burn_level":
-                recommended = _get_recommended_burn_level(self.coordinator.data)
+                recommended = self._recommended_burn_level()
                 if abs(value - recommended) >= 2:
                     self.hass.components.persistent_notification.async_create(
                         f"Le niveau de combustion défini ({value}) est très différent "
@@ -165,7 +161,9 @@ class HWAMNumber(HWAMEntity, NumberEntity):
 
         if self.coordinator.data is not None and self.entity_description.attributes_fn:
             try:
-                attrs.update(self.entity_description.attributes_fn(self.coordinator.data))
+                attrs.update(
+                    self.entity_description.attributes_fn(self.coordinator.data, self.metrics)
+                )
             except Exception:
                 pass
 
@@ -179,7 +177,7 @@ class HWAMNumber(HWAMEntity, NumberEntity):
             self.entity_description.key == "burn_level" 
             and self.coordinator.data is not None
         ):
-            recommended = _get_recommended_burn_level(self.coordinator.data)
+            recommended = self._recommended_burn_level()
             current = self.native_value
             if current is not None and abs(current - recommended) >= 2:
                 self.hass.components.persistent_notification.async_create(
@@ -0,0 +1,93 @@
+"""Estimateurs incrémentaux pour les prédictions HWAM."""
+from __future__ import annotations
+
+import math
+from typing import Optional
+
+
+class OnlineLinearRegression:
+    """Régression linéaire par moindres carrés mise à jour en O(1).
+
+    Les sommes pondérées sont exprimées par rapport à l'horodatage du
+    dernier échantillon : à chaque ajout, l'origine est déplacée et les
+    poids décroissent exponentiellement avec l'âge réel des échantillons,
+    indépendamment de la fréquence d'interrogation.
+    """
+
+    def __init__(self, half_life: Optional[float] = None) -> None:
+        """Initialise l'estimateur (demi-vie en secondes, None = sans oubli)."""
+        self._decay_rate = math.log(2) / half_life if half_life else 0.0
+        self.reset()
+
+    def reset(self) -> None:
+        """Réinitialise l'estimateur."""
+        self._last_timestamp: Optional[float] = None
+        self._last_value: Optional[float] = None
+        self._count = 0
+        self._sw = 0.0
+        self._sx = 0.0
+        self._sy = 0.0
+        self._sxx = 0.0
+        self._sxy = 0.0
+
+    def __len__(self) -> int:
+        """Retourne le nombre d'échantillons reçus."""
+        return self._count
+
+    def add(self, timestamp: float, value: float) -> None:
+        """Ajoute un échantillon."""
+        if math.isnan(value):
+            return
+
+        if self._last_timestamp is not None:
+            delta = timestamp - self._last_timestamp
+            if delta < 0:
+                # Échantillon hors séquence ignoré
+                return
+            decay = math.exp(-self._decay_rate * delta)
+            # Déplacement de l'origine sur le nouvel échantillon (x' = x - delta)
+            self._sxx = decay * (self._sxx - 2 * delta * self._sx + delta * delta * self._sw)
+            self._sxy = decay * (self._sxy - delta * self._sy)
+            self._sx = decay * (self._sx - delta * self._sw)
+            self._sy = decay * self._sy
+            self._sw = decay * self._sw
+
+        # Le nouvel échantillon est à x = 0 : seules sw et sy changent
+        self._sw += 1.0
+        self._sy += value
+        self._last_timestamp = timestamp
+        self._last_value = value
+        self._count += 1
+
+    @property
+    def slope(self) -> Optional[float]:
+        """Retourne la pente estimée (unités par seconde)."""
+        if self._count < 2:
+            return None
+        denominator = self._sw * self._sxx - self._sx * self._sx
+        if denominator <= 1e-12 * max(self._sw * self._sxx, 1.0):
+            return None
+        return (self._sw * self._sxy - self._sx * self._sy) / denominator
+
+    @property
+    def value(self) -> Optional[float]:
+        """Retourne la valeur ajustée au dernier échantillon."""
+        slope = self.slope
+        if slope is None:
+            return self._last_value
+        return (self._sy - slope * self._sx) / self._sw
+
+    def time_to_reach(self, target: float) -> Optional[float]:
+        """Estime le temps (s) avant que la dernière valeur atteigne la cible.
+
+        Retourne None si la tendance ne s'en approche pas.
+        """
+        slope = self.slope
+        if slope is None or self._last_value is None:
+            return None
+        remaining = self._last_value - target
+        if remaining <= 0:
+            return 0.0
+        if slope >= 0:
+            return None
+        return remaining / -slope
@@ -0,0 +1,134 @@
+"""Profilage à la demande des cycles de mise à jour HWAM."""
+from __future__ import annotations
+
+from collections import Counter
+import cProfile
+import io
+import pstats
+import sys
+import threading
+import time
+from typing import Optional
+
+from .const import PROFILE_REPORT_LINES, PROFILE_SAMPLE_INTERVAL
+
+
+class CycleProfiler:
+    """Profileur couvrant un nombre donné de cycles de mise à jour.
+
+    Pendant chaque cycle, cProfile compte les appels et leur durée, et un
+    fil d'échantillonnage relève la pile du fil de la boucle d'événements
+    toutes les `sample_interval` secondes. Les deux ne sont actifs qu'entre
+    `begin` et `end` ; le reste du temps le coût est nul.
+
+    cProfile mesure tout le fil de la boucle : les tâches exécutées pendant
+    les attentes réseau du cycle apparaissent aussi dans le rapport.
+    """
+
+    def __init__(
+        self,
+        cycles: int,
+        sample_interval: float = PROFILE_SAMPLE_INTERVAL,
+    ) -> None:
+        """Initialise le profileur, à démarrer depuis le fil de la boucle."""
+        self.cycles = cycles
+        self.remaining = cycles
+        self.elapsed = 0.0
+        self._profile = cProfile.Profile()
+        self._stacks: Counter[str] = Counter()
+        self._thread_id = threading.get_ident()
+        self._sample_interval = sample_interval
+        self._active = threading.Event()
+        self._stopped = threading.Event()
+        self._sampler: Optional[threading.Thread] = None
+        self._started: Optional[float] = None
+
+    @property
+    def done(self) -> bool:
+        """Indique si tous les cycles ont été profilés."""
+        return self.remaining <= 0
+
+    @property
+    def running(self) -> bool:
+        """Indique si un cycle est en cours de profilage."""
+        return self._started is not None
+
+    def begin(self) -> None:
+        """Commence le profilage d'un cycle.
+
+        Lève ValueError si un autre profileur est actif (Python 3.12+) ; le
+        profilage est alors abandonné.
+        """
+        if self.done or self.running:
+            return
+        if self._sampler is None:
+            self._sampler = threading.Thread(
+                target=self._sample, name="hwam_stove_profiler", daemon=True
+            )
+            self._sampler.start()
+        self._started = time.perf_counter()
+        self._active.set()
+        try:
+            self._profile.enable()
+        except ValueError:
+            self._active.clear()
+            self._started = None
+            self.cancel()
+            raise
+
+    def end(self) -> None:
+        """Termine le profilage du cycle en cours."""
+        if not self.running:
+            return
+        self._profile.disable()
+        self._active.clear()
+        self.elapsed += time.perf_counter() - self._started
+        self._started = None
+        self.remaining -= 1
+        if self.done:
+            self._stopped.set()
+
+    def cancel(self) -> None:
+        """Arrête le profilage sans attendre les cycles restants."""
+        self.end()
+        self.remaining = 0
+        self._stopped.set()
+
+    def _sample(self) -> None:
+        """Relève la pile du fil de la boucle pendant les cycles."""
+        while not self._stopped.wait(self._sample_interval):
+            if not self._active.is_set():
+                continue
+            frame = sys._current_frames().get(self._thread_id)  # pylint: disable=protected-access
+            frames = []
+            while frame is not None:
+                code = frame.f_code
+                module = frame.f_globals.get("__name__", "?")
+                frames.append(f"{module}.{getattr(code, 'co_qualname', code.co_name)}")
+                frame = frame.f_back
+            if frames:
+                self._stacks[";".join(reversed(frames))] += 1
+
+    def write(self, report_path: str, stacks_path: str) -> None:
+        """Écrit le rapport trié et les piles repliées (format flamegraph).
+
+        Bloquant : à exécuter hors de la boucle d'événements.
+        """
+        if self._sampler is not None:
+            self._sampler.join()
+
+        stream = io.StringIO()
+        stream.write(
+            f"{self.cycles - max(self.remaining, 0)} cycle(s), "
+            f"{self.elapsed * 1000:.1f} ms profilées, "
+            f"{sum(self._stacks.values())} échantillons de pile\n\n"
+        )
+        stats = pstats.Stats(self._profile, stream=stream)
+        stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(PROFILE_REPORT_LINES)
+        stats.sort_stats(pstats.SortKey.TIME).print_stats(PROFILE_REPORT_LINES)
+        with open(report_path, "w", encoding="utf-8") as file:
+            file.write(stream.getvalue())
+
+        with open(stacks_path, "w", encoding="utf-8") as file:
+            for stack, count in self._stacks.most_common():
+                file.write(f"{stack} {count}\n")
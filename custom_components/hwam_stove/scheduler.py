@@ -0,0 +1,145 @@
+"""Ordonnancement des requêtes vers le serveur web embarqué d'un poêle."""
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass, field
+import heapq
+import itertools
+import time
+from typing import Any, Awaitable, Callable, Optional
+
+PRIORITY_COMMAND = 0
+PRIORITY_POLL = 1
+
+
+@dataclass(order=True)
+class _Request:
+    """Requête en file, ordonnée par priorité puis par ordre d'arrivée."""
+
+    priority: int
+    sequence: int
+    call: Callable[[], Awaitable[Any]] = field(compare=False)
+    future: asyncio.Future = field(compare=False)
+    key: Optional[str] = field(compare=False, default=None)
+    enqueued: float = field(compare=False, default=0.0)
+
+
+class RequestScheduler:
+    """File de requêtes d'un poêle, une seule requête en cours à la fois.
+
+    Le module Wi-Fi du poêle gère mal les connexions simultanées : les
+    interrogations et les commandes passent donc par cette file. Les
+    commandes passent devant les interrogations en attente, et une
+    interrogation déjà en file est partagée plutôt que dupliquée.
+    """
+
+    def __init__(
+        self,
+        wait_smoothing: float = 0.2,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Initialise la file (lissage de l'attente moyenne entre 0 et 1)."""
+        self._queue: list[_Request] = []
+        self._queued: dict[str, asyncio.Future] = {}
+        self._sequence = itertools.count()
+        self._active: Optional[asyncio.Task] = None
+        self._wait_smoothing = wait_smoothing
+        self._clock = clock
+        self.max_depth = 0
+        self.dropped = 0
+        self.preempted = 0
+        self.last_wait: Optional[float] = None
+        self.average_wait: Optional[float] = None
+
+    @property
+    def depth(self) -> int:
+        """Retourne le nombre de requêtes en attente."""
+        return len(self._queue)
+
+    @property
+    def busy(self) -> bool:
+        """Indique si une requête est en cours."""
+        return self._active is not None
+
+    async def submit(
+        self,
+        call: Callable[[], Awaitable[Any]],
+        priority: int = PRIORITY_COMMAND,
+        key: Optional[str] = None,
+    ) -> Any:
+        """Exécute `call` à son tour et retourne son résultat.
+
+        Une requête portant la même `key` qu'une requête encore en file n'est
+        pas ajoutée : l'appelant reçoit le résultat de la requête en file.
+        L'appelant annulé n'annule pas la requête, partagée ou déjà ordonnée.
+        """
+        if key is not None and (future := self._queued.get(key)) is not None:
+            self.dropped += 1
+            return await asyncio.shield(future)
+
+        request = _Request(
+            priority,
+            next(self._sequence),
+            call,
+            asyncio.get_running_loop().create_future(),
+            key,
+            self._clock(),
+        )
+        if priority == PRIORITY_COMMAND and any(
+            queued.priority > priority for queued in self._queue
+        ):
+            self.preempted += 1
+        heapq.heappush(self._queue, request)
+        if key is not None:
+            self._queued[key] = request.future
+        self.max_depth = max(self.max_depth, len(self._queue))
+
+        self._run_next()
+        return await asyncio.shield(request.future)
+
+    def _run_next(self) -> None:
+        """Lance la requête suivante si aucune n'est en cours."""
+        while self._active is None and self._queue:
+            request = heapq.heappop(self._queue)
+            if request.key is not None:
+                self._queued.pop(request.key, None)
+            if request.future.done():
+                continue
+            self._record_wait(self._clock() - request.enqueued)
+            self._active = asyncio.ensure_future(self._execute(request))
+
+    async def _execute(self, request: _Request) -> None:
+        """Exécute une requête et transmet son résultat."""
+        try:
+            result = await request.call()
+        except asyncio.CancelledError:
+            request.future.cancel()
+            raise
+        except Exception as err:  # pylint: disable=broad-except
+            if not request.future.done():
+                request.future.set_exception(err)
+        else:
+            if not request.future.done():
+                request.future.set_result(result)
+        finally:
+            if self._active is asyncio.current_task():
+                self._active = None
+                self._run_next()
+
+    def _record_wait(self, wait: float) -> None:
+        """Met à jour l'attente de la dernière requête et sa moyenne lissée."""
+        self.last_wait = wait
+        if self.average_wait is None:
+            self.average_wait = wait
+        else:
+            self.average_wait += self._wait_smoothing * (wait - self.average_wait)
+
+    def cancel(self) -> None:
+        """Annule la requête en cours et vide la file."""
+        for request in self._queue:
+            request.future.cancel()
+        self._queue.clear()
+        self._queued.clear()
+        if self._active is not None:
+            self._active.cancel()
+            self._active = None
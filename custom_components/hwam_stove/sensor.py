@@ -0,0 +1,375 @@
+"""Support for HWAM Smart Control sensors."""
+from __future__ import annotations
+
+from collections.abc import Callable, Mapping
+from dataclasses import dataclass
+from datetime import timedelta
+from typing import Any
+
+from homeassistant.components.sensor import (
+    SensorEntity,
+    SensorEntityDescription,
+    SensorDeviceClass,
+    SensorStateClass,
+)
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import (
+    PERCENTAGE,
+    TEMP_CELSIUS,
+    TIME_MINUTES,
+    DEVICE_CLASS_TEMPERATURE,
+    DEVICE_CLASS_TIMESTAMP,
+)
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.entity import EntityCategory
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.typing import StateType
+
+from .const import (
+    DOMAIN,
+    ICON_STOVE,
+    ICON_TEMPERATURE,
+    ICON_OXYGEN,
+    ICON_VALVE,
+    ICON_EFFICIENCY,
+    ICON_TIMER,
+    PHASE_STATES,
+    OPERATION_MODES,
+)
+from .circuit import CIRCUIT_STATES
+from .coordinator import HWAMDataCoordinator
+from .entity import HWAMEntity
+from .models import StoveData
+
+@dataclass
+class HWAMSensorEntityDescription(SensorEntityDescription):
+    """Class describing HWAM sensor entities."""
+
+    value_fn: Callable[[StoveData, Mapping[str, Any]], StateType] | None = None
+    attributes_fn: Callable[[StoveData, Mapping[str, Any]], dict[str, Any]] | None = None
+    metrics: tuple[str, ...] = ()
+    data_fields: tuple[str, ...] | None = None
+    # Réécrit après la notification des autres entités plutôt que pendant
+    after_fan_out: bool = False
+    # Reste disponible et à jour quand les interrogations échouent
+    available_on_error: bool = False
+
+# Étapes d'une mise à jour dont la durée est exposée
+TIMING_SENSOR_NAMES = {
+    "connect": "Durée de connexion",
+    "request": "Durée des requêtes",
+    "decode": "Durée du décodage",
+    "from_dict": "Durée de conversion des données",
+    "history": "Durée de l'historique",
+    "predictions": "Durée des prédictions",
+    "maintenance": "Durée du contrôle de maintenance",
+    "fan_out": "Durée de mise à jour des entités",
+}
+
+def _timing_sensor(stage: str, name: str) -> HWAMSensorEntityDescription:
+    """Décrit le capteur de diagnostic d'une étape (p95, percentiles en attributs)."""
+    key = f"timing_{stage}"
+    return HWAMSensorEntityDescription(
+        key=key,
+        name=name,
+        native_unit_of_measurement="ms",
+        state_class=SensorStateClass.MEASUREMENT,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        icon=ICON_TIMER,
+        value_fn=lambda data, metrics: (metrics.get(key) or {}).get("p95"),
+        attributes_fn=lambda data, metrics: dict(metrics.get(key) or {}),
+        metrics=(key,),
+        data_fields=(),
+    )
+
+SENSORS: tuple[HWAMSensorEntityDescription, ...] = (
+    HWAMSensorEntityDescription(
+        key="stove_temperature",
+        name="Température du poêle",
+        native_unit_of_measurement=TEMP_CELSIUS,
+        device_class=SensorDeviceClass.TEMPERATURE,
+        state_class=SensorStateClass.MEASUREMENT,
+        icon=ICON_TEMPERATURE,
+        value_fn=lambda data, metrics: data.temperatures.stove_temperature,
+        attributes_fn=lambda data, metrics: {
+            "trend": metrics.get("temperature_trend") or "unknown",
+            "min_24h": metrics.get("stove_temp_min_24h"),
+            "max_24h": metrics.get("stove_temp_max_24h"),
+            "mean_24h": metrics.get("stove_temp_mean_24h"),
+        },
+        metrics=(
+            "temperature_trend",
+            "stove_temp_min_24h",
+            "stove_temp_max_24h",
+            "stove_temp_mean_24h",
+        ),
+        data_fields=("temperatures.stove_temperature",),
+    ),
+    HWAMSensorEntityDescription(
+        key="room_temperature",
+        name="Température ambiante",
+        native_unit_of_measurement=TEMP_CELSIUS,
+        device_class=SensorDeviceClass.TEMPERATURE,
+        state_class=SensorStateClass.MEASUREMENT,
+        icon=ICON_TEMPERATURE,
+        value_fn=lambda data, metrics: data.temperatures.room_temperature,
+        attributes_fn=lambda data, metrics: {
+            "min_24h": metrics.get("room_temp_min_24h"),
+            "max_24h": metrics.get("room_temp_max_24h"),
+            "mean_24h": metrics.get("room_temp_mean_24h"),
+        },
+        metrics=("room_temp_min_24h", "room_temp_max_24h", "room_temp_mean_24h"),
+        data_fields=("temperatures.room_temperature",),
+    ),
+    HWAMSensorEntityDescription(
+        key="oxygen_level",
+        name="Niveau d'oxygène",
+        native_unit_of_measurement=PERCENTAGE,
+        state_class=SensorStateClass.MEASUREMENT,
+        icon=ICON_OXYGEN,
+        value_fn=lambda data, metrics: data.temperatures.oxygen_level,
+        attributes_fn=lambda data, metrics: {
+            "average": metrics.get("oxygen_average_recent"),
+        },
+        metrics=("oxygen_average_recent",),
+        data_fields=("temperatures.oxygen_level",),
+    ),
+    HWAMSensorEntityDescription(
+        key="efficiency_score",
+        name="Score d'efficacité",
+        native_unit_of_measurement=PERCENTAGE,
+        state_class=SensorStateClass.MEASUREMENT,
+        icon=ICON_EFFICIENCY,
+        value_fn=lambda data, metrics: metrics.get("efficiency_score"),
+        attributes_fn=lambda data, metrics: {
+            "temperature_stability": metrics.get("temperature_trend"),
+            "oxygen_efficiency": metrics.get("oxygen_average_recent"),
+        },
+        metrics=("efficiency_score", "temperature_trend", "oxygen_average_recent"),
+        data_fields=(),
+    ),
+    HWAMSensorEntityDescription(
+        key="burn_phase",
+        name="Phase de combustion",
+        icon=ICON_STOVE,
+        value_fn=lambda data, metrics: PHASE_STATES.get(data.state.phase, "Unknown"),
+        attributes_fn=lambda data, metrics: {
+            "phase_number": data.state.phase,
+            "is_active": data.state.is_active,
+            "estimated_refill_time": metrics.get("refill_time_text"),
+        },
+        metrics=("refill_time_text",),
+        data_fields=("state.phase",),
+    ),
+    HWAMSensorEntityDescription(
+        key="operation_mode",
+        name="Mode de fonctionnement",
+        icon=ICON_STOVE,
+        value_fn=lambda data, metrics: OPERATION_MODES.get(data.state.operation_mode, "Unknown"),
+        attributes_fn=lambda data, metrics: {
+            "mode_number": data.state.operation_mode,
+            "night_mode": data.state.night_lowering,
+            "updating": data.state.updating,
+        },
+        data_fields=("state.operation_mode", "state.night_lowering", "state.updating"),
+    ),
+    HWAMSensorEntityDescription(
+        key="valve1",
+        name="Valve 1",
+        native_unit_of_measurement=PERCENTAGE,
+        icon=ICON_VALVE,
+        value_fn=lambda data, metrics: data.valve1_position,
+        data_fields=("valve1_position",),
+    ),
+    HWAMSensorEntityDescription(
+        key="valve2",
+        name="Valve 2",
+        native_unit_of_measurement=PERCENTAGE,
+        icon=ICON_VALVE,
+        value_fn=lambda data, metrics: data.valve2_position,
+        data_fields=("valve2_position",),
+    ),
+    HWAMSensorEntityDescription(
+        key="valve3",
+        name="Valve 3",
+        native_unit_of_measurement=PERCENTAGE,
+        icon=ICON_VALVE,
+        value_fn=lambda data, metrics: data.valve3_position,
+        data_fields=("valve3_position",),
+    ),
+    HWAMSensorEntityDescription(
+        key="poll_latency",
+        name="Latence d'interrogation",
+        native_unit_of_measurement="ms",
+        state_class=SensorStateClass.MEASUREMENT,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        icon=ICON_TIMER,
+        value_fn=lambda data, metrics: metrics.get("poll_latency"),
+        metrics=("poll_latency",),
+        data_fields=(),
+    ),
+    HWAMSensorEntityDescription(
+        key="suppressed_writes",
+        name="Écritures évitées",
+        state_class=SensorStateClass.MEASUREMENT,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        icon=ICON_STOVE,
+        value_fn=lambda data, metrics: metrics.get("suppressed_writes"),
+        data_fields=(),
+        after_fan_out=True,
+    ),
+    HWAMSensorEntityDescription(
+        key="cache_age",
+        name="Âge des données",
+        native_unit_of_measurement="s",
+        state_class=SensorStateClass.MEASUREMENT,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        icon=ICON_TIMER,
+        value_fn=lambda data, metrics: metrics.get("cache_age"),
+        attributes_fn=lambda data, metrics: dict(metrics.get("cache_stats") or {}),
+        metrics=("cache_age", "cache_stats"),
+        data_fields=(),
+    ),
+    HWAMSensorEntityDescription(
+        key="request_wait",
+        name="Attente des requêtes",
+        native_unit_of_measurement="ms",
+        state_class=SensorStateClass.MEASUREMENT,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        icon=ICON_TIMER,
+        value_fn=lambda data, metrics: metrics.get("request_wait"),
+        attributes_fn=lambda data, metrics: dict(metrics.get("request_queue") or {}),
+        metrics=("request_wait", "request_queue"),
+        data_fields=(),
+    ),
+    HWAMSensorEntityDescription(
+        key="circuit_state",
+        name="État de la connexion",
+        device_class=SensorDeviceClass.ENUM,
+        options=CIRCUIT_STATES,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        icon=ICON_STOVE,
+        value_fn=lambda data, metrics: metrics.get("circuit_state"),
+        metrics=("circuit_state",),
+        data_fields=(),
+        available_on_error=True,
+    ),
+    *(_timing_sensor(stage, name) for stage, name in TIMING_SENSOR_NAMES.items()),
+)
+
+async def async_setup_entry(
+    hass: HomeAssistant,
+    entry: ConfigEntry,
+    async_add_entities: AddEntitiesCallback,
+) -> None:
+    """Set up HWAM sensor based on a config entry."""
+    coordinator: HWAMDataCoordinator = hass.data[DOMAIN][entry.entry_id]
+    
+    entities = []
+    for description in SENSORS:
+        unique_id = f"{entry.entry_id}_{description.key}"
+        entity = HWAMSensor(
+            coordinator=coordinator,
+            entry_id=entry.entry_id,
+            entity_description=description,
+            unique_id=unique_id,
+        )
+        entities.append(entity)
+    
+    async_add_entities(entities)
+
+
+class HWAMSensor(HWAMEntity, SensorEntity):
+    """Representation of a HWAM sensor."""
+
+    entity_description: HWAMSensorEntityDescription
+
+    # Valeurs dérivées déjà couvertes par les statistiques longue durée ou
+    # les diagnostics : inutile de les enregistrer à chaque changement d'état
+    _unrecorded_attributes = frozenset({
+        "trend",
+        "min_24h",
+        "max_24h",
+        "mean_24h",
+        "average",
+        "p50",
+        "p95",
+        "p99",
+        "last",
+        "count",
+    })
+
+    def __init__(
+        self,
+        coordinator: HWAMDataCoordinator,
+        entry_id: str,
+        entity_description: HWAMSensorEntityDescription,
+        unique_id: str,
+    ) -> None:
+        """Initialize the sensor."""
+        super().__init__(coordinator, entry_id, entity_description)
+        
+        self._attr_unique_id = unique_id
+        self._attr_name = f"{coordinator._name} {entity_description.name}"
+
+    async def async_added_to_hass(self) -> None:
+        """Register the sensors written once every other entity was notified."""
+        await super().async_added_to_hass()
+        if self.entity_description.after_fan_out:
+            self.async_on_remove(
+                self.coordinator.async_add_fan_out_listener(self.async_write_ha_state)
+            )
+        if self.entity_description.available_on_error:
+            self.async_on_remove(
+                self.coordinator.async_add_error_listener(self.async_write_ha_state)
+            )
+
+    @property
+    def available(self) -> bool:
+        """Return if entity is available, even after failed polls for diagnostics."""
+        if self.entity_description.available_on_error:
+            return self.coordinator.data is not None
+        return super().available
+
+    @property
+    def native_value(self) -> StateType:
+        """Return the state of the sensor."""
+        if self.coordinator.data is None:
+            return None
+            
+        if self.entity_description.value_fn is None:
+            return None
+            
+        try:
+            return self.entity_description.value_fn(self.coordinator.data, self.metrics)
+        except Exception:
+            return None
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Return entity specific state attributes."""
+        attrs = super().extra_state_attributes
+
+        if self.coordinator.data is not None and self.entity_description.attributes_fn:
+            try:
+                attrs.update(
+                    self.entity_description.attributes_fn(self.coordinator.data, self.metrics)
+                )
+            except Exception:
+                pass
+
+        # Add diagnostic attributes
+        attrs.update({
+            "last_update": self.coordinator.last_update_success,
+            "last_update_time": self.coordinator.last_update_dt,
+            "firmware_version": self.coordinator.data.firmware_version if self.coordinator.data else None,
+            "algorithm": self.coordinator.data.algorithm if self.coordinator.data else None,
+        })
+
+        return attrs
@@ -0,0 +1,98 @@
+"""Session HTTP partagée par toutes les connexions aux poêles HWAM."""
+from __future__ import annotations
+
+import time
+from types import SimpleNamespace
+from typing import TYPE_CHECKING, Optional
+
+import aiohttp
+
+from homeassistant.const import EVENT_HOMEASSISTANT_CLOSE
+
+from .const import (
+    DATA_SESSION,
+    SESSION_CONNECTION_LIMIT,
+    SESSION_CONNECTIONS_PER_HOST,
+    SESSION_DNS_CACHE_TTL,
+    SESSION_KEEPALIVE,
+)
+
+if TYPE_CHECKING:
+    from homeassistant.core import Event, HomeAssistant
+
+SESSION_HEADERS = {
+    "Accept": "application/json",
+    "User-Agent": "HWAM-HA-Integration/1.0",
+}
+
+
+async def _on_connection_create_start(
+    session: aiohttp.ClientSession,
+    context: SimpleNamespace,
+    params: aiohttp.TraceConnectionCreateStartParams,
+) -> None:
+    """Note le début de l'ouverture d'une connexion."""
+    context.connect_started = time.perf_counter()
+
+
+async def _on_connection_create_end(
+    session: aiohttp.ClientSession,
+    context: SimpleNamespace,
+    params: aiohttp.TraceConnectionCreateEndParams,
+) -> None:
+    """Transmet la durée d'ouverture de la connexion au demandeur.
+
+    Le contexte de trace de la requête (`trace_request_ctx`) est l'objet
+    `StageTimings` du client qui l'a émise ; les connexions réutilisées
+    (keep-alive) ne sont pas mesurées.
+    """
+    timings = context.trace_request_ctx
+    if timings is not None and hasattr(context, "connect_started"):
+        timings.record("connect", time.perf_counter() - context.connect_started)
+
+
+def _trace_config() -> aiohttp.TraceConfig:
+    """Construit la trace mesurant l'ouverture des connexions."""
+    trace_config = aiohttp.TraceConfig()
+    trace_config.on_connection_create_start.append(_on_connection_create_start)
+    trace_config.on_connection_create_end.append(_on_connection_create_end)
+    return trace_config
+
+
+def create_session(auth: Optional[aiohttp.BasicAuth] = None) -> aiohttp.ClientSession:
+    """Crée une session adaptée au serveur web embarqué du poêle.
+
+    Les connexions sont conservées entre deux interrogations (keep-alive),
+    la résolution DNS est mise en cache et le nombre de connexions par poêle
+    est limité pour ne pas saturer son serveur. La durée d'ouverture des
+    connexions est mesurée pour le client émetteur.
+    """
+    connector = aiohttp.TCPConnector(
+        limit=SESSION_CONNECTION_LIMIT,
+        limit_per_host=SESSION_CONNECTIONS_PER_HOST,
+        ttl_dns_cache=SESSION_DNS_CACHE_TTL,
+        keepalive_timeout=SESSION_KEEPALIVE,
+    )
+    return aiohttp.ClientSession(
+        connector=connector,
+        auth=auth,
+        headers=SESSION_HEADERS,
+        trace_configs=[_trace_config()],
+    )
+
+
+def async_get_session(hass: HomeAssistant) -> aiohttp.ClientSession:
+    """Retourne la session du domaine, créée au premier usage.
+
+    Elle est partagée par les entrées et les sondes du flux de configuration,
+    et fermée à l'arrêt de Home Assistant.
+    """
+    session: Optional[aiohttp.ClientSession] = hass.data.get(DATA_SESSION)
+    if session is None or session.closed:
+        session = hass.data[DATA_SESSION] = create_session()
+
+        async def _async_close(_event: Event) -> None:
+            await session.close()
+
+        hass.bus.async_listen_once(EVENT_HOMEASSISTANT_CLOSE, _async_close)
+    return session
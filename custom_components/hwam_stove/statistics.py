@@ -0,0 +1,204 @@
+"""Agrégats horaires importés dans les statistiques longue durée."""
+from __future__ import annotations
+
+from collections import deque
+from dataclasses import dataclass
+from datetime import datetime, timezone
+import logging
+import math
+from typing import TYPE_CHECKING, Iterable, Optional
+
+from .const import DOMAIN, PERCENTAGE, STATISTICS_MAX_PENDING, STATISTICS_PERIOD, TEMP_CELSIUS
+
+if TYPE_CHECKING:
+    from homeassistant.core import HomeAssistant
+
+_LOGGER = logging.getLogger(__name__)
+
+# Signaux agrégés : libellé et unité
+STATISTICS_SIGNALS: dict[str, tuple[str, Optional[str]]] = {
+    "stove_temp": ("Température du poêle", TEMP_CELSIUS),
+    "room_temp": ("Température ambiante", TEMP_CELSIUS),
+    "oxygen": ("Niveau d'oxygène", PERCENTAGE),
+    "burn_level": ("Niveau de combustion", None),
+}
+
+
+@dataclass
+class PeriodAggregate:
+    """Moyenne, minimum et maximum d'un signal sur une période."""
+
+    start: float
+    count: int
+    total: float
+    min: float
+    max: float
+
+    @property
+    def mean(self) -> float:
+        """Retourne la moyenne de la période."""
+        return self.total / self.count
+
+
+class PeriodAggregator:
+    """Agrège un signal par période fixe (l'heure par défaut) en O(1).
+
+    La période en cours est complétée à chaque échantillon ; dès qu'un
+    échantillon tombe dans une période suivante, ou que `close` constate la
+    fin de la période, elle rejoint les agrégats terminés, en attente
+    d'import. Les attentes sont bornées à `max_pending` périodes.
+    """
+
+    def __init__(
+        self,
+        period: float = STATISTICS_PERIOD.total_seconds(),
+        max_pending: int = STATISTICS_MAX_PENDING,
+    ) -> None:
+        """Initialise l'agrégateur (période en secondes)."""
+        self._period = period
+        self._current: Optional[PeriodAggregate] = None
+        self._pending: deque[PeriodAggregate] = deque(maxlen=max_pending)
+
+    def __len__(self) -> int:
+        """Retourne le nombre d'agrégats terminés en attente."""
+        return len(self._pending)
+
+    @property
+    def current(self) -> Optional[PeriodAggregate]:
+        """Retourne l'agrégat de la période en cours."""
+        return self._current
+
+    def add(self, timestamp: float, value: Optional[float]) -> None:
+        """Ajoute un échantillon ; les échantillons antérieurs à la période sont ignorés."""
+        if value is None or math.isnan(value):
+            return
+        start = timestamp - timestamp % self._period
+        current = self._current
+        if current is not None and start == current.start:
+            current.count += 1
+            current.total += value
+            if value < current.min:
+                current.min = value
+            elif value > current.max:
+                current.max = value
+            return
+        if current is not None:
+            if start < current.start:
+                return
+            self._pending.append(current)
+        self._current = PeriodAggregate(start, 1, value, value, value)
+
+    def close(self, now: float) -> None:
+        """Termine la période en cours si elle est échue."""
+        if self._current is not None and now >= self._current.start + self._period:
+            self._pending.append(self._current)
+            self._current = None
+
+    def pop(self) -> list[PeriodAggregate]:
+        """Retire et retourne les agrégats terminés."""
+        completed = list(self._pending)
+        self._pending.clear()
+        return completed
+
+
+class StatisticsRecorder:
+    """Agrégats horaires des signaux d'un poêle, importés par lots.
+
+    Les statistiques sont externes (`hwam_stove:<préfixe>_<signal>`) : elles
+    ne dépendent pas des états des entités et les graphiques lisent des
+    valeurs précalculées au lieu de parcourir les états bruts.
+    """
+
+    def __init__(self, prefix: str, name: str) -> None:
+        """Initialise les agrégateurs de chaque signal."""
+        self._prefix = prefix
+        self._name = name
+        self._period = STATISTICS_PERIOD.total_seconds()
+        self._aggregators = {
+            signal: PeriodAggregator(self._period) for signal in STATISTICS_SIGNALS
+        }
+
+    def statistic_id(self, signal: str) -> str:
+        """Retourne l'identifiant de statistique d'un signal."""
+        return f"{DOMAIN}:{self._prefix}_{signal}"
+
+    def add(self, timestamp: float, values: dict[str, Optional[float]]) -> None:
+        """Ajoute un échantillon par signal présent."""
+        for signal, value in values.items():
+            if (aggregator := self._aggregators.get(signal)) is not None:
+                aggregator.add(timestamp, value)
+
+    def backfill(self, rows: Iterable[tuple[float, ...]], columns: tuple[str, ...]) -> None:
+        """Agrège l'historique persistant (lignes horodatées, colonnes nommées).
+
+        La première période est ignorée : la rétention du fichier la coupe,
+        et son import écraserait l'agrégat complet déjà enregistré.
+        """
+        indexes = [
+            (index, self._aggregators[name])
+            for index, name in enumerate(columns)
+            if name in self._aggregators
+        ]
+        first: Optional[float] = None
+        for row in rows:
+            start = row[0] - row[0] % self._period
+            if first is None:
+                first = start
+            if start == first:
+                continue
+            for index, aggregator in indexes:
+                aggregator.add(row[0], row[index])
+
+    @property
+    def pending(self) -> int:
+        """Retourne le nombre d'agrégats terminés en attente d'import."""
+        return sum(len(aggregator) for aggregator in self._aggregators.values())
+
+    def async_import(self, hass: "HomeAssistant", now: float) -> int:
+        """Importe les agrégats terminés ; retourne le nombre de périodes importées.
+
+        Sans enregistreur, les agrégats restent en attente (bornée).
+        """
+        for aggregator in self._aggregators.values():
+            aggregator.close(now)
+        if not self.pending or "recorder" not in hass.config.components:
+            return 0
+
+        # L'enregistreur est une dépendance facultative de l'intégration
+        from homeassistant.components.recorder.models import (
+            StatisticData,
+            StatisticMetaData,
+        )
+        from homeassistant.components.recorder.statistics import (
+            async_add_external_statistics,
+        )
+
+        imported = 0
+        for signal, aggregator in self._aggregators.items():
+            if not (aggregates := aggregator.pop()):
+                continue
+            label, unit = STATISTICS_SIGNALS[signal]
+            metadata = StatisticMetaData(
+                has_mean=True,
+                has_sum=False,
+                name=f"{self._name} {label}",
+                source=DOMAIN,
+                statistic_id=self.statistic_id(signal),
+                unit_of_measurement=unit,
+            )
+            async_add_external_statistics(
+                hass,
+                metadata,
+                [
+                    StatisticData(
+                        start=datetime.fromtimestamp(aggregate.start, timezone.utc),
+                        mean=aggregate.mean,
+                        min=aggregate.min,
+                        max=aggregate.max,
+                    )
+                    for aggregate in aggregates
+                ],
+            )
+            imported += len(aggregates)
+        _LOGGER.debug("%s statistiques horaires importées pour %s", imported, self._name)
+        return imported
@@ -24,6 +24,7 @@ class HWAMSwitchEntityDescription(SwitchEntityDescription):
     is_on_fn: Callable[[StoveData], bool] = None
     turn_on_fn: Callable[["HWAMSwitch"], None] = None
     turn_off_fn: Callable[["HWAMSwitch"], None] = None
+    data_fields: tuple[str, ...] | None = None
 
 SWITCH_TYPES = (
     HWAMSwitchEntityDescription(
@@ -31,12 +32,14 @@ SWITCH_TYPES = (
         name="Mode nuit",
         icon="mdi:weather-night",
         is_on_fn=lambda data: data.state.night_lowering,
+        data_fields=("state.night_lowering", "night_begin_time", "night_end_time"),
     ),
     HWAMSwitchEntityDescription(
         key="remote_refill_alarm",
         name="Alarme de rechargement à distance",
         icon="mdi:bell-ring",
         is_on_fn=lambda data: data.alarms.remote_refill_alarm,
+        data_fields=("alarms.remote_refill_alarm",),
     ),
 )
 
@@ -94,21 +97,27 @@ class HWAMSwitch(HWAMEntity, SwitchEntity):
 
     async def async_turn_on(self, **kwargs: Any) -> None:
         """Turn the entity on."""
-        if self.entity_description.key == "night_mode":
-            await self.coordinator.api.set_night_time(True)
-        elif self.entity_description.key == "remote_refill_alarm":
-            await self.coordinator.api.set_remote_refill_alarm(True)
-            
-        await self.coordinator.async_refresh()
+        await self._async_set(True)
 
     async def async_turn_off(self, **kwargs: Any) -> None:
         """Turn the entity off."""
+        await self._async_set(False)
+
+    async def _async_set(self, value: bool) -> None:
+        """Send the command and show the expected state until it is verified."""
+        api = self.coordinator.api
         if self.entity_description.key == "night_mode":
-            await self.coordinator.api.set_night_time(False)
+            await self.coordinator.async_command(
+                "night_mode",
+                lambda: api.set_night_lowering(value),
+                {"state.night_lowering": value},
+            )
         elif self.entity_description.key == "remote_refill_alarm":
-            await self.coordinator.api.set_remote_refill_alarm(False)
-            
-        await self.coordinator.async_refresh()
+            await self.coordinator.async_command(
+                "remote_refill_alarm",
+                lambda: api.set_remote_refill_alarm(value),
+                {"alarms.remote_refill_alarm": value},
+            )
 
     @property
     def extra_state_attributes(self) -> dict[str, Any]:
@@ -0,0 +1,301 @@
+"""Historique multi-résolution : agrégats périodiques et bilans journaliers."""
+from __future__ import annotations
+
+import math
+from typing import Callable, Optional, Sequence
+
+import numpy as np
+
+from .const import PHASE_STATES
+from .history import HISTORY_COLUMNS, HistoryBuffer
+
+# Niveaux de résolution de l'historique
+TIER_RAW = "raw"
+TIER_5MIN = "5min"
+TIER_HOUR = "hour"
+TIER_DAY = "day"
+HISTORY_TIERS: tuple[str, ...] = (TIER_RAW, TIER_5MIN, TIER_HOUR, TIER_DAY)
+
+# Durée (s) d'une période de chaque niveau agrégé
+TIER_PERIODS: dict[str, float] = {TIER_5MIN: 300.0, TIER_HOUR: 3600.0, TIER_DAY: 86400.0}
+
+AGGREGATE_FIELDS: tuple[str, ...] = ("mean", "min", "max")
+
+# Colonnes des niveaux agrégés et des bilans journaliers
+AGGREGATE_COLUMNS: tuple[str, ...] = ("timestamp",) + tuple(
+    f"{signal}_{field}" for signal in HISTORY_COLUMNS[1:] for field in AGGREGATE_FIELDS
+)
+DAILY_COLUMNS: tuple[str, ...] = (
+    "timestamp", "burn_hours", "stove_temp_mean", "stove_temp_max", "samples"
+) + tuple(f"phase_{phase}_hours" for phase in PHASE_STATES)
+
+
+def utc_day_start(timestamp: float) -> float:
+    """Retourne le début du jour UTC contenant l'horodatage."""
+    return timestamp - timestamp % 86400
+
+
+def _with_current(
+    rows: np.ndarray,
+    current: Optional[tuple[float, ...]],
+    start: Optional[float],
+    end: Optional[float],
+) -> np.ndarray:
+    """Ajoute la ligne de la période en cours si elle est dans [start, end[."""
+    if current is None or (start is not None and current[0] < start) or (
+        end is not None and current[0] >= end
+    ):
+        return rows
+    return np.column_stack((rows, current))
+
+
+def to_columns(columns: Sequence[str], rows: np.ndarray) -> dict[str, list]:
+    """Convertit une vue (colonnes x échantillons) en listes JSON, NaN en None."""
+    return {
+        name: [None if math.isnan(value) else value for value in row.tolist()]
+        for name, row in zip(columns, rows)
+    }
+
+
+class AggregateTier:
+    """Moyenne, minimum et maximum de chaque signal par période fixe.
+
+    Les sommes de la période en cours sont mises à jour à chaque échantillon
+    en O(signaux) ; à la première période suivante, la ligne agrégée est
+    ajoutée à un `HistoryBuffer` de capacité fixe et retournée par `add`
+    pour être persistée. Les périodes sans échantillon n'ont pas de ligne.
+    """
+
+    def __init__(
+        self,
+        period: float,
+        capacity: int,
+        signals: Sequence[str] = HISTORY_COLUMNS[1:],
+    ) -> None:
+        """Initialise le niveau (période en secondes, capacité en périodes)."""
+        self._period = period
+        self._signals = tuple(signals)
+        self._buffer = HistoryBuffer(
+            capacity,
+            ("timestamp",) + tuple(
+                f"{signal}_{field}" for signal in self._signals for field in AGGREGATE_FIELDS
+            ),
+        )
+        self._start: Optional[float] = None
+        # Début de la première période non restaurée
+        self._floor = -math.inf
+        self._reset()
+
+    def _reset(self) -> None:
+        """Réinitialise les sommes de la période en cours."""
+        size = len(self._signals)
+        self._count = [0] * size
+        self._sum = [0.0] * size
+        self._min = [math.inf] * size
+        self._max = [-math.inf] * size
+
+    @property
+    def period(self) -> float:
+        """Retourne la période en secondes."""
+        return self._period
+
+    @property
+    def buffer(self) -> HistoryBuffer:
+        """Retourne les périodes terminées."""
+        return self._buffer
+
+    @property
+    def columns(self) -> tuple[str, ...]:
+        """Retourne le nom des colonnes."""
+        return self._buffer.columns
+
+    def restore(self, rows: np.ndarray) -> None:
+        """Restaure des périodes terminées (échantillons x colonnes).
+
+        Les échantillons de ces périodes sont ensuite ignorés : l'historique
+        brut rejoué au démarrage ne les agrège pas une seconde fois.
+        """
+        if not len(rows):
+            return
+        self._buffer.extend(rows)
+        self._floor = max(self._floor, float(rows[-1][0]) + self._period)
+
+    def add(self, sample: Sequence[float]) -> Optional[tuple[float, ...]]:
+        """Ajoute un échantillon (horodatage puis une valeur par signal).
+
+        Retourne la ligne de la période terminée par cet échantillon.
+        """
+        timestamp = sample[0]
+        if timestamp < self._floor:
+            return None
+        start = timestamp - timestamp % self._period
+        closed = None
+        if self._start is None or start > self._start:
+            closed = self._close()
+            self._start = start
+        elif start < self._start:
+            # Échantillon antérieur à la période en cours ignoré
+            return None
+
+        for index, value in enumerate(sample[1:]):
+            if math.isnan(value):
+                continue
+            self._count[index] += 1
+            self._sum[index] += value
+            if value < self._min[index]:
+                self._min[index] = value
+            if value > self._max[index]:
+                self._max[index] = value
+        return closed
+
+    def _close(self) -> Optional[tuple[float, ...]]:
+        """Ajoute la période en cours aux périodes terminées et la retourne."""
+        if (row := self.current()) is not None:
+            self._buffer.append(row)
+        self._reset()
+        return row
+
+    def current(self) -> Optional[tuple[float, ...]]:
+        """Retourne la ligne agrégée de la période en cours, None sans échantillon."""
+        if self._start is None or not any(self._count):
+            return None
+        row = [self._start]
+        for count, total, low, high in zip(self._count, self._sum, self._min, self._max):
+            if count:
+                row.extend((total / count, low, high))
+            else:
+                row.extend((math.nan, math.nan, math.nan))
+        return tuple(row)
+
+    def query(self, start: Optional[float] = None, end: Optional[float] = None) -> np.ndarray:
+        """Retourne les périodes commençant dans [start, end[, période en cours comprise."""
+        return _with_current(self._buffer.between(start, end), self.current(), start, end)
+
+
+class DailyRollup:
+    """Bilan journalier : heures de combustion, température et temps par phase.
+
+    Le temps écoulé depuis l'échantillon précédent est attribué à la phase de
+    cet échantillon, dans la limite de `max_gap` secondes pour ne pas compter
+    les interruptions de l'interrogation.
+
+    Les jours terminés sont retournés par `add` pour être persistés ; le
+    jour en cours peut être sauvegardé (`current`) puis restauré avec eux par
+    `restore`, la colonne `samples` permettant de reprendre la moyenne.
+    """
+
+    def __init__(
+        self,
+        capacity: int,
+        max_gap: float,
+        day_start: Callable[[float], float] = utc_day_start,
+    ) -> None:
+        """Initialise le bilan (capacité en jours)."""
+        self._max_gap = max_gap
+        self._day_start = day_start
+        self._phases = tuple(PHASE_STATES)
+        self._buffer = HistoryBuffer(capacity, DAILY_COLUMNS)
+        self._day: Optional[float] = None
+        self._last: Optional[tuple[float, int, bool]] = None
+        # Début du premier jour non restauré
+        self._floor = -math.inf
+        self._reset()
+
+    def _reset(self) -> None:
+        """Réinitialise les cumuls du jour en cours."""
+        self._burn_seconds = 0.0
+        self._phase_seconds = dict.fromkeys(self._phases, 0.0)
+        self._temp_count = 0
+        self._temp_sum = 0.0
+        self._temp_max = -math.inf
+
+    @property
+    def buffer(self) -> HistoryBuffer:
+        """Retourne les jours terminés."""
+        return self._buffer
+
+    @property
+    def columns(self) -> tuple[str, ...]:
+        """Retourne le nom des colonnes."""
+        return self._buffer.columns
+
+    def restore(self, rows: np.ndarray, now: float) -> None:
+        """Restaure les jours persistés (échantillons x colonnes).
+
+        Un même jour peut avoir été sauvegardé plusieurs fois : seule la
+        dernière ligne est gardée. Le jour contenant `now` redevient le jour
+        en cours ; l'arrêt n'est attribué à aucune phase.
+        """
+        days: dict[float, np.ndarray] = {}
+        for row in rows:
+            days[float(row[0])] = row
+        today = self._day_start(now)
+        current = days.pop(today, None)
+        closed = [days[day] for day in sorted(days) if day < today]
+        if closed:
+            self._buffer.extend(closed)
+            # Jour suivant, y compris lors d'un changement d'heure (23 ou 25 h)
+            self._floor = self._day_start(float(closed[-1][0]) + 86400 + 3600)
+        if current is None:
+            return
+
+        values = dict(zip(self.columns, current.tolist()))
+        self._day = today
+        self._last = None
+        self._burn_seconds = values["burn_hours"] * 3600
+        self._phase_seconds = {
+            phase: values[f"phase_{phase}_hours"] * 3600 for phase in self._phases
+        }
+        self._temp_count = int(values["samples"])
+        if self._temp_count:
+            self._temp_sum = values["stove_temp_mean"] * self._temp_count
+            self._temp_max = values["stove_temp_max"]
+
+    def add(
+        self, timestamp: float, stove_temp: float, phase: int, active: bool
+    ) -> Optional[tuple[float, ...]]:
+        """Ajoute un échantillon ; retourne le bilan du jour terminé par celui-ci."""
+        day = self._day_start(timestamp)
+        if day < self._floor or (self._day is not None and day < self._day):
+            # Jour terminé ou restauré
+            return None
+        if self._last is not None:
+            last_timestamp, last_phase, last_active = self._last
+            if timestamp < last_timestamp:
+                return None
+            elapsed = min(timestamp - last_timestamp, self._max_gap)
+            if last_phase in self._phase_seconds:
+                self._phase_seconds[last_phase] += elapsed
+            if last_active:
+                self._burn_seconds += elapsed
+        self._last = (timestamp, phase, active)
+
+        closed = None
+        if self._day is None or day > self._day:
+            if (closed := self.current()) is not None:
+                self._buffer.append(closed)
+            self._reset()
+            self._day = day
+
+        if not math.isnan(stove_temp):
+            self._temp_count += 1
+            self._temp_sum += stove_temp
+            self._temp_max = max(self._temp_max, stove_temp)
+        return closed
+
+    def current(self) -> Optional[tuple[float, ...]]:
+        """Retourne le bilan du jour en cours, None sans échantillon."""
+        if self._day is None:
+            return None
+        return (
+            self._day,
+            self._burn_seconds / 3600,
+            self._temp_sum / self._temp_count if self._temp_count else math.nan,
+            self._temp_max if self._temp_count else math.nan,
+            self._temp_count,
+            *(self._phase_seconds[phase] / 3600 for phase in self._phases),
+        )
+
+    def query(self, start: Optional[float] = None, end: Optional[float] = None) -> np.ndarray:
+        """Retourne les jours commençant dans [start, end[, jour en cours compris."""
+        return _with_current(self._buffer.between(start, end), self.current(), start, end)
@@ -0,0 +1,129 @@
+"""Histogrammes des durées des étapes d'une mise à jour HWAM."""
+from __future__ import annotations
+
+from contextlib import contextmanager
+import math
+import time
+from typing import Iterable, Iterator, Optional
+
+from .const import TIMING_WINDOW
+
+# Étapes mesurées par le client API
+API_STAGES: tuple[str, ...] = ("connect", "request", "decode", "from_dict")
+# Étapes mesurées par le coordinateur
+COORDINATOR_STAGES: tuple[str, ...] = ("history", "predictions", "maintenance", "fan_out")
+TIMING_STAGES: tuple[str, ...] = API_STAGES + COORDINATOR_STAGES
+
+PERCENTILES: tuple[int, ...] = (50, 95, 99)
+
+
+class LatencyHistogram:
+    """Histogramme à classes géométriques de taille fixe.
+
+    Chaque durée incrémente une classe en O(1), les classes croissant d'un
+    facteur `growth` de `min_value` à `max_value` secondes (précision
+    relative de ±`growth`/2). Dès que `window` durées sont comptées, tous
+    les effectifs sont divisés par deux : les percentiles suivent les
+    durées récentes sans conserver les échantillons.
+    """
+
+    def __init__(
+        self,
+        min_value: float = 1e-5,
+        max_value: float = 100.0,
+        growth: float = 1.25,
+        window: int = TIMING_WINDOW,
+    ) -> None:
+        """Initialise l'histogramme (bornes en secondes)."""
+        self._min_value = min_value
+        self._growth = growth
+        self._log_growth = math.log(growth)
+        self._counts = [0] * (math.ceil(math.log(max_value / min_value) / self._log_growth) + 1)
+        self._window = window
+        self._count = 0
+        self.total = 0
+        self.last: Optional[float] = None
+
+    def __len__(self) -> int:
+        """Retourne l'effectif pondéré de l'histogramme."""
+        return self._count
+
+    def add(self, seconds: float) -> None:
+        """Compte une durée."""
+        self.last = seconds
+        self.total += 1
+        if seconds <= self._min_value:
+            index = 0
+        else:
+            index = min(
+                len(self._counts) - 1,
+                math.ceil(math.log(seconds / self._min_value) / self._log_growth),
+            )
+        self._counts[index] += 1
+        self._count += 1
+        if self._count >= self._window:
+            self._counts = [count >> 1 for count in self._counts]
+            self._count = sum(self._counts)
+
+    def percentile(self, percent: float) -> Optional[float]:
+        """Retourne le percentile demandé en secondes (centre géométrique de sa classe)."""
+        if not self._count:
+            return None
+        target = self._count * percent / 100
+        cumulative = 0
+        for index, count in enumerate(self._counts):
+            cumulative += count
+            if count and cumulative >= target:
+                break
+        if index == 0:
+            return self._min_value
+        return self._min_value * self._growth ** (index - 0.5)
+
+    def clear(self) -> None:
+        """Vide l'histogramme."""
+        self._counts = [0] * len(self._counts)
+        self._count = 0
+        self.total = 0
+        self.last = None
+
+
+class StageTimings:
+    """Un histogramme de durées par étape nommée."""
+
+    def __init__(self, stages: Iterable[str]) -> None:
+        """Initialise les histogrammes."""
+        self._histograms = {stage: LatencyHistogram() for stage in stages}
+
+    def __contains__(self, stage: object) -> bool:
+        """Vérifie si l'étape est mesurée."""
+        return stage in self._histograms
+
+    def __getitem__(self, stage: str) -> LatencyHistogram:
+        """Retourne l'histogramme d'une étape."""
+        return self._histograms[stage]
+
+    def record(self, stage: str, seconds: float) -> None:
+        """Enregistre la durée d'une étape."""
+        self._histograms[stage].add(seconds)
+
+    @contextmanager
+    def measure(self, stage: str) -> Iterator[None]:
+        """Mesure la durée du bloc, y compris s'il échoue."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._histograms[stage].add(time.perf_counter() - started)
+
+    def summary(self, stage: str) -> Optional[dict[str, float]]:
+        """Retourne les percentiles et la dernière durée en millisecondes."""
+        histogram = self._histograms[stage]
+        if not len(histogram):
+            return None
+        summary = {
+            f"p{percent}": round(histogram.percentile(percent) * 1000, 3)
+            for percent in PERCENTILES
+        }
+        summary["last"] = round(histogram.last * 1000, 3)
+        summary["count"] = histogram.total
+        return summary
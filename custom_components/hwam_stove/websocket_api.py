@@ -0,0 +1,168 @@
+"""Websocket commands for HWAM Smart Control."""
+from __future__ import annotations
+
+from typing import Any, Optional, Sequence
+
+import voluptuous as vol
+
+from homeassistant.components import websocket_api
+from homeassistant.core import HomeAssistant, callback
+import homeassistant.helpers.config_validation as cv
+from homeassistant.helpers import entity_registry as er
+from homeassistant.util import dt as dt_util
+
+from .const import (
+    DOMAIN,
+    HISTORY_CHART_POINTS,
+    HISTORY_DELTA_SCALE,
+    HISTORY_MAX_POINTS,
+    WS_TYPE_HISTORY,
+)
+from .coordinator import HWAMDataCoordinator
+from .downsample import decimate, delta_encode
+from .history import HISTORY_COLUMNS
+from .tiers import HISTORY_TIERS, TIER_DAY, TIER_RAW, to_columns
+
+RESOLUTION_AUTO = "auto"
+
+
+@callback
+def async_register_websocket_commands(hass: HomeAssistant) -> None:
+    """Register the websocket commands of the integration."""
+    websocket_api.async_register_command(hass, ws_history)
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): WS_TYPE_HISTORY,
+        vol.Exclusive("entry_id", "stove"): cv.string,
+        vol.Exclusive("entity_id", "stove"): cv.entity_id,
+        vol.Optional("resolution", default=RESOLUTION_AUTO): vol.In(
+            (RESOLUTION_AUTO,) + HISTORY_TIERS
+        ),
+        vol.Optional("start"): cv.datetime,
+        vol.Optional("end"): cv.datetime,
+        vol.Optional("columns"): [cv.string],
+        vol.Optional("signal", default="stove_temp"): vol.In(HISTORY_COLUMNS[1:]),
+        vol.Optional("points", default=HISTORY_CHART_POINTS): vol.All(
+            vol.Coerce(int), vol.Range(min=3, max=HISTORY_MAX_POINTS)
+        ),
+        vol.Optional("delta", default=False): cv.boolean,
+    }
+)
+@callback
+def ws_history(
+    hass: HomeAssistant, connection: websocket_api.ActiveConnection, msg: dict[str, Any]
+) -> None:
+    """Return a decimated, columnar slice of a stove history."""
+    if (coordinator := _coordinator(hass, msg)) is None:
+        connection.send_error(msg["id"], websocket_api.ERR_NOT_FOUND, "Unknown HWAM stove")
+        return
+
+    start, end = msg.get("start"), msg.get("end")
+    try:
+        result = history_response(
+            coordinator,
+            msg["resolution"],
+            start.timestamp() if start else None,
+            end.timestamp() if end else None,
+            columns=msg.get("columns"),
+            signal=msg["signal"],
+            points=msg["points"],
+            delta=msg["delta"],
+        )
+    except ValueError as err:
+        connection.send_error(msg["id"], websocket_api.ERR_INVALID_FORMAT, str(err))
+        return
+    connection.send_result(msg["id"], result)
+
+
+def history_response(
+    coordinator: HWAMDataCoordinator,
+    resolution: str,
+    start: Optional[float],
+    end: Optional[float],
+    columns: Optional[Sequence[str]] = None,
+    signal: str = "stove_temp",
+    points: int = HISTORY_CHART_POINTS,
+    delta: bool = False,
+    now: Optional[float] = None,
+) -> dict[str, Any]:
+    """Build the response of the history command.
+
+    The slice is read from the in-memory tiers (views, no copy), reduced to
+    `points` rows with LTTB on `signal`, then returned as parallel arrays.
+    The payload size thus depends on `points` only, not on the range.
+    """
+    if resolution == RESOLUTION_AUTO:
+        if end is not None:
+            now = end
+        elif now is None:
+            now = dt_util.utcnow().timestamp()
+        resolution = _auto_resolution(coordinator, start, now)
+    names, rows = coordinator.query_history(resolution, start, end)
+    total = rows.shape[1]
+
+    # Signal de réduction : la moyenne dans les niveaux agrégés
+    pivot = next(
+        (name for name in (signal, f"{signal}_mean") if name in names), names[1]
+    )
+    rows = decimate(names, rows, pivot, points)
+
+    if columns is not None:
+        if unknown := set(columns) - set(names):
+            raise ValueError(f"Unknown columns for {resolution}: {', '.join(sorted(unknown))}")
+        selected = [names.index("timestamp")] + [
+            names.index(name) for name in columns if name != "timestamp"
+        ]
+        names, rows = tuple(names[index] for index in selected), rows[selected]
+
+    result: dict[str, Any] = {
+        "resolution": resolution,
+        "count": rows.shape[1],
+        "total": total,
+        "encoding": "delta" if delta else "plain",
+    }
+    if delta:
+        scales = {name: 1 if name == "timestamp" else HISTORY_DELTA_SCALE for name in names}
+        result["scale"] = scales
+        result["columns"] = {
+            name: delta_encode(row, scales[name]) for name, row in zip(names, rows)
+        }
+    else:
+        result["columns"] = to_columns(names, rows)
+    return result
+
+
+def _auto_resolution(
+    coordinator: HWAMDataCoordinator, start: Optional[float], now: float
+) -> str:
+    """Return the finest tier covering the range from `start`.
+
+    Raw samples are used while they reach back to `start`; aggregated tiers
+    are chosen by retention (capacity times period).
+    """
+    if start is None:
+        return TIER_DAY
+    raw = coordinator.history
+    if len(raw) and raw.column("timestamp")[0] <= start:
+        return TIER_RAW
+    for name, tier in coordinator.history_tiers.items():
+        if start >= now - tier.period * tier.buffer.capacity:
+            return name
+    return TIER_DAY
+
+
+def _coordinator(hass: HomeAssistant, msg: dict[str, Any]) -> Optional[HWAMDataCoordinator]:
+    """Return the coordinator targeted by an entry or one of its entities."""
+    coordinators: dict[str, HWAMDataCoordinator] = hass.data.get(DOMAIN, {})
+    entry_id = msg.get("entry_id")
+    if (entity_id := msg.get("entity_id")) is not None:
+        entity = er.async_get(hass).async_get(entity_id)
+        entry_id = entity.config_entry_id if entity is not None else None
+        if entry_id is None:
+            return None
+    elif entry_id is None and len(coordinators) == 1:
+        # Un seul poêle : l'entrée peut être omise
+        return next(iter(coordinators.values()))
+    return coordinators.get(entry_id)
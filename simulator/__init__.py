@@ -0,0 +1 @@
+"""Simulated HWAM Smart Control stoves for tests and load testing."""
@@ -0,0 +1,66 @@
+"""Run simulated HWAM stoves.
+
+Usage:
+    python -m simulator --stoves 200 --port 18000 --speed 60 \
+        --latency 0.05 --jitter 0.02 --loss 0.01 --malformed 0.01
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+
+from .server import FaultProfile, StoveSimulator
+
+
+async def _run(args: argparse.Namespace) -> None:
+    """Start the simulator and wait forever."""
+    simulator = StoveSimulator(
+        count=args.stoves,
+        host=args.host,
+        base_port=args.port,
+        speed=args.speed,
+        faults=FaultProfile(
+            latency=args.latency,
+            jitter=args.jitter,
+            loss=args.loss,
+            malformed=args.malformed,
+        ),
+        seed=args.seed,
+    )
+    if args.start:
+        for stove in simulator.stoves:
+            stove.start()
+    await simulator.start()
+    ports = simulator.ports
+    print(f"{len(ports)} stoves on {args.host}:{ports[0]}-{ports[-1]}")
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await simulator.stop()
+
+
+def main() -> None:
+    """Entry point."""
+    parser = argparse.ArgumentParser(description="Simulated HWAM stoves")
+    parser.add_argument("--stoves", type=int, default=1)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=18000, help="Port of the first stove")
+    parser.add_argument("--speed", type=float, default=1.0, help="Time acceleration")
+    parser.add_argument("--latency", type=float, default=0.0, help="Mean latency (s)")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Latency std dev (s)")
+    parser.add_argument("--loss", type=float, default=0.0, help="Dropped request ratio")
+    parser.add_argument("--malformed", type=float, default=0.0, help="Invalid response ratio")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--start", action="store_true", help="Light every stove at startup")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    try:
+        asyncio.run(_run(args))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
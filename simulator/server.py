@@ -0,0 +1,213 @@
+"""aiohttp server exposing virtual HWAM stoves."""
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass
+import json
+import logging
+import random
+import time
+from typing import Optional
+
+from aiohttp import web
+
+from .stove import VirtualStove
+
+_LOGGER = logging.getLogger(__name__)
+
+ENDPOINT_GET_STOVE_DATA = "/get_stove_data"
+ENDPOINT_START = "/start"
+ENDPOINT_SET_BURN_LEVEL = "/set_burn_level"
+ENDPOINT_SET_NIGHT_TIME = "/set_night_time"
+ENDPOINT_SET_NIGHT_LOWERING = "/set_night_lowering"
+ENDPOINT_SET_REMOTE_REFILL_ALARM = "/set_remote_refill_alarm"
+
+OK = {"response": "OK"}
+
+
+@dataclass
+class FaultProfile:
+    """Network faults injected in every response."""
+
+    latency: float = 0.0  # Délai moyen en secondes
+    jitter: float = 0.0  # Écart type du délai en secondes
+    loss: float = 0.0  # Probabilité de couper la connexion sans réponse
+    malformed: float = 0.0  # Probabilité de renvoyer une réponse invalide
+
+
+class StoveSimulator:
+    """Host many virtual stoves in one process.
+
+    Each stove listens on its own port (base_port + index) so that the
+    integration can address it as a plain host. All sites share a single
+    aiohttp application; the stove is selected from the local port of the
+    connection. Simulated time runs `speed` times faster than real time.
+    """
+
+    def __init__(
+        self,
+        count: int = 1,
+        host: str = "127.0.0.1",
+        base_port: int = 0,
+        speed: float = 1.0,
+        faults: Optional[FaultProfile] = None,
+        seed: Optional[int] = None,
+    ) -> None:
+        """Initialise the simulator."""
+        self.host = host
+        self.speed = speed
+        self.faults = faults or FaultProfile()
+        self._base_port = base_port
+        self._random = random.Random(seed)
+        self.stoves = [
+            VirtualStove(stove_id=index, seed=None if seed is None else seed + index)
+            for index in range(count)
+        ]
+        self._by_port: dict[int, VirtualStove] = {}
+        self._last_advance: dict[int, float] = {}
+        self._runner: Optional[web.AppRunner] = None
+        self.requests = 0
+
+    @property
+    def ports(self) -> list[int]:
+        """Return the port of each stove, in order."""
+        by_stove = {stove.stove_id: port for port, stove in self._by_port.items()}
+        return [by_stove[stove.stove_id] for stove in self.stoves]
+
+    def _application(self) -> web.Application:
+        """Build the aiohttp application."""
+        app = web.Application()
+        app.router.add_get(ENDPOINT_GET_STOVE_DATA, self._handle_get_stove_data)
+        app.router.add_get(ENDPOINT_START, self._handle_start)
+        app.router.add_post(ENDPOINT_SET_BURN_LEVEL, self._handle_set_burn_level)
+        app.router.add_post(ENDPOINT_SET_NIGHT_TIME, self._handle_set_night_time)
+        app.router.add_post(ENDPOINT_SET_NIGHT_LOWERING, self._handle_set_night_lowering)
+        app.router.add_post(
+            ENDPOINT_SET_REMOTE_REFILL_ALARM, self._handle_set_remote_refill_alarm
+        )
+        return app
+
+    async def start(self) -> None:
+        """Start one site per stove."""
+        self._runner = web.AppRunner(self._application(), access_log=None)
+        await self._runner.setup()
+        now = time.monotonic()
+        for index, stove in enumerate(self.stoves):
+            port = self._base_port + index if self._base_port else 0
+            site = web.TCPSite(self._runner, self.host, port)
+            await site.start()
+            bound = site._server.sockets[0].getsockname()[1]  # pylint: disable=protected-access
+            self._by_port[bound] = stove
+            self._last_advance[stove.stove_id] = now
+        _LOGGER.info("%s stoves listening on %s", len(self.stoves), self.host)
+
+    async def stop(self) -> None:
+        """Stop all sites."""
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    def _stove(self, request: web.Request) -> VirtualStove:
+        """Return the stove addressed by the request and bring it up to date."""
+        port = request.transport.get_extra_info("sockname")[1]
+        stove = self._by_port[port]
+        now = time.monotonic()
+        elapsed = now - self._last_advance[stove.stove_id]
+        self._last_advance[stove.stove_id] = now
+        stove.advance(elapsed * self.speed)
+        return stove
+
+    async def _inject_faults(self, request: web.Request) -> bool:
+        """Apply latency and loss; return False if the request is dropped."""
+        self.requests += 1
+        faults = self.faults
+        if faults.latency or faults.jitter:
+            delay = max(0.0, self._random.gauss(faults.latency, faults.jitter))
+            await asyncio.sleep(delay)
+        if faults.loss and self._random.random() < faults.loss:
+            request.transport.close()
+            return False
+        return True
+
+    def _malformed(self, payload: dict) -> Optional[web.Response]:
+        """Return an invalid response with the configured probability."""
+        if not self.faults.malformed or self._random.random() >= self.faults.malformed:
+            return None
+        if self._random.random() < 0.5:
+            body = json.dumps(payload)
+            return web.Response(
+                text=body[: len(body) // 2], content_type="application/json"
+            )
+        broken = dict(payload)
+        broken.pop(self._random.choice(sorted(broken)))
+        return web.json_response(broken)
+
+    async def _handle_get_stove_data(self, request: web.Request) -> web.StreamResponse:
+        """Handle GET /get_stove_data."""
+        if not await self._inject_faults(request):
+            return web.Response()
+        payload = self._stove(request).payload()
+        # Une réponse aiohttp est un mapping vide, donc fausse : pas de `or`
+        if (response := self._malformed(payload)) is not None:
+            return response
+        return web.json_response(payload)
+
+    async def _handle_start(self, request: web.Request) -> web.StreamResponse:
+        """Handle GET /start."""
+        if not await self._inject_faults(request):
+            return web.Response()
+        self._stove(request).start()
+        return web.json_response(OK)
+
+    async def _handle_set_burn_level(self, request: web.Request) -> web.StreamResponse:
+        """Handle POST /set_burn_level."""
+        if not await self._inject_faults(request):
+            return web.Response()
+        stove = self._stove(request)
+        try:
+            body = await request.json()
+            stove.set_burn_level(int(body["level"]))
+        except (KeyError, TypeError, ValueError) as err:
+            return web.json_response({"response": "ERROR", "error": str(err)}, status=400)
+        return web.json_response(OK)
+
+    async def _handle_set_night_time(self, request: web.Request) -> web.StreamResponse:
+        """Handle POST /set_night_time."""
+        if not await self._inject_faults(request):
+            return web.Response()
+        stove = self._stove(request)
+        try:
+            body = await request.json()
+            stove.set_night_time(
+                (int(body["begin_hour"]), int(body["begin_minute"])),
+                (int(body["end_hour"]), int(body["end_minute"])),
+            )
+        except (KeyError, TypeError, ValueError) as err:
+            return web.json_response({"response": "ERROR", "error": str(err)}, status=400)
+        return web.json_response(OK)
+
+    async def _handle_set_night_lowering(self, request: web.Request) -> web.StreamResponse:
+        """Handle POST /set_night_lowering."""
+        if not await self._inject_faults(request):
+            return web.Response()
+        stove = self._stove(request)
+        try:
+            body = await request.json()
+            stove.set_night_lowering(bool(int(body["value"])))
+        except (KeyError, TypeError, ValueError) as err:
+            return web.json_response({"response": "ERROR", "error": str(err)}, status=400)
+        return web.json_response(OK)
+
+    async def _handle_set_remote_refill_alarm(
+        self, request: web.Request
+    ) -> web.StreamResponse:
+        """Handle POST /set_remote_refill_alarm."""
+        if not await self._inject_faults(request):
+            return web.Response()
+        stove = self._stove(request)
+        try:
+            body = await request.json()
+            stove.set_remote_refill_alarm(bool(int(body["value"])))
+        except (KeyError, TypeError, ValueError) as err:
+            return web.json_response({"response": "ERROR", "error": str(err)}, status=400)
+        return web.json_response(OK)
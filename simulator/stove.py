@@ -0,0 +1,253 @@
+"""Burn-cycle model of a virtual HWAM stove."""
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+import random
+from typing import Any
+
+# Phases du poêle
+PHASE_IGNITION = 1
+PHASE_STARTUP = 2
+PHASE_BURNING = 3
+PHASE_EMBERS = 4
+PHASE_STANDBY = 5
+
+AMBIENT_OXYGEN = 20.9  # Taux d'oxygène de l'air en %
+STEP = 5.0  # Pas d'intégration en secondes simulées
+
+# Débit de combustion (kg/h) par niveau 0-5
+BURN_RATES = (0.6, 0.9, 1.2, 1.6, 2.0, 2.5)
+HEAT_PER_KG = 350.0  # Gain de température (°C/h) par kg/h brûlé
+STOVE_LOSS = 1.6  # Constante de refroidissement du poêle (1/h)
+ROOM_LOSS = 0.1  # Pertes de la pièce vers l'extérieur (1/h)
+ROOM_GAIN = 0.012  # Couplage poêle -> pièce (1/h)
+
+
+@dataclass
+class VirtualStove:
+    """State and dynamics of one simulated stove.
+
+    The state advances lazily with a fixed integration step whenever it is
+    read, so idle stoves cost nothing between requests.
+    """
+
+    stove_id: int
+    clock: datetime = field(default_factory=lambda: datetime(2024, 1, 27, 8, 0))
+    outdoor_temperature: float = 5.0
+    seed: int | None = None
+
+    phase: int = PHASE_STANDBY
+    burn_level: int = 2
+    operation_mode: int = 2
+    stove_temperature: float = 20.0
+    room_temperature: float = 19.0
+    oxygen_level: float = AMBIENT_OXYGEN
+    valves: list[float] = field(default_factory=lambda: [0.0, 0.0, 0.0])
+    wood: float = 0.0
+    load: float = 0.0
+    door_open: bool = False
+    night_begin: tuple[int, int] = (22, 0)
+    night_end: tuple[int, int] = (6, 0)
+    night_lowering_enabled: bool = True
+    remote_refill_alarm: bool = False
+    service_date: str = "2024-01-15"
+    last_remote_msg: datetime | None = None
+    _door_until: datetime | None = None
+
+    def __post_init__(self) -> None:
+        """Initialise the random source."""
+        self._random = random.Random(self.seed if self.seed is not None else self.stove_id)
+
+    # Commandes
+
+    def start(self, wood: float = 3.0) -> None:
+        """Load wood and start a combustion cycle."""
+        self.wood += wood
+        self.load = self.wood
+        self.door_open = True
+        self._door_until = self.clock + timedelta(seconds=45)
+        if self.phase in (PHASE_EMBERS, PHASE_STANDBY):
+            self.phase = PHASE_IGNITION
+
+    def set_burn_level(self, level: int) -> None:
+        """Change the burn level (0-5)."""
+        if not 0 <= level <= 5:
+            raise ValueError(f"Invalid burn level: {level}")
+        self.burn_level = level
+        self.last_remote_msg = self.clock
+
+    def set_night_time(self, begin: tuple[int, int], end: tuple[int, int]) -> None:
+        """Change the night lowering period."""
+        self.night_begin = begin
+        self.night_end = end
+        self.last_remote_msg = self.clock
+
+    def set_night_lowering(self, enabled: bool) -> None:
+        """Enable or disable the night lowering."""
+        self.night_lowering_enabled = enabled
+        self.last_remote_msg = self.clock
+
+    def set_remote_refill_alarm(self, enabled: bool) -> None:
+        """Enable or disable the refill alarm on the remote."""
+        self.remote_refill_alarm = enabled
+        self.last_remote_msg = self.clock
+
+    # Dynamique
+
+    @property
+    def night_lowering(self) -> bool:
+        """Return whether the night lowering is enabled and currently applies."""
+        if not self.night_lowering_enabled:
+            return False
+        now = (self.clock.hour, self.clock.minute)
+        if self.night_begin <= self.night_end:
+            return self.night_begin <= now < self.night_end
+        return now >= self.night_begin or now < self.night_end
+
+    @property
+    def effective_burn_level(self) -> int:
+        """Return the burn level applied, lowered at night."""
+        if self.night_lowering:
+            return max(0, self.burn_level - 2)
+        return self.burn_level
+
+    def _burn_rate(self) -> float:
+        """Return the wood consumption in kg/h for the current phase."""
+        if self.wood <= 0:
+            return 0.0
+        rate = BURN_RATES[self.effective_burn_level]
+        return {
+            PHASE_IGNITION: 0.8 * rate,
+            PHASE_STARTUP: rate,
+            PHASE_BURNING: rate,
+            PHASE_EMBERS: 0.25 * rate,
+        }.get(self.phase, 0.0)
+
+    def advance(self, seconds: float) -> None:
+        """Advance the simulation by the given number of seconds."""
+        while seconds > 0:
+            step = min(STEP, seconds)
+            self._step(step)
+            seconds -= step
+
+    def _step(self, seconds: float) -> None:
+        """Integrate the model over one step."""
+        hours = seconds / 3600
+        self.clock += timedelta(seconds=seconds)
+        if self._door_until is not None and self.clock >= self._door_until:
+            self.door_open = False
+            self._door_until = None
+
+        rate = self._burn_rate()
+        self.wood = max(0.0, self.wood - rate * hours)
+
+        # Température du poêle : apport de la combustion et pertes
+        heat = rate * HEAT_PER_KG
+        if self.door_open:
+            heat *= 0.5
+        loss = STOVE_LOSS * (self.stove_temperature - self.room_temperature)
+        self.stove_temperature += (heat - loss) * hours
+        self.stove_temperature += self._random.gauss(0, 0.15)
+
+        # Température de la pièce
+        room_gain = ROOM_GAIN * (self.stove_temperature - self.room_temperature)
+        room_loss = ROOM_LOSS * (self.room_temperature - self.outdoor_temperature)
+        self.room_temperature += (room_gain - room_loss) * hours
+
+        # Oxygène : consommé par la combustion, corrigé par les valves
+        opening = sum(self.valves) / 300
+        target = AMBIENT_OXYGEN - rate * 4.5 * (1.2 - opening)
+        self.oxygen_level += (target - self.oxygen_level) * min(1.0, seconds / 60)
+        self.oxygen_level = min(AMBIENT_OXYGEN, max(2.0, self.oxygen_level))
+        self._regulate_valves(seconds)
+        self._update_phase()
+
+    def _regulate_valves(self, seconds: float) -> None:
+        """Move the valves towards the O2 target of the burn level."""
+        if self.phase == PHASE_STANDBY:
+            targets = (0.0, 0.0, 0.0)
+        elif self.phase == PHASE_IGNITION:
+            targets = (100.0, 100.0, 60.0)
+        else:
+            oxygen_target = 12.0 - self.effective_burn_level
+            error = self.oxygen_level - oxygen_target
+            primary = max(0.0, min(100.0, 50 - 8 * error + 10 * self.effective_burn_level))
+            targets = (primary, primary * 0.8, primary * 0.5)
+
+        speed = min(1.0, seconds / 30)
+        self.valves = [
+            valve + (target - valve) * speed for valve, target in zip(self.valves, targets)
+        ]
+
+    def _update_phase(self) -> None:
+        """Apply the phase transitions."""
+        if self.phase == PHASE_IGNITION and self.stove_temperature > 120:
+            self.phase = PHASE_STARTUP
+        elif self.phase == PHASE_STARTUP and self.stove_temperature > 250:
+            self.phase = PHASE_BURNING
+        elif (
+            self.phase in (PHASE_STARTUP, PHASE_BURNING)
+            and self.wood < 0.2 * max(self.load, 0.1)
+        ):
+            self.phase = PHASE_EMBERS
+        elif self.phase == PHASE_EMBERS and self.stove_temperature < 60:
+            self.phase = PHASE_STANDBY
+            self.wood = 0.0
+
+    # Réponse de l'API
+
+    def payload(self) -> dict[str, Any]:
+        """Return the /get_stove_data payload for the current state."""
+        rate = self._burn_rate()
+        refill_minutes = int(self.wood / rate * 60) if rate else 0
+        since_remote = (
+            self.clock - self.last_remote_msg
+            if self.last_remote_msg is not None
+            else timedelta(0)
+        )
+        since_minutes = min(int(since_remote.total_seconds() // 60), 99 * 60 + 59)
+        valve1, valve2, valve3 = (int(round(valve)) for valve in self.valves)
+        return {
+            "algorithm": "IHS",
+            "stove_temperature": int(round(min(max(0.0, self.stove_temperature), 790.0) * 100)),
+            "room_temperature": int(round(self.room_temperature * 100)),
+            "oxygen_level": int(round(self.oxygen_level * 100)),
+            "phase": self.phase,
+            "burn_level": self.burn_level,
+            "operation_mode": self.operation_mode,
+            "door_open": int(self.door_open),
+            "updating": 0,
+            "night_lowering": int(self.night_lowering),
+            "maintenance_alarms": 0,
+            "safety_alarms": int(self.stove_temperature > 600),
+            "refill_alarm": int(self.phase == PHASE_EMBERS),
+            "remote_refill_alarm": int(self.remote_refill_alarm),
+            "remote_refill_beeps": 0,
+            "version_major": 1,
+            "version_minor": 4,
+            "version_build": 2,
+            "wifi_version_major": 2,
+            "wifi_version_minor": 1,
+            "wifi_version_build": 0,
+            "remote_version_major": 1,
+            "remote_version_minor": 0,
+            "remote_version_build": 7,
+            "service_date": self.service_date,
+            "valve1_position": valve1,
+            "valve2_position": valve2,
+            "valve3_position": valve3,
+            "night_begin_hour": self.night_begin[0],
+            "night_begin_minute": self.night_begin[1],
+            "night_end_hour": self.night_end[0],
+            "night_end_minute": self.night_end[1],
+            "year": self.clock.year,
+            "month": self.clock.month,
+            "day": self.clock.day,
+            "hours": self.clock.hour,
+            "minutes": self.clock.minute,
+            "seconds": self.clock.second,
+            "time_since_remote_msg": f"{since_minutes // 60:02d}:{since_minutes % 60:02d}",
+            "new_fire_wood_hours": refill_minutes // 60,
+            "new_fire_wood_minutes": refill_minutes % 60,
+        }
@@ -40,5 +40,30 @@ def mock_stove_data():
         "version_major": 1,
         "version_minor": 0,
         "version_build": 0,
-        "algorithm": "IHS"
+        "algorithm": "IHS",
+        "updating": 0,
+        "night_lowering": 0,
+        "refill_alarm": 0,
+        "remote_refill_alarm": 0,
+        "remote_refill_beeps": 0,
+        "wifi_version_major": 2,
+        "wifi_version_minor": 1,
+        "wifi_version_build": 0,
+        "remote_version_major": 1,
+        "remote_version_minor": 0,
+        "remote_version_build": 7,
+        "service_date": "2024-01-15",
+        "night_begin_hour": 22,
+        "night_begin_minute": 0,
+        "night_end_hour": 6,
+        "night_end_minute": 30,
+        "year": 2024,
+        "month": 1,
+        "day": 27,
+        "hours": 12,
+        "minutes": 0,
+        "seconds": 0,
+        "time_since_remote_msg": "00:05",
+        "new_fire_wood_hours": 1,
+        "new_fire_wood_minutes": 30,
     }
@@ -1,28 +1,40 @@
 """Test the HWAM API."""
+import asyncio
+from datetime import timedelta
+import json
+
 import pytest
-from unittest.mock import patch, AsyncMock
+from unittest.mock import patch, AsyncMock, MagicMock
 from aiohttp import ClientError
 
 from custom_components.hwam_stove.api import (
     HWAMApi,
     CannotConnect,
+    CircuitOpen,
     InvalidResponse
 )
+from custom_components.hwam_stove.circuit import STATE_CLOSED, STATE_OPEN, CircuitBreaker
 
 @pytest.fixture
-def api():
-    """Create a HWAM API object."""
-    return HWAMApi("192.168.1.100")
+async def api():
+    """Create a HWAM API object and close its session afterwards."""
+    api = HWAMApi("192.168.1.100")
+    yield api
+    await api.close()
+
+def _response(status, body=b""):
+    """Return a `session.request` result usable as an async context manager."""
+    context = MagicMock()
+    context.__aenter__.return_value = MagicMock(
+        status=status, read=AsyncMock(return_value=body)
+    )
+    return context
 
 @pytest.mark.asyncio
 async def test_get_stove_data(api, mock_stove_data):
     """Test getting stove data."""
-    with patch("aiohttp.ClientSession.request", new_callable=AsyncMock) as mock_get:
-        mock_get.return_value.__aenter__.return_value.status = 200
-        mock_get.return_value.__aenter__.return_value.json = AsyncMock(
-            return_value=mock_stove_data
-        )
-
+    body = json.dumps(mock_stove_data).encode()
+    with patch("aiohttp.ClientSession.request", return_value=_response(200, body)):
         data = await api.get_stove_data()
         assert data.temperatures.stove_temperature == 245.0
         assert data.temperatures.room_temperature == 21.0
@@ -37,10 +49,124 @@ async def test_connection_error(api):
         with pytest.raises(CannotConnect):
             await api.get_stove_data()
 
+@pytest.mark.asyncio
+async def test_circuit_open(api):
+    """Test an unreachable stove is no longer queried once the circuit opens."""
+    with patch("aiohttp.ClientSession.request", side_effect=ClientError) as mock_request:
+        for _ in range(3):
+            with pytest.raises(CannotConnect):
+                await api.get_stove_data(budget=0.1)
+        assert api.circuit.state == STATE_OPEN
+
+        calls = mock_request.call_count
+        with pytest.raises(CircuitOpen):
+            await api.get_stove_data()
+        assert mock_request.call_count == calls
+
 @pytest.mark.asyncio
 async def test_invalid_response(api):
     """Test API when receiving invalid response."""
-    with patch("aiohttp.ClientSession.request", new_callable=AsyncMock) as mock_get:
-        mock_get.return_value.__aenter__.return_value.status = 404
+    with patch("aiohttp.ClientSession.request", return_value=_response(404)):
         with pytest.raises(InvalidResponse):
             await api.get_stove_data()
+
+@pytest.mark.asyncio
+async def test_unchanged_payload(api, mock_stove_data):
+    """Test an identical body returns the previous snapshot without decoding."""
+    body = json.dumps(mock_stove_data).encode()
+    with patch.object(api, "_request_raw", AsyncMock(return_value=body)) as mock_read:
+        first = await api.get_stove_data()
+        assert not api.last_unchanged
+
+        # Lecture réseau à chaque appel (max_age=0), sans instantané en cache
+        with patch("custom_components.hwam_stove.api.StoveData.from_dict") as from_dict:
+            assert await api.get_stove_data(max_age=0, allow_stale=False) is first
+            from_dict.assert_not_called()
+        assert api.last_unchanged
+        assert api.last_source == "network"
+
+        mock_read.return_value = json.dumps({**mock_stove_data, "phase": 4}).encode()
+        assert (await api.get_stove_data(max_age=0, allow_stale=False)).state.phase == 4
+        assert not api.last_unchanged
+
+@pytest.mark.asyncio
+async def test_snapshot_cache(api, mock_stove_data):
+    """Test fresh, stale and concurrent reads share the stove requests."""
+    body = json.dumps(mock_stove_data).encode()
+    with patch.object(api, "_request_raw", AsyncMock(return_value=body)) as mock_read:
+        first, second = await asyncio.gather(api.get_stove_data(), api.get_stove_data())
+        assert first is second
+        assert mock_read.await_count == 1
+
+        assert await api.get_stove_data() is first
+        assert api.last_source == "cache"
+        assert api.cache_age < timedelta(seconds=5)
+
+        # Instantané périmé : retourné aussitôt et rafraîchi en arrière-plan
+        api._fetched_at -= 10
+        assert await api.get_stove_data() is first
+        assert api.last_source == "stale"
+        await asyncio.sleep(0)
+        await asyncio.sleep(0)
+        assert mock_read.await_count == 2
+        assert api.last_source == "network"
+
+        # Le coordinateur refuse un instantané périmé
+        api._fetched_at -= 10
+        await api.get_stove_data(allow_stale=False)
+        assert mock_read.await_count == 3
+        assert (api.cache_hits, api.cache_misses) == (2, 3)
+
+@pytest.mark.asyncio
+async def test_raw_body(api, mock_stove_data):
+    """Test the raw body is kept as received and invalid JSON is rejected."""
+    body = json.dumps(mock_stove_data).encode()
+    with patch.object(api, "_request_raw", AsyncMock(return_value=body)):
+        await api.get_stove_data()
+        assert api.last_body is body
+
+    api.clear_cache()
+    with patch.object(api, "_request_raw", AsyncMock(return_value=b"{not json")):
+        with pytest.raises(InvalidResponse):
+            await api.get_stove_data()
+    assert api.last_body is None
+
+@pytest.mark.asyncio
+async def test_circuit_counts_unusable_responses(api, mock_stove_data):
+    """Test malformed payloads and cancelled probes are failures."""
+    with patch.object(api, "_request_raw", AsyncMock(return_value=b'{"phase": 3}')):
+        with pytest.raises(InvalidResponse):
+            await api.get_stove_data()
+    assert api.circuit.failures == 1
+
+    # Sonde annulée à la fermeture : le disjoncteur se rouvre au lieu de rester semi-ouvert
+    api.circuit = CircuitBreaker(1, 0.0, 0.0)
+    api.circuit.record_failure()
+    with patch.object(api, "_request_raw", AsyncMock(side_effect=lambda *args, **kwargs: asyncio.sleep(3600))):
+        read = asyncio.ensure_future(api.get_stove_data())
+        await asyncio.sleep(0)
+        await api.close()
+        with pytest.raises(asyncio.CancelledError):
+            await read
+    assert api.circuit.state == STATE_OPEN
+
+    body = json.dumps(mock_stove_data).encode()
+    with patch.object(api, "_request_raw", AsyncMock(return_value=body)):
+        await api.get_stove_data()
+    assert api.circuit.state == STATE_CLOSED
+
+@pytest.mark.asyncio
+async def test_errors_are_not_hidden_by_the_cache(api, mock_stove_data):
+    """Test a failed read raises instead of returning the cached snapshot."""
+    body = json.dumps(mock_stove_data).encode()
+    with patch.object(api, "_request_raw", AsyncMock(return_value=body)):
+        first = await api.get_stove_data()
+
+    api._fetched_at -= 10
+    with patch.object(api, "_request_raw", AsyncMock(side_effect=CannotConnect)):
+        with pytest.raises(CannotConnect):
+            await api.get_stove_data(budget=0.1, allow_stale=False)
+        # Seule la fenêtre de péremption sert l'instantané en cache
+        assert await api.get_stove_data(budget=0.1) is first
+        assert api.last_source == "stale"
+        await asyncio.sleep(0)
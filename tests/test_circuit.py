@@ -0,0 +1,67 @@
+"""Test the HWAM circuit breaker."""
+from custom_components.hwam_stove.circuit import (
+    STATE_CLOSED,
+    STATE_HALF_OPEN,
+    STATE_OPEN,
+    CircuitBreaker,
+)
+
+
+class _Clock:
+    """Manually advanced clock."""
+
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_opens_after_threshold():
+    """Test the breaker opens after consecutive failures only."""
+    clock = _Clock()
+    circuit = CircuitBreaker(3, 30.0, 600.0, clock=clock)
+
+    circuit.record_failure()
+    circuit.record_failure()
+    circuit.record_success()
+    assert circuit.failures == 0
+
+    for _ in range(3):
+        assert circuit.allow()
+        circuit.record_failure()
+    assert circuit.state == STATE_OPEN
+    assert circuit.trips == 1
+    assert not circuit.allow()
+    assert circuit.retry_in == 30.0
+
+
+def test_half_open_probe():
+    """Test a single probe is allowed and its outcome."""
+    clock = _Clock()
+    circuit = CircuitBreaker(1, 30.0, 100.0, clock=clock)
+    circuit.record_failure()
+
+    clock.now = 30.0
+    assert circuit.allow()
+    assert circuit.state == STATE_HALF_OPEN
+    assert not circuit.allow()
+
+    # Sonde échouée : délai doublé puis borné
+    circuit.record_failure()
+    assert circuit.state == STATE_OPEN
+    assert circuit.retry_in == 60.0
+    clock.now = 90.0
+    assert circuit.allow()
+    circuit.record_failure()
+    assert circuit.retry_in == 100.0
+
+    clock.now = 190.0
+    assert circuit.allow()
+    circuit.record_success()
+    assert circuit.state == STATE_CLOSED
+    assert circuit.retry_in is None
+
+    # Le délai de sonde repart de sa valeur initiale
+    circuit.record_failure()
+    assert circuit.retry_in == 30.0
@@ -0,0 +1,312 @@
+"""Test the HWAM data coordinator."""
+from datetime import timedelta
+from unittest.mock import AsyncMock, Mock
+
+import numpy as np
+import pytest
+from pytest_homeassistant_custom_component.common import (
+    async_capture_events,
+    async_fire_time_changed,
+)
+
+from homeassistant.helpers.update_coordinator import UpdateFailed
+from homeassistant.util.dt import utcnow
+
+from custom_components.hwam_stove.api import CannotConnect
+from custom_components.hwam_stove.const import (
+    COMMAND_DEBOUNCE,
+    COMMAND_VERIFY_DELAY,
+    EVENT_COMMAND_FAILED,
+)
+from custom_components.hwam_stove.coordinator import HWAMDataCoordinator
+from custom_components.hwam_stove.history import HISTORY_COLUMNS
+from custom_components.hwam_stove.history_store import HistoryStore
+from custom_components.hwam_stove.models import StoveData
+from custom_components.hwam_stove.tiers import (
+    AGGREGATE_COLUMNS,
+    DAILY_COLUMNS,
+    TIER_5MIN,
+    TIER_DAY,
+    TIER_HOUR,
+)
+
+
+@pytest.fixture
+def coordinator(hass):
+    """Create a coordinator with a 30 s base interval."""
+    return HWAMDataCoordinator(
+        hass,
+        Mock(),
+        "Test Stove",
+        update_interval=timedelta(seconds=30),
+        min_interval=timedelta(seconds=10),
+        max_interval=timedelta(seconds=300),
+        unchanged_history_interval=timedelta(seconds=300),
+    )
+
+
+def _data(payload, **overrides):
+    """Decode a payload with overridden fields."""
+    return StoveData.from_dict({**payload, **overrides})
+
+
+async def test_interval_follows_phase(coordinator, mock_stove_data):
+    """Test polling is fast while igniting and slow in embers and standby."""
+    intervals = [
+        coordinator._adaptive_interval(_data(mock_stove_data, phase=phase))
+        for phase in range(1, 6)
+    ]
+    assert [interval.total_seconds() for interval in intervals] == [
+        10, 15, 30, 120, 300
+    ]
+
+
+async def test_fast_polling_on_door_and_transients(coordinator, mock_stove_data):
+    """Test the minimum interval is used when the door opens or temperature moves."""
+    standby = _data(mock_stove_data, phase=5)
+    assert coordinator._adaptive_interval(
+        _data(mock_stove_data, phase=5, door_open=1)
+    ) == timedelta(seconds=10)
+
+    coordinator._record_sample((1000.0, 200.0, 20.0, 15.0))
+    coordinator._record_sample((1010.0, 200.5, 20.0, 15.0))
+    assert coordinator._adaptive_interval(standby) == timedelta(seconds=300)
+
+    coordinator._record_sample((1020.0, 215.0, 20.0, 15.0))
+    assert coordinator._adaptive_interval(standby) == timedelta(seconds=10)
+
+
+async def test_change_tracking(coordinator, mock_stove_data):
+    """Test only the fields and metrics that changed are reported."""
+    first = _data(mock_stove_data)
+    coordinator._track_changes(first, {})
+    assert coordinator.has_changes(("valve1_position",))
+
+    coordinator.data = first
+    coordinator._metrics = {"efficiency_score": 80.0}
+    coordinator._track_changes(
+        _data(mock_stove_data, oxygen_level=1500), {"efficiency_score": 80.0}
+    )
+    assert coordinator.has_changes(("temperatures.oxygen_level",))
+    assert not coordinator.has_changes(("valve1_position",), ("efficiency_score",))
+
+    coordinator._metrics = {"efficiency_score": 75.0}
+    coordinator._track_changes(first, {"efficiency_score": 80.0})
+    assert coordinator.has_changes(("valve1_position",), ("efficiency_score",))
+
+
+async def test_unchanged_payload_is_sampled(coordinator, mock_stove_data):
+    """Test identical payloads skip processing and are recorded at a lower rate."""
+    data = _data(mock_stove_data)
+    coordinator.api.get_stove_data = AsyncMock(return_value=data)
+    coordinator.api.last_unchanged = False
+    coordinator._check_maintenance = AsyncMock()
+    coordinator.data = await coordinator._async_update_data()
+    assert len(coordinator.history) == 1
+
+    coordinator.api.last_unchanged = True
+    assert await coordinator._async_update_data() is data
+    assert len(coordinator.history) == 1
+    assert not coordinator.has_changes(("temperatures.stove_temperature",))
+
+    coordinator._history.clear()
+    await coordinator._async_update_data()
+    assert len(coordinator.history) == 1
+
+
+async def test_unchanged_payload_refreshes_diagnostics(coordinator, mock_stove_data):
+    """Test diagnostic metrics keep updating while the stove is idle."""
+    coordinator.async_track_metrics(("circuit_state", "stove_temp_max_24h"))
+    coordinator.api.get_stove_data = AsyncMock(return_value=_data(mock_stove_data))
+    coordinator.api.last_unchanged = False
+    coordinator.api.circuit.state = "closed"
+    coordinator._check_maintenance = AsyncMock()
+    coordinator.data = await coordinator._async_update_data()
+
+    coordinator.api.last_unchanged = True
+    coordinator.api.circuit.state = "half_open"
+    await coordinator._async_update_data()
+    assert coordinator.metrics["circuit_state"] == "half_open"
+    assert coordinator.has_changes((), ("circuit_state",))
+    assert not coordinator.has_changes((), ("stove_temp_max_24h",))
+
+
+async def test_suppressed_writes_published_after_fan_out(coordinator):
+    """Test the suppressed write count is that of the notification just done."""
+    def suppress() -> None:
+        coordinator.suppressed_writes += 1
+
+    seen = []
+    remove_listener = coordinator.async_add_listener(suppress)
+    remove_fan_out = coordinator.async_add_fan_out_listener(
+        lambda: seen.append(coordinator.metrics["suppressed_writes"])
+    )
+    coordinator.async_update_listeners()
+    # Même compte : la notification suivante ne réécrit pas le capteur
+    coordinator.async_update_listeners()
+    assert seen == [1]
+    assert coordinator.metrics["suppressed_writes"] == 1
+    remove_fan_out()
+    remove_listener()
+
+
+async def test_burn_level_commands_are_coalesced(hass, coordinator, mock_stove_data):
+    """Test a burst of burn level changes sends only the last one."""
+    coordinator.data = _data(mock_stove_data)
+    coordinator.api.set_burn_level = AsyncMock(return_value=True)
+    coordinator.async_refresh = AsyncMock()
+
+    for level in (3, 4, 5):
+        await coordinator.set_burn_level(level)
+    assert coordinator.data.state.burn_level == 5
+    coordinator.api.set_burn_level.assert_not_called()
+
+    async_fire_time_changed(hass, utcnow() + COMMAND_DEBOUNCE + timedelta(seconds=1))
+    await hass.async_block_till_done()
+    coordinator.api.set_burn_level.assert_awaited_once_with(5)
+    coordinator.async_refresh.assert_not_called()
+
+    async_fire_time_changed(hass, utcnow() + COMMAND_VERIFY_DELAY + timedelta(seconds=2))
+    await hass.async_block_till_done()
+    coordinator.async_refresh.assert_awaited_once()
+
+    with pytest.raises(ValueError):
+        await coordinator.set_burn_level(6)
+
+
+async def test_command_verification(hass, coordinator, mock_stove_data):
+    """Test commands are shown at once, kept until verified and rolled back."""
+    events = async_capture_events(hass, EVENT_COMMAND_FAILED)
+    coordinator._check_maintenance = AsyncMock()
+    coordinator.data = _data(mock_stove_data, phase=5)
+    coordinator.api.start_combustion = AsyncMock(return_value=True)
+    coordinator.api.last_unchanged = False
+    coordinator.api.get_stove_data = AsyncMock(return_value=_data(mock_stove_data, phase=5))
+
+    assert await coordinator.start_combustion()
+    assert coordinator.data.state.phase == 1
+
+    # Le poêle n'a pas encore changé de phase : l'état attendu est conservé
+    assert (await coordinator._async_update_data()).state.phase == 1
+
+    # Interrogation de vérification : la commande n'a pas été appliquée
+    coordinator._pending_commands["start_combustion"].verify = True
+    assert (await coordinator._async_update_data()).state.phase == 5
+    await hass.async_block_till_done()
+    assert events[0].data["command"] == "start_combustion"
+    assert not coordinator._pending_commands
+    await coordinator.async_flush_commands()
+
+
+async def test_failed_commands_are_rolled_back(hass, coordinator, mock_stove_data):
+    """Test an unacknowledged or failing command restores the state and is reported."""
+    events = async_capture_events(hass, EVENT_COMMAND_FAILED)
+    coordinator.data = coordinator._reported_data = _data(mock_stove_data, phase=5)
+
+    send = AsyncMock(return_value=False)
+    assert not await coordinator.async_command("night_mode", send, {"state.night_lowering": True})
+    assert coordinator.data.state.night_lowering is False
+
+    send = AsyncMock(side_effect=CannotConnect("unreachable"))
+    with pytest.raises(CannotConnect):
+        await coordinator.async_command("night_mode", send, {"state.night_lowering": True})
+    assert coordinator.data.state.night_lowering is False
+
+    await hass.async_block_till_done()
+    assert [event.data["reason"] for event in events] == ["error", "error"]
+    assert not coordinator._pending_commands
+
+
+async def test_read_errors_fail_the_update(hass, coordinator, mock_stove_data):
+    """Test an unreachable stove fails the update without a new sample."""
+    events = async_capture_events(hass, EVENT_COMMAND_FAILED)
+    coordinator._check_maintenance = AsyncMock()
+    coordinator.api.last_unchanged = False
+    coordinator.api.get_stove_data = AsyncMock(return_value=_data(mock_stove_data, phase=5))
+    await coordinator._async_update_data()
+    coordinator.api.start_combustion = AsyncMock(return_value=True)
+    coordinator.data = _data(mock_stove_data, phase=5)
+    assert await coordinator.start_combustion()
+
+    # Interrogation de vérification pendant que le poêle est injoignable
+    coordinator._pending_commands["start_combustion"].verify = True
+    coordinator.api.get_stove_data = AsyncMock(side_effect=CannotConnect("unreachable"))
+    with pytest.raises(UpdateFailed):
+        await coordinator._async_update_data()
+    assert len(coordinator.history) == 1
+    await hass.async_block_till_done()
+    assert not events
+    assert "start_combustion" in coordinator._pending_commands
+    await coordinator.async_flush_commands()
+
+
+async def test_failed_polls_refresh_the_circuit_state(coordinator, mock_stove_data):
+    """Test the circuit state is published while polls keep failing."""
+    coordinator.async_track_metrics(("circuit_state",))
+    coordinator._check_maintenance = AsyncMock()
+    coordinator.api.last_unchanged = False
+    coordinator.api.circuit.state = "closed"
+    coordinator.api.get_stove_data = AsyncMock(return_value=_data(mock_stove_data))
+    coordinator.data = await coordinator._async_update_data()
+
+    writes = []
+    remove_listener = coordinator.async_add_error_listener(
+        lambda: writes.append(coordinator.metrics["circuit_state"])
+    )
+    coordinator.api.get_stove_data = AsyncMock(side_effect=CannotConnect("unreachable"))
+    with pytest.raises(UpdateFailed):
+        await coordinator._async_update_data()
+    coordinator.api.circuit.state = "open"
+    with pytest.raises(UpdateFailed):
+        await coordinator._async_update_data()
+    assert writes[-1] == "open"
+    remove_listener()
+
+
+async def test_profiling_conflict_does_not_fail_the_update(coordinator, mock_stove_data):
+    """Test a profiler that cannot start is dropped and the update proceeds."""
+    coordinator._check_maintenance = AsyncMock()
+    coordinator.api.last_unchanged = False
+    coordinator.api.get_stove_data = AsyncMock(return_value=_data(mock_stove_data))
+    coordinator._profiler = Mock(begin=Mock(side_effect=ValueError("already active")))
+
+    assert (await coordinator._async_update_data()).state.phase == 3
+    assert coordinator._profiler is None
+
+
+async def test_tiers_survive_restart(hass, tmp_path, mock_stove_data):
+    """Test aggregated tiers and the daily rollup are restored on reload."""
+
+    def create():
+        stores = {
+            tier: HistoryStore(str(tmp_path / tier), columns, retention=366 * 86400)
+            for tier, columns in (
+                (TIER_5MIN, AGGREGATE_COLUMNS),
+                (TIER_HOUR, AGGREGATE_COLUMNS),
+                (TIER_DAY, DAILY_COLUMNS),
+            )
+        }
+        return HWAMDataCoordinator(
+            hass,
+            Mock(),
+            "Test Stove",
+            store=HistoryStore(str(tmp_path / "raw"), HISTORY_COLUMNS, retention=86400),
+            tier_stores=stores,
+        )
+
+    first = create()
+    await first.async_load_history()
+    start = utcnow() - timedelta(hours=3)
+    for index in range(60):
+        data = _data(mock_stove_data, stove_temperature=20000 + index * 100)
+        sample = first._update_history(data, start + timedelta(minutes=3 * index))
+        await first._async_persist_sample(sample)
+    await first.async_close_history()
+
+    second = create()
+    await second.async_load_history()
+    for tier in (TIER_5MIN, TIER_HOUR, TIER_DAY):
+        expected, restored = first.query_history(tier)[1], second.query_history(tier)[1]
+        assert restored.shape == expected.shape
+        assert np.allclose(restored, expected, equal_nan=True)
+    await second.async_close_history()
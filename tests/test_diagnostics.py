@@ -0,0 +1,31 @@
+"""Test the HWAM diagnostics."""
+import json
+from unittest.mock import AsyncMock, Mock, patch
+
+from custom_components.hwam_stove.api import HWAMApi
+from custom_components.hwam_stove.const import DOMAIN
+from custom_components.hwam_stove.coordinator import HWAMDataCoordinator
+from custom_components.hwam_stove.diagnostics import async_get_config_entry_diagnostics
+
+
+async def test_diagnostics(hass, mock_stove_data):
+    """Test the dump reports counters and redacts the host."""
+    api = HWAMApi("192.168.1.100")
+    coordinator = HWAMDataCoordinator(hass, api, "Test Stove")
+    entry = Mock(entry_id="abc", title="Test Stove", data={"host": "192.168.1.100"}, options={})
+    hass.data[DOMAIN] = {"abc": coordinator}
+
+    body = json.dumps(mock_stove_data).encode()
+    with patch.object(api, "_request_raw", AsyncMock(return_value=body)):
+        await coordinator.async_refresh()
+        await api.get_stove_data()
+
+    diagnostics = await async_get_config_entry_diagnostics(hass, entry)
+    assert diagnostics["entry"]["data"]["host"] == "**REDACTED**"
+    assert diagnostics["history"]["samples"] == 1
+    assert diagnostics["api"]["cache_hit_rate"] == 0.5
+    assert diagnostics["api"]["circuit"]["trips"] == 0
+    assert diagnostics["timings_ms"]["from_dict"]["count"] == 1
+    assert diagnostics["timings_ms"]["history"]["count"] == 1
+    assert diagnostics["last_payload"] == mock_stove_data
+    json.dumps(diagnostics)
@@ -0,0 +1,55 @@
+"""Test the HWAM history decimation and compact encoding."""
+import numpy as np
+
+from custom_components.hwam_stove.downsample import decimate, delta_encode, lttb_indices
+
+
+def test_lttb_keeps_extremes():
+    """Test LTTB keeps the ends and a narrow peak."""
+    x = np.arange(1000, dtype=float)
+    y = np.zeros(1000)
+    y[437] = 300.0
+    y[800] = -50.0
+
+    indices = lttb_indices(x, y, 50)
+    assert len(indices) == 50
+    assert indices[0] == 0 and indices[-1] == 999
+    assert np.all(np.diff(indices) > 0)
+    assert 437 in indices and 800 in indices
+
+    # Moins de points que demandé : tout est conservé
+    assert list(lttb_indices(x[:10], y[:10], 50)) == list(range(10))
+
+
+def test_lttb_missing_values():
+    """Test missing values do not prevent the selection."""
+    x = np.arange(100, dtype=float)
+    y = np.sin(x / 10)
+    y[::7] = np.nan
+
+    indices = lttb_indices(x, y, 20)
+    assert len(indices) == 20
+    assert len(lttb_indices(x, np.full(100, np.nan), 20)) == 20
+
+
+def test_decimate_keeps_columns_aligned():
+    """Test all columns are reduced on the same samples."""
+    columns = ("timestamp", "stove_temp", "room_temp")
+    rows = np.vstack((np.arange(500.0), np.arange(500.0) % 50, np.full(500, 21.0)))
+
+    reduced = decimate(columns, rows, "stove_temp", 40)
+    assert reduced.shape == (3, 40)
+    assert np.array_equal(reduced[1], reduced[0] % 50)
+    assert decimate(columns, rows[:, :10], "stove_temp", 40).shape == (3, 10)
+
+
+def test_delta_encode():
+    """Test the encoding round-trips at the requested precision."""
+    values = np.array([245.37, 246.0, np.nan, 244.5, 244.5])
+    encoded = delta_encode(values, 100)
+    assert encoded == [24537, 63, None, -150, 0]
+
+    decoded = np.cumsum([value for value in encoded if value is not None]) / 100
+    assert list(decoded) == [245.37, 246.0, 244.5, 244.5]
+    assert delta_encode(np.array([np.nan]), 100) == [None]
+    assert delta_encode(np.array([]), 100) == []
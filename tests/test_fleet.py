@@ -0,0 +1,48 @@
+"""Test the HWAM fleet scheduler."""
+import asyncio
+from datetime import timedelta
+from unittest.mock import MagicMock
+
+import pytest
+
+from custom_components.hwam_stove.fleet import HWAMFleet
+
+
+@pytest.mark.asyncio
+async def test_concurrent_polls_are_bounded():
+    """Test that no more than max_concurrent polls run at once."""
+    fleet = HWAMFleet(MagicMock(), max_concurrent=3)
+    running = peak = 0
+
+    async def poll():
+        nonlocal running, peak
+        async with fleet.slot():
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+
+    await asyncio.gather(*(poll() for _ in range(20)))
+    assert peak == 3
+
+
+def test_jittered_interval():
+    """Test intervals are spread around the base interval."""
+    fleet = HWAMFleet(MagicMock(), jitter=0.1)
+    base = timedelta(seconds=30)
+    intervals = {fleet.next_interval(base) for _ in range(50)}
+
+    assert len(intervals) > 1
+    assert all(timedelta(seconds=27) <= value <= timedelta(seconds=33) for value in intervals)
+    assert HWAMFleet(MagicMock(), jitter=0).next_interval(base) == base
+
+
+def test_membership():
+    """Test the fleet reports when its last member leaves."""
+    fleet = HWAMFleet(MagicMock())
+    fleet.register("a")
+    fleet.register("b")
+
+    assert fleet.members == 2
+    assert not fleet.unregister("a")
+    assert fleet.unregister("b")
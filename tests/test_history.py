@@ -0,0 +1,85 @@
+"""Test the HWAM history buffer."""
+import numpy as np
+import pytest
+
+from custom_components.hwam_stove.history import HistoryBuffer, RollingStats
+
+
+def _sample(i):
+    """Build a sample row for index i."""
+    return (1000.0 + i, 200.0 + i, 20.0, 15.0 + i % 3)
+
+
+def test_append_and_window():
+    """Test appending samples and reading windows."""
+    buffer = HistoryBuffer(4)
+    for i in range(3):
+        buffer.append(_sample(i))
+
+    assert len(buffer) == 3
+    assert list(buffer.column("stove_temp")) == [200.0, 201.0, 202.0]
+    assert list(buffer.column("stove_temp", 2)) == [201.0, 202.0]
+    assert buffer.latest("timestamp") == 1002.0
+
+
+def test_wraparound_keeps_latest_contiguous():
+    """Test that windows stay ordered after the buffer wraps."""
+    buffer = HistoryBuffer(4)
+    for i in range(10):
+        buffer.append(_sample(i))
+
+    assert len(buffer) == 4
+    assert list(buffer.column("timestamp")) == [1006.0, 1007.0, 1008.0, 1009.0]
+    assert buffer.window().shape == (4, 4)
+
+
+def test_views_are_zero_copy_and_read_only():
+    """Test that readers get read-only views on the storage."""
+    buffer = HistoryBuffer(4)
+    for i in range(6):
+        buffer.append(_sample(i))
+
+    view = buffer.column("stove_temp")
+    assert np.shares_memory(view, buffer.window())
+    with pytest.raises(ValueError):
+        view[0] = 0.0
+
+
+def test_count_since_and_extend():
+    """Test time-based counting and bulk loading."""
+    buffer = HistoryBuffer(5)
+    buffer.extend([_sample(i) for i in range(8)])
+
+    assert len(buffer) == 5
+    assert buffer.count_since(1006.0) == 2
+    assert buffer.count_since(0.0) == 5
+
+    buffer.clear()
+    assert len(buffer) == 0
+    assert buffer.latest("stove_temp") is None
+
+
+def test_rolling_stats_window():
+    """Test rolling min/max/mean with expiry."""
+    stats = RollingStats(window=10.0)
+    assert stats.min is None and stats.mean is None
+
+    for ts, value in ((0, 5.0), (4, 9.0), (8, 1.0), (12, 3.0)):
+        stats.add(ts, value)
+
+    # L'échantillon à t=0 est sorti de la fenêtre [2, 12]
+    assert len(stats) == 3
+    assert stats.min == 1.0
+    assert stats.max == 9.0
+    assert stats.mean == pytest.approx(13.0 / 3)
+
+    stats.add(20, 4.0)
+    assert stats.min == 3.0
+    assert stats.max == 4.0
+
+
+def test_rolling_stats_ignores_nan():
+    """Test that missing values are skipped."""
+    stats = RollingStats(window=10.0)
+    stats.add(0, float("nan"))
+    assert len(stats) == 0
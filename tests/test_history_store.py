@@ -0,0 +1,97 @@
+"""Test the HWAM persistent history store."""
+import struct
+import time
+
+import numpy as np
+
+from custom_components.hwam_stove.history import HISTORY_COLUMNS
+from custom_components.hwam_stove.history_store import HistoryStore
+
+
+def _store(path, **kwargs):
+    """Create a store with a one day retention."""
+    return HistoryStore(str(path), HISTORY_COLUMNS, retention=86400, **kwargs)
+
+
+def test_append_and_reload(tmp_path):
+    """Test samples survive a reload."""
+    path = tmp_path / "history"
+    now = time.time()
+    store = _store(path)
+    assert store.load().shape == (0, 4)
+
+    store.append((now - 60, 245.5, 21.0, 12.0))
+    store.append(np.array([[now, 240.0, 21.5, 13.0]]))
+    store.close()
+
+    rows = _store(path).load()
+    assert rows.shape == (2, 4)
+    assert rows[0, 0] == now - 60
+    assert list(rows[:, 1]) == [245.5, 240.0]
+    assert path.stat().st_size == len(_store(path)._header()) + 2 * 20
+
+
+def test_expired_samples_are_dropped(tmp_path):
+    """Test retention on load and compaction."""
+    path = tmp_path / "history"
+    now = time.time()
+    store = _store(path, compact_every=3)
+    store.load()
+    store.append((now - 90000, 100.0, 20.0, 10.0))
+    store.append((now - 10, 110.0, 20.0, 10.0))
+    size_before = path.stat().st_size
+    store.append((now, 120.0, 20.0, 10.0))  # Déclenche la compaction
+
+    assert path.stat().st_size < size_before + store.record_size
+    rows = _store(path).load()
+    assert list(rows[:, 1]) == [110.0, 120.0]
+
+    # Redémarrages avant la compaction périodique : le chargement réécrit
+    store = _store(path)
+    store.load()
+    store.append((now - 90000, 100.0, 20.0, 10.0))
+    store.close()
+    assert _store(path).load().shape == (2, 4)
+    assert path.stat().st_size == len(store._header()) + 2 * store.record_size
+
+
+def test_torn_and_foreign_files_are_rewritten(tmp_path):
+    """Test recovery from a partial record or an unknown file."""
+    path = tmp_path / "history"
+    now = time.time()
+    store = _store(path)
+    store.load()
+    store.append((now, 200.0, 20.0, 10.0))
+    store.close()
+    with open(path, "ab") as file:
+        file.write(b"\x01\x02\x03")
+
+    store = _store(path)
+    assert store.load().shape == (1, 4)
+    store.append((now + 1, 201.0, 20.0, 10.0))
+    store.close()
+    assert list(_store(path).load()[:, 1]) == [200.0, 201.0]
+
+    path.write_bytes(b"not a history file")
+    assert _store(path).load().shape == (0, 4)
+
+    # En-tête sans colonne ou annonçant plus de colonnes que le fichier
+    for count in (0, 40):
+        path.write_bytes(struct.pack("<8sHH4x", b"HWAMHIST", 1, count))
+        assert _store(path).load().shape == (0, 4)
+        assert _store(path).load().shape == (0, 4)
+
+
+def test_column_mapping(tmp_path):
+    """Test loading a file written with fewer columns."""
+    path = tmp_path / "history"
+    now = time.time()
+    old = HistoryStore(str(path), HISTORY_COLUMNS[:2], retention=86400)
+    old.load()
+    old.append((now, 180.0))
+    old.close()
+
+    rows = _store(path).load()
+    assert rows.shape == (1, 4)
+    assert rows[0, 1] == 180.0
+    assert np.isnan(rows[0, 3])
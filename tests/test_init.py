@@ -0,0 +1,64 @@
+"""Test the HWAM integration services."""
+from unittest.mock import AsyncMock, Mock, patch
+
+import numpy as np
+
+import pytest
+
+from homeassistant.exceptions import HomeAssistantError
+
+from custom_components.hwam_stove import async_reload_entry, async_setup
+from custom_components.hwam_stove.const import DOMAIN, SERVICE_GET_HISTORY, SERVICE_PROFILE
+
+
+async def test_profile_service(hass):
+    """Test the profile service is shared by every stove."""
+    assert await async_setup(hass, {})
+    first, second = Mock(), Mock()
+
+    hass.data[DOMAIN]["first"] = first
+    await hass.services.async_call(DOMAIN, SERVICE_PROFILE, {"cycles": 2}, blocking=True)
+    first.async_start_profiling.assert_called_once_with(2)
+
+    # Plusieurs poêles : l'entrée doit être précisée
+    hass.data[DOMAIN]["second"] = second
+    with pytest.raises(HomeAssistantError):
+        await hass.services.async_call(DOMAIN, SERVICE_PROFILE, {}, blocking=True)
+    await hass.services.async_call(
+        DOMAIN, SERVICE_PROFILE, {"entry_id": "second"}, blocking=True
+    )
+    second.async_start_profiling.assert_called_once_with(3)
+    with pytest.raises(HomeAssistantError):
+        await hass.services.async_call(
+            DOMAIN, SERVICE_PROFILE, {"entry_id": "unknown"}, blocking=True
+        )
+
+
+async def test_get_history_service(hass):
+    """Test the history service reads the single configured stove."""
+    assert await async_setup(hass, {})
+    coordinator = Mock()
+    coordinator.query_history.return_value = (
+        ("timestamp", "stove_temp"),
+        np.array([[0.0, 60.0], [200.0, np.nan]]),
+    )
+    hass.data[DOMAIN]["first"] = coordinator
+
+    response = await hass.services.async_call(
+        DOMAIN, SERVICE_GET_HISTORY, {"tier": "raw"}, blocking=True, return_response=True
+    )
+    assert response == {
+        "tier": "raw",
+        "columns": {"timestamp": [0.0, 60.0], "stove_temp": [200.0, None]},
+    }
+    coordinator.query_history.assert_called_once_with("raw", None, None)
+
+
+async def test_options_update_reloads_through_config_entries(hass):
+    """Test an options change reloads the entry through the state machine."""
+    entry = Mock(entry_id="first")
+    with patch.object(
+        hass.config_entries, "async_reload", AsyncMock(return_value=True)
+    ) as reload:
+        await async_reload_entry(hass, entry)
+    reload.assert_awaited_once_with("first")
@@ -0,0 +1,66 @@
+"""Test the HWAM derived metrics registry."""
+from unittest.mock import Mock
+
+import pytest
+
+from custom_components.hwam_stove.metrics import DerivedMetric, MetricsRegistry
+
+
+def test_only_requested_metrics_and_dependencies_are_evaluated():
+    """Test lazy evaluation with declared dependencies."""
+    calls = []
+
+    def metric(key, value, depends_on=()):
+        def compute(coordinator, data, values):
+            calls.append(key)
+            return value(values)
+        return DerivedMetric(key=key, compute=compute, depends_on=depends_on)
+
+    registry = MetricsRegistry((
+        metric("base", lambda values: 2),
+        metric("double", lambda values: values["base"] * 2, ("base",)),
+        metric("unused", lambda values: 0),
+    ))
+
+    snapshot = registry.evaluate(Mock(), Mock(), ["double"])
+    assert dict(snapshot) == {"base": 2, "double": 4}
+    assert calls == ["base", "double"]
+
+    with pytest.raises(TypeError):
+        snapshot["base"] = 3
+
+
+def test_existing_values_are_reused_and_errors_isolated():
+    """Test incremental evaluation and failing metrics."""
+    registry = MetricsRegistry((
+        DerivedMetric(key="ok", compute=lambda c, d, v: 1),
+        DerivedMetric(key="broken", compute=lambda c, d, v: 1 / 0),
+    ))
+
+    first = registry.evaluate(Mock(), Mock(), ["ok"])
+    second = registry.evaluate(Mock(), Mock(), ["broken"], first)
+    assert dict(second) == {"ok": 1, "broken": None}
+
+
+def test_cycles_are_rejected():
+    """Test that circular dependencies are detected."""
+    registry = MetricsRegistry((
+        DerivedMetric(key="a", compute=lambda c, d, v: 1, depends_on=("b",)),
+        DerivedMetric(key="b", compute=lambda c, d, v: 1, depends_on=("a",)),
+    ))
+    with pytest.raises(ValueError):
+        registry.plan(["a"])
+
+
+def test_refresh_live_only_recomputes_live_metrics():
+    """Test live metrics are refreshed and the others reused."""
+    counter = iter(range(10))
+    registry = MetricsRegistry((
+        DerivedMetric(key="slow", compute=lambda c, d, v: next(counter)),
+        DerivedMetric(key="latency", compute=lambda c, d, v: next(counter), live=True),
+    ))
+
+    first = registry.evaluate(Mock(), Mock(), ["slow", "latency"])
+    second = registry.refresh_live(Mock(), Mock(), ["slow", "latency"], first)
+    assert dict(first) == {"latency": 0, "slow": 1}
+    assert dict(second) == {"latency": 2, "slow": 1}
@@ -1,6 +1,6 @@
 """Test the HWAM models."""
 import pytest
-from datetime import datetime
+from datetime import datetime, time
 
 from custom_components.hwam_stove.models import StoveData
 
@@ -15,16 +15,70 @@ def test_stove_data_creation(mock_stove_data):
     assert data.state.operation_mode == 2
     assert not data.state.door_open
 
-def test_stove_data_validation():
+def test_stove_data_validation(mock_stove_data):
     """Test StoveData validation."""
     invalid_data = mock_stove_data.copy()
     invalid_data["stove_temperature"] = 90000  # 900°C
     
     with pytest.raises(ValueError):
-        StoveData.from_dict(invalid_data)
+        StoveData.from_dict(invalid_data, strict=True)
 
-def test_alarm_state():
+def test_fast_and_strict_decoding_match(mock_stove_data):
+    """Test that the fast path builds the same data as the strict one."""
+    fast = StoveData.from_dict(mock_stove_data)
+    strict = StoveData.from_dict(mock_stove_data, strict=True)
+    assert fast == strict
+    assert fast.firmware_version == "1.0.0"
+    assert fast.service_date.isoformat() == "2024-01-15"
+    assert fast.time_since_remote_msg.total_seconds() == 300
+
+    # Les sous-modèles quasi statiques sont partagés entre les décodages
+    assert StoveData.from_dict(mock_stove_data).state is fast.state
+    # Immuables : TypeError avec pydantic 1, ValidationError avec pydantic 2
+    with pytest.raises((TypeError, ValueError)):
+        fast.state.burn_level = 5
+    assert StoveData.from_dict(mock_stove_data).state.burn_level == 2
+
+def test_fast_decoding_checks_bounds(mock_stove_data):
+    """Test out-of-range enumerated fields are rejected without strict parsing."""
+    for field, value in (("phase", 9), ("burn_level", 6), ("safety_alarms", -1)):
+        with pytest.raises(ValueError):
+            StoveData.from_dict({**mock_stove_data, field: value})
+    with pytest.raises(ValueError):
+        StoveData.from_dict(mock_stove_data).updated({"state.burn_level": 7})
+
+def test_missing_field(mock_stove_data):
+    """Test that a missing field is reported."""
+    del mock_stove_data["phase"]
+    with pytest.raises(ValueError):
+        StoveData.from_dict(mock_stove_data)
+
+def test_alarm_state(mock_stove_data):
     """Test alarm state handling."""
     data = StoveData.from_dict(mock_stove_data)
     assert not data.alarms.has_alarms()
     assert len(data.alarms.get_active_alarms()) == 0
+
+def test_diff(mock_stove_data):
+    """Test field-level change detection between snapshots."""
+    previous = StoveData.from_dict(mock_stove_data)
+    same = StoveData.from_dict(mock_stove_data)
+    changed = StoveData.from_dict({**mock_stove_data, "phase": 4, "valve1_position": 10})
+
+    assert same.diff(previous) == frozenset()
+    assert changed.diff(previous) == {"state", "state.phase", "valve1_position"}
+    assert {"state.door_open", "temperatures", "valve3_position"} <= changed.diff(None)
+
+def test_updated(mock_stove_data):
+    """Test optimistic copies only change the requested fields."""
+    data = StoveData.from_dict(mock_stove_data)
+    optimistic = data.updated({"state.burn_level": 5})
+
+    assert optimistic.state.burn_level == 5
+    assert data.state.burn_level == 2
+    assert optimistic.diff(data) == {"state", "state.burn_level"}
+
+    night = data.updated({"night_begin_time": time(21, 0), "alarms.refill_alarm": True})
+    assert night.field("night_begin_time") == time(21, 0)
+    assert night.field("alarms.refill_alarm")
+    assert night.diff(data) == {"night_begin_time", "alarms", "alarms.refill_alarm"}
@@ -0,0 +1,57 @@
+"""Test the HWAM incremental estimators."""
+import numpy as np
+import pytest
+
+from custom_components.hwam_stove.prediction import OnlineLinearRegression
+
+
+def test_matches_least_squares_without_forgetting():
+    """Test the online fit against a batch least-squares fit."""
+    rng = np.random.default_rng(1)
+    times = np.cumsum(rng.uniform(20, 40, size=200)) + 1.7e9
+    temps = 400 - 0.05 * (times - times[0]) + rng.normal(0, 2, size=200)
+
+    regression = OnlineLinearRegression()
+    for timestamp, temp in zip(times, temps):
+        regression.add(timestamp, temp)
+
+    slope, intercept = np.polyfit(times - times[-1], temps, 1)
+    assert len(regression) == 200
+    assert regression.slope == pytest.approx(slope, rel=1e-6)
+    assert regression.value == pytest.approx(intercept, rel=1e-6)
+
+
+def test_refill_eta_is_independent_of_cadence():
+    """Test that the ETA uses real timestamps, not sample counts."""
+    for period in (10, 30, 300):
+        regression = OnlineLinearRegression(half_life=1800)
+        for step in range(50):
+            timestamp = step * period
+            regression.add(timestamp, 300 - 0.01 * timestamp)
+
+        last = 300 - 0.01 * 49 * period
+        assert regression.time_to_reach(100) == pytest.approx((last - 100) / 0.01)
+
+
+def test_forgetting_follows_recent_trend():
+    """Test that old samples lose weight with the half-life."""
+    regression = OnlineLinearRegression(half_life=60)
+    for timestamp in range(0, 3600, 30):
+        regression.add(timestamp, 200 + 0.1 * timestamp)
+    for timestamp in range(3600, 4800, 30):
+        regression.add(timestamp, 560 - 0.2 * (timestamp - 3600))
+
+    assert regression.slope == pytest.approx(-0.2, rel=1e-3)
+
+
+def test_no_prediction_when_rising_or_degenerate():
+    """Test the cases where no ETA is available."""
+    regression = OnlineLinearRegression()
+    assert regression.slope is None
+    regression.add(0, 200)
+    regression.add(0, 210)
+    assert regression.slope is None
+
+    regression.add(30, 220)
+    assert regression.time_to_reach(100) is None
+    assert regression.time_to_reach(300) == 0.0
@@ -0,0 +1,59 @@
+"""Test the HWAM cycle profiler."""
+import time
+from unittest.mock import patch
+
+import pytest
+
+from custom_components.hwam_stove.profiler import CycleProfiler
+
+
+def _busy_cycle():
+    """Burn CPU for a few sampling intervals."""
+    deadline = time.perf_counter() + 0.05
+    while time.perf_counter() < deadline:
+        sum(range(100))
+
+
+def test_profiles_requested_cycles(tmp_path):
+    """Test only the requested cycles are profiled and both files are written."""
+    profiler = CycleProfiler(2, sample_interval=0.001)
+    for _ in range(3):
+        profiler.begin()
+        _busy_cycle()
+        profiler.end()
+    assert profiler.done
+    assert not profiler.running
+
+    report, stacks = tmp_path / "profile.txt", tmp_path / "profile.collapsed"
+    profiler.write(str(report), str(stacks))
+
+    assert report.read_text().startswith("2 cycle(s)")
+    assert "_busy_cycle" in report.read_text()
+    lines = stacks.read_text().splitlines()
+    assert lines
+    stack, count = lines[0].rsplit(" ", 1)
+    assert int(count) > 0
+    assert any("test_profiler._busy_cycle" in line for line in lines)
+
+
+def test_cancel():
+    """Test a cancelled profiler stops at once."""
+    profiler = CycleProfiler(5)
+    profiler.begin()
+    profiler.cancel()
+    assert profiler.done
+    assert not profiler.running
+    profiler.begin()
+    assert not profiler.running
+
+
+def test_other_profiler_active():
+    """Test profiling is abandoned when another profiler is active."""
+    profiler = CycleProfiler(3)
+    with patch.object(
+        profiler._profile, "enable", side_effect=ValueError("Another profiling tool is already active")
+    ):
+        with pytest.raises(ValueError):
+            profiler.begin()
+    assert profiler.done
+    assert not profiler.running
@@ -0,0 +1,89 @@
+"""Test the HWAM request scheduler."""
+import asyncio
+
+import pytest
+
+from custom_components.hwam_stove.scheduler import (
+    PRIORITY_COMMAND,
+    PRIORITY_POLL,
+    RequestScheduler,
+)
+
+
+@pytest.mark.asyncio
+async def test_single_request_in_flight():
+    """Test requests never overlap."""
+    scheduler = RequestScheduler()
+    running = peak = 0
+
+    async def request(value):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+        return value
+
+    results = await asyncio.gather(
+        *(scheduler.submit(lambda value=value: request(value)) for value in range(5))
+    )
+    assert results == [0, 1, 2, 3, 4]
+    assert peak == 1
+    assert scheduler.max_depth == 4
+    assert scheduler.last_wait > 0
+
+
+@pytest.mark.asyncio
+async def test_commands_preempt_polls_and_polls_are_shared():
+    """Test queued commands run first and duplicate polls share one request."""
+    scheduler = RequestScheduler()
+    order = []
+    release = asyncio.Event()
+
+    async def request(name):
+        order.append(name)
+        if name == "first":
+            await release.wait()
+        return name
+
+    first = asyncio.ensure_future(scheduler.submit(lambda: request("first")))
+    await asyncio.sleep(0)
+    polls = [
+        asyncio.ensure_future(
+            scheduler.submit(lambda: request("poll"), PRIORITY_POLL, key="/get_stove_data")
+        )
+        for _ in range(3)
+    ]
+    command = asyncio.ensure_future(
+        scheduler.submit(lambda: request("command"), PRIORITY_COMMAND)
+    )
+    await asyncio.sleep(0)
+    assert scheduler.depth == 2
+
+    release.set()
+    assert await asyncio.gather(first, command, *polls) == [
+        "first", "command", "poll", "poll", "poll"
+    ]
+    assert order == ["first", "command", "poll"]
+    assert (scheduler.dropped, scheduler.preempted) == (2, 1)
+
+
+@pytest.mark.asyncio
+async def test_errors_reach_every_caller():
+    """Test a failed request raises for its callers and the queue moves on."""
+    scheduler = RequestScheduler()
+
+    async def fail():
+        raise ValueError("boom")
+
+    async def succeed():
+        return "ok"
+
+    failed = asyncio.ensure_future(scheduler.submit(fail, PRIORITY_POLL, key="poll"))
+    shared = asyncio.ensure_future(scheduler.submit(fail, PRIORITY_POLL, key="poll"))
+    with pytest.raises(ValueError):
+        await failed
+    with pytest.raises(ValueError):
+        await shared
+    assert await scheduler.submit(succeed) == "ok"
+    assert not scheduler.busy
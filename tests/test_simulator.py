@@ -0,0 +1,105 @@
+"""Test the simulated HWAM stove server."""
+import aiohttp
+import pytest
+
+from custom_components.hwam_stove.api import HWAMApi
+from custom_components.hwam_stove.models import StoveData
+from simulator.server import FaultProfile, StoveSimulator
+from simulator.stove import PHASE_BURNING, PHASE_STANDBY, VirtualStove
+
+
+def test_burn_cycle():
+    """Test a full cycle from ignition back to standby."""
+    stove = VirtualStove(stove_id=0, seed=1)
+    stove.start()
+
+    phases = []
+    peak = 0.0
+    for _ in range(12 * 60):  # 12 heures par pas d'une minute
+        stove.advance(60)
+        peak = max(peak, stove.stove_temperature)
+        if not phases or phases[-1] != stove.phase:
+            phases.append(stove.phase)
+
+    assert phases == [1, 2, PHASE_BURNING, 4, PHASE_STANDBY]
+    assert 250 < peak < 790
+    assert stove.wood == 0.0
+
+
+def test_payload_decodes():
+    """Test the payload matches what the integration parses."""
+    stove = VirtualStove(stove_id=0)
+    stove.start()
+    stove.advance(1800)
+    stove.set_burn_level(4)
+
+    data = StoveData.from_dict(stove.payload(), strict=True)
+    assert data.state.burn_level == 4
+    assert data.temperatures.stove_temperature == pytest.approx(
+        stove.stove_temperature, abs=0.01
+    )
+
+    with pytest.raises(ValueError):
+        stove.set_burn_level(6)
+
+
+@pytest.mark.asyncio
+async def test_server_hosts_many_stoves(socket_enabled):
+    """Test commands reach the addressed stove only."""
+    # Serveur local uniquement : le plugin Home Assistant bloque les sockets
+    simulator = StoveSimulator(count=3, host="127.0.0.1", speed=60, seed=1)
+    await simulator.start()
+    try:
+        first, second, _ = (f"http://127.0.0.1:{port}" for port in simulator.ports)
+        async with aiohttp.ClientSession() as session:
+            async with session.post(
+                f"{second}/set_burn_level", json={"level": 5}
+            ) as response:
+                assert (await response.json())["response"] == "OK"
+            async with session.get(f"{second}/get_stove_data") as response:
+                assert StoveData.from_dict(await response.json()).state.burn_level == 5
+            async with session.get(f"{first}/get_stove_data") as response:
+                assert StoveData.from_dict(await response.json()).state.burn_level == 2
+    finally:
+        await simulator.stop()
+
+
+@pytest.mark.asyncio
+async def test_fault_injection(socket_enabled):
+    """Test dropped and malformed responses."""
+    simulator = StoveSimulator(host="127.0.0.1", faults=FaultProfile(loss=1.0), seed=1)
+    await simulator.start()
+    url = f"http://127.0.0.1:{simulator.ports[0]}/get_stove_data"
+    try:
+        async with aiohttp.ClientSession() as session:
+            with pytest.raises(aiohttp.ClientError):
+                async with session.get(url) as response:
+                    await response.read()
+
+            simulator.faults = FaultProfile(malformed=1.0)
+            for _ in range(4):
+                async with session.get(url) as response:
+                    with pytest.raises(ValueError):
+                        StoveData.from_dict(await response.json(content_type=None))
+    finally:
+        await simulator.stop()
+
+
+@pytest.mark.asyncio
+async def test_switch_commands(socket_enabled):
+    """Test the switch commands of the API change the simulated stove."""
+    simulator = StoveSimulator(host="127.0.0.1", seed=1)
+    await simulator.start()
+    simulator.stoves[0].set_night_time((0, 0), (23, 59))
+    api = HWAMApi(f"127.0.0.1:{simulator.ports[0]}")
+    try:
+        assert (await api.get_stove_data()).state.night_lowering
+        assert await api.set_night_lowering(False)
+        assert await api.set_remote_refill_alarm(True)
+
+        data = await api.get_stove_data(max_age=0, allow_stale=False)
+        assert not data.state.night_lowering
+        assert data.alarms.remote_refill_alarm
+    finally:
+        await api.close()
+        await simulator.stop()
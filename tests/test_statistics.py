@@ -0,0 +1,60 @@
+"""Test the HWAM hourly statistics."""
+from unittest.mock import Mock
+
+import pytest
+
+from custom_components.hwam_stove.statistics import PeriodAggregator, StatisticsRecorder
+
+HOUR = 3600.0
+
+
+def test_hourly_aggregates():
+    """Test samples are aggregated per hour and closed on the next hour."""
+    aggregator = PeriodAggregator(HOUR)
+    for minute, value in ((0, 200.0), (20, 260.0), (40, float("nan")), (59, 230.0)):
+        aggregator.add(10 * HOUR + minute * 60, value)
+    assert len(aggregator) == 0
+
+    aggregator.add(11 * HOUR + 5, 100.0)
+    aggregator.add(10 * HOUR + 5, 999.0)  # Hors séquence, ignoré
+    (aggregate,) = aggregator.pop()
+    assert aggregate.start == 10 * HOUR
+    assert (aggregate.count, aggregate.min, aggregate.max) == (3, 200.0, 260.0)
+    assert aggregate.mean == pytest.approx(230.0)
+
+    aggregator.close(11 * HOUR + 60)
+    assert len(aggregator) == 0
+    aggregator.close(12 * HOUR)
+    assert [aggregate.mean for aggregate in aggregator.pop()] == [100.0]
+
+
+def test_pending_without_recorder_is_bounded():
+    """Test aggregates wait for the recorder, within the pending limit."""
+    hass = Mock()
+    hass.config.components = set()
+    recorder = StatisticsRecorder("abc", "Test Stove")
+    assert recorder.statistic_id("oxygen") == "hwam_stove:abc_oxygen"
+
+    rows = [(hour * HOUR, 200.0, 20.0, 12.0) for hour in range(100)]
+    recorder.backfill(rows, ("timestamp", "stove_temp", "room_temp", "oxygen"))
+    recorder.add(100 * HOUR, {"burn_level": 3})
+
+    assert recorder.async_import(hass, 100 * HOUR) == 0
+    assert recorder.pending == 3 * 48
+
+
+def test_backfill_skips_partial_first_hour():
+    """Test the first stored hour, cut by the retention, is not reimported."""
+    hass = Mock()
+    hass.config.components = set()
+    recorder = StatisticsRecorder("abc", "Test Stove")
+    columns = ("timestamp", "stove_temp", "room_temp", "oxygen")
+
+    rows = [(10 * HOUR + minute * 60, 100.0 + minute, 20.0, 12.0) for minute in range(45, 180)]
+    recorder.backfill(rows, columns)
+    recorder.async_import(hass, 13 * HOUR)
+
+    (aggregate, last) = recorder._aggregators["stove_temp"].pop()
+    assert aggregate.start == 11 * HOUR
+    assert aggregate.count == 60
+    assert last.start == 12 * HOUR
@@ -0,0 +1,42 @@
+"""Test the HWAM switches."""
+from datetime import timedelta
+from unittest.mock import AsyncMock, patch
+
+from custom_components.hwam_stove.api import HWAMApi
+from custom_components.hwam_stove.const import ENDPOINT_SET_NIGHT_LOWERING
+from custom_components.hwam_stove.coordinator import HWAMDataCoordinator
+from custom_components.hwam_stove.models import StoveData
+from custom_components.hwam_stove.switch import SWITCH_TYPES, HWAMSwitch
+
+
+def _switch(coordinator, key):
+    """Create the switch with the given key."""
+    description = next(item for item in SWITCH_TYPES if item.key == key)
+    return HWAMSwitch(coordinator, "abc", description, f"abc_{key}")
+
+
+async def test_switch_commands(hass, mock_stove_data):
+    """Test toggling a switch sends the command and shows the expected state."""
+    api = HWAMApi("192.168.1.100")
+    coordinator = HWAMDataCoordinator(
+        hass, api, "Test Stove", update_interval=timedelta(seconds=30)
+    )
+    coordinator.data = StoveData.from_dict(mock_stove_data)
+    coordinator._schedule_verification = lambda: None
+
+    night_mode = _switch(coordinator, "night_mode")
+    refill_alarm = _switch(coordinator, "remote_refill_alarm")
+    assert night_mode.is_on is False
+
+    with patch.object(api, "_request", AsyncMock(return_value={"response": "OK"})) as request:
+        await night_mode.async_turn_on()
+        await refill_alarm.async_turn_on()
+        await refill_alarm.async_turn_off()
+
+    assert request.await_args_list[0].args == ("POST", ENDPOINT_SET_NIGHT_LOWERING)
+    assert request.await_args_list[0].kwargs == {"data": {"value": 1}}
+    assert request.await_args_list[2].kwargs == {"data": {"value": 0}}
+    assert night_mode.is_on is True
+    assert refill_alarm.is_on is False
+    assert set(coordinator._pending_commands) == {"night_mode", "remote_refill_alarm"}
+    await coordinator.async_flush_commands()
@@ -0,0 +1,110 @@
+"""Test the HWAM multi-resolution history tiers."""
+import math
+
+import numpy as np
+import pytest
+
+from custom_components.hwam_stove.history import HistoryBuffer
+from custom_components.hwam_stove.tiers import AggregateTier, DailyRollup, to_columns
+
+DAY = 86400.0
+
+
+def test_aggregate_tier():
+    """Test periods are aggregated incrementally and bounded."""
+    tier = AggregateTier(300, capacity=3)
+    for index in range(20):
+        tier.add((index * 100.0, 200.0 + index, 20.0, float("nan")))
+
+    # 7 périodes de 5 minutes, les 3 dernières terminées sont conservées
+    assert len(tier.buffer) == 3
+    assert list(tier.buffer.column("timestamp")) == [900.0, 1200.0, 1500.0]
+    assert tier.buffer.column("stove_temp_mean")[-1] == pytest.approx(216.0)
+    assert math.isnan(tier.buffer.column("oxygen_mean")[-1])
+
+    rows = tier.query(1200.0)
+    assert list(rows[0]) == [1200.0, 1500.0, 1800.0]
+    assert rows[tier.columns.index("stove_temp_max"), -1] == 219.0
+    assert tier.query(1200.0, 1800.0).shape[1] == 2
+
+
+def test_daily_rollup():
+    """Test burn hours and time per phase over a day change."""
+    rollup = DailyRollup(capacity=7, max_gap=3600.0)
+    timestamp = DAY - 3600.0
+    for phase, active, temp in ((3, True, 300.0), (3, True, 250.0), (4, False, 150.0)):
+        rollup.add(timestamp, temp, phase, active)
+        timestamp += 1800.0
+    # Interruption de l'interrogation : limitée à max_gap
+    rollup.add(timestamp + 7200.0, 100.0, 5, False)
+
+    (day,) = rollup.buffer.window().T
+    row = dict(zip(rollup.columns, day))
+    assert row["timestamp"] == 0.0
+    assert row["burn_hours"] == pytest.approx(1.0)
+    assert row["phase_3_hours"] == pytest.approx(1.0)
+    assert row["stove_temp_max"] == 300.0
+
+    current = dict(zip(rollup.columns, rollup.current()))
+    assert current["timestamp"] == DAY
+    assert current["phase_4_hours"] == pytest.approx(1.0)
+    assert current["stove_temp_mean"] == pytest.approx(125.0)
+
+
+def test_between_and_to_columns():
+    """Test range views and their JSON conversion."""
+    buffer = HistoryBuffer(4)
+    for index in range(6):
+        buffer.append((float(index), 200.0, float("nan"), 12.0))
+
+    assert list(buffer.between(3.0, 5.0)[0]) == [3.0, 4.0]
+    assert buffer.between(10.0).shape[1] == 0
+    columns = to_columns(buffer.columns, buffer.between(4.0))
+    assert columns["timestamp"] == [4.0, 5.0]
+    assert columns["room_temp"] == [None, None]
+
+
+def test_aggregate_tier_restore():
+    """Test restored periods are not aggregated again from replayed samples."""
+    tier = AggregateTier(300, capacity=10)
+    closed = [tier.add((index * 100.0, 200.0 + index, 20.0, 15.0)) for index in range(10)]
+    rows = [row for row in closed if row is not None]
+    assert [row[0] for row in rows] == [0.0, 300.0, 600.0]
+
+    restored = AggregateTier(300, capacity=10)
+    restored.restore(np.array(rows))
+    # Les échantillons rejoués des périodes restaurées sont ignorés
+    for index in range(10):
+        restored.add((index * 100.0, 200.0 + index, 20.0, 15.0))
+    assert np.array_equal(restored.query(), tier.query())
+
+
+def test_daily_rollup_restore():
+    """Test closed days and the current day checkpoint are restored."""
+    rollup = DailyRollup(capacity=7, max_gap=3600.0)
+    closed = [
+        rollup.add(timestamp, 200.0, 3, True)
+        for timestamp in (DAY - 1800.0, DAY, DAY + 1800.0)
+    ]
+    assert [row[0] for row in closed if row is not None] == [0.0]
+    checkpoint = rollup.current()
+
+    restored = DailyRollup(capacity=7, max_gap=3600.0)
+    rows = np.array([closed[1], checkpoint, checkpoint])
+    restored.restore(rows, now=DAY + 3600.0)
+    assert len(restored.buffer) == 1
+    assert restored.current() == pytest.approx(checkpoint)
+    # Échantillons antérieurs ignorés, l'arrêt n'est attribué à aucune phase
+    assert restored.add(DAY - 600.0, 500.0, 3, True) is None
+    restored.add(DAY + 7200.0, 100.0, 3, True)
+    current = dict(zip(restored.columns, restored.current()))
+    assert current["burn_hours"] == pytest.approx(0.5)
+    assert current["stove_temp_mean"] == pytest.approx(500.0 / 3)
+    assert current["samples"] == 3
+
+    # Jour en cours non sauvegardé : il recommence, les jours restaurés sont ignorés
+    restored = DailyRollup(capacity=7, max_gap=3600.0)
+    restored.restore(rows, now=3 * DAY)
+    assert len(restored.buffer) == 2
+    assert restored.add(DAY + 3600.0, 200.0, 3, True) is None
+    assert restored.current() is None
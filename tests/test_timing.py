@@ -0,0 +1,46 @@
+"""Test the HWAM stage timing histograms."""
+import pytest
+
+from custom_components.hwam_stove.timing import LatencyHistogram, StageTimings
+
+
+def test_percentiles():
+    """Test percentiles fall within the bucket precision."""
+    histogram = LatencyHistogram(window=10_000)
+    for index in range(1, 1001):
+        histogram.add(index / 1000)
+
+    assert histogram.percentile(50) == pytest.approx(0.5, rel=0.15)
+    assert histogram.percentile(95) == pytest.approx(0.95, rel=0.15)
+    assert histogram.percentile(99) == pytest.approx(0.99, rel=0.15)
+    assert histogram.last == 1.0
+    assert LatencyHistogram().percentile(50) is None
+
+
+def test_window_favours_recent_durations():
+    """Test older durations fade out once the window is full."""
+    histogram = LatencyHistogram(window=100)
+    for _ in range(100):
+        histogram.add(0.001)
+    for _ in range(200):
+        histogram.add(0.1)
+
+    assert len(histogram) < 100
+    assert histogram.total == 300
+    assert histogram.percentile(50) == pytest.approx(0.1, rel=0.15)
+
+
+def test_stage_summary():
+    """Test measured stages are summarised in milliseconds."""
+    timings = StageTimings(("decode",))
+    assert timings.summary("decode") is None
+
+    with pytest.raises(ValueError):
+        with timings.measure("decode"):
+            raise ValueError
+    timings.record("decode", 0.002)
+
+    summary = timings.summary("decode")
+    assert summary["count"] == 2
+    assert summary["last"] == 2.0
+    assert set(summary) == {"p50", "p95", "p99", "last", "count"}
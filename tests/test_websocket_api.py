@@ -0,0 +1,35 @@
+"""Test the HWAM websocket commands."""
+import numpy as np
+
+from custom_components.hwam_stove.api import HWAMApi
+from custom_components.hwam_stove.coordinator import HWAMDataCoordinator
+from custom_components.hwam_stove.websocket_api import history_response
+
+
+async def test_history_response(hass):
+    """Test the history is decimated, filtered and delta encoded."""
+    coordinator = HWAMDataCoordinator(hass, HWAMApi("192.168.1.100"), "Test Stove")
+    timestamps = 1_000_000.0 + np.arange(288) * 300
+    coordinator.history.extend(
+        np.column_stack((timestamps, 200 + timestamps % 7, np.full(288, 21.5), np.full(288, 12.0)))
+    )
+
+    result = history_response(
+        coordinator, "auto", timestamps[0], None, columns=["stove_temp"], points=50, now=timestamps[-1]
+    )
+    assert result["resolution"] == "raw"
+    assert result["count"] == 50
+    assert result["total"] == 288
+    assert list(result["columns"]) == ["timestamp", "stove_temp"]
+    assert result["columns"]["timestamp"][0] == timestamps[0]
+
+    result = history_response(coordinator, "raw", None, None, points=10, delta=True)
+    assert result["encoding"] == "delta"
+    assert result["scale"]["timestamp"] == 1
+    assert np.cumsum(result["columns"]["room_temp"])[-1] / result["scale"]["room_temp"] == 21.5
+
+    # Plage antérieure à l'historique brut : niveau agrégé
+    result = history_response(coordinator, "auto", timestamps[0] - 86400, None, now=timestamps[-1])
+    assert result["resolution"] == "5min"
+    result = history_response(coordinator, "auto", timestamps[0] - 90 * 86400, None, now=timestamps[-1])
+    assert result["resolution"] == "day"
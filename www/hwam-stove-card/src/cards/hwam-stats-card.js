@@ -2,6 +2,24 @@ import { LitElement, html, css } from 'lit-element';
 import { HomeAssistant } from 'custom-card-helpers';
 import Chart from 'chart.js/auto';
 
+const REFRESH_INTERVAL = 60 * 1000;
+
+// Décode les colonnes différentielles : somme cumulée divisée par l'échelle
+function decodeColumns(history) {
+  if (history.encoding !== 'delta') return history.columns;
+  const columns = {};
+  for (const [name, values] of Object.entries(history.columns)) {
+    const scale = history.scale[name];
+    let current = 0;
+    columns[name] = values.map(value => {
+      if (value === null) return null;
+      current += value;
+      return current / scale;
+    });
+  }
+  return columns;
+}
+
 class HWAMStatsCard extends LitElement {
   static get properties() {
     return {
@@ -70,7 +88,8 @@ class HWAMStatsCard extends LitElement {
   }
 
   updated(changedProps) {
-    if (changedProps.has('hass')) {
+    if (changedProps.has('hass') && Date.now() - (this._fetched || 0) > REFRESH_INTERVAL) {
+      this._fetched = Date.now();
       this._updateChart();
     }
   }
@@ -112,15 +131,34 @@ class HWAMStatsCard extends LitElement {
     });
   }
 
-  _updateChart() {
+  async _updateChart() {
     if (!this._chart || !this.hass || !this.config) return;
 
-    const stoveHistory = this.hass.states[this.config.stove_temperature].attributes.history || [];
-    const roomHistory = this.hass.states[this.config.room_temperature].attributes.history || [];
+    // Historique réduit côté serveur : la taille ne dépend que du nombre de points
+    const hours = this.config.hours || 24;
+    let history;
+    try {
+      history = await this.hass.callWS({
+        type: 'hwam_stove/history',
+        entity_id: this.config.stove_temperature,
+        start: new Date(Date.now() - hours * 3600 * 1000).toISOString(),
+        points: this.config.points || 300,
+        delta: true
+      });
+    } catch (err) {
+      console.warn('Historique HWAM indisponible', err);
+      return;
+    }
 
-    this._chart.data.labels = stoveHistory.map(h => new Date(h.time).toLocaleTimeString());
-    this._chart.data.datasets[0].data = stoveHistory.map(h => h.value);
-    this._chart.data.datasets[1].data = roomHistory.map(h => h.value);
+    const columns = decodeColumns(history);
+    const suffix = history.resolution === 'raw' ? '' : '_mean';
+    const dayLevel = history.resolution === 'day';
+    this._chart.data.labels = columns.timestamp.map(t => {
+      const date = new Date(t * 1000);
+      return dayLevel || hours > 48 ? date.toLocaleDateString() : date.toLocaleTimeString();
+    });
+    this._chart.data.datasets[0].data = columns[`stove_temp${suffix}`] || [];
+    this._chart.data.datasets[1].data = columns[`room_temp${suffix}`] || [];
     this._chart.update();
   }
 